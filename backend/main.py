@@ -1,12 +1,44 @@
+import mimetypes
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from backend.src.api.routes import router
+from backend.src.pipeline.chunked_detection import resume_interrupted_analyses
+from backend.src.utils.frame_access import close_frame_decoders
+
+# HLS types for progressive overlay streams; not every platform's mime database has them
+mimetypes.add_type("application/vnd.apple.mpegurl", ".m3u8")
+mimetypes.add_type("video/iso.segment", ".m4s")
+mimetypes.add_type("video/mp2t", ".ts")
+
+
+class MediaStaticFiles(StaticFiles):
+    """Static files that also serve growing HLS playlists."""
+    
+    async def get_response(self, path: str, scope):
+        response = await super().get_response(path, scope)
+        if path.endswith(".m3u8"):
+            # Playlists grow while the overlay renders, players must always refetch them
+            response.headers["Cache-Control"] = "no-cache"
+        return response
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Pick up long-session analyses that were interrupted by a restart
+    resume_interrupted_analyses()
+    yield
+    # Release the decoders kept open for frame requests
+    close_frame_decoders()
+
 
 app = FastAPI(
     title="CruxVision API",
     description="AI climbing coach that analyzes climbing videos",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan
 )
 
 # Add CORS middleware
@@ -22,7 +54,7 @@ app.add_middleware(
 app.include_router(router, prefix="/api")
 
 # Mount static files for uploads and outputs
-app.mount("/static", StaticFiles(directory="backend/static"), name="static")
+app.mount("/static", MediaStaticFiles(directory="backend/static"), name="static")
 
 if __name__ == "__main__":
     import uvicorn
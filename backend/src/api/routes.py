@@ -1,10 +1,20 @@
 from fastapi import APIRouter, UploadFile, File, HTTPException, BackgroundTasks
-from backend.src.models.schema import AnalyzeResponse, ErrorResponse, Result
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, JSONResponse, Response
+from backend.src.models.schema import AnalyzeResponse, ErrorResponse, Result, OverlayStatus
 from backend.src.pipeline.upload import validate_and_save_video
-from backend.src.pipeline.pose_detection import process_video_background_task
-from backend.src.utils.file_utils import generate_analysis_id
+from backend.src.pipeline.pose_detection import process_video_background_task, export_pose_data_json
+from backend.src.utils.file_utils import generate_analysis_id, OUTPUT_DIR
+from backend.src.utils.pose_store import get_pose_store_path
 from backend.src.utils.analysis_storage import create_analysis_record, get_analysis_record
+from backend.src.utils.video_metadata import get_video_metadata
+from backend.src.pipeline.overlay import find_original_video, get_overlay_stream_dir, render_overlay_frame, encode_preview_jpeg
+from backend.src.pipeline.video_encoder import STREAM_MASTER_PLAYLIST
+from backend.src.pipeline.track_export import get_track_path, export_compact_track
+from backend.src.pipeline.overlay_jobs import request_overlay, render_overlay_job
 import logging
+from pathlib import Path
+from typing import Optional
 
 logger = logging.getLogger(__name__)
 
@@ -37,14 +47,21 @@ async def analyze_video(
         # Generate unique analysis ID
         analysis_id = generate_analysis_id()
         
-        # Validate and save the uploaded video
-        file_path = await validate_and_save_video(file, analysis_id)
+        # Validate and save the uploaded video, hashing it on the way
+        file_path, content_hash = await validate_and_save_video(file, analysis_id)
         
         # Create analysis record
         create_analysis_record(analysis_id)
         
+        # Probe the video once (in the threadpool, it decodes a frame); every later
+        # stage reads the cached metadata
+        try:
+            await run_in_threadpool(get_video_metadata, file_path, analysis_id)
+        except ValueError as e:
+            logger.warning(f"Could not probe video metadata for {analysis_id}: {str(e)}")
+        
         # Start background pose processing (M3c)
-        background_tasks.add_task(process_video_background_task, file_path, analysis_id)
+        background_tasks.add_task(process_video_background_task, file_path, analysis_id, content_hash)
         
         logger.info(f"Started background processing for analysis {analysis_id}")
         
@@ -65,6 +82,121 @@ async def analyze_video(
         )
 
 
+def get_overlay_url(analysis_record: dict) -> Optional[str]:
+    """
+    Get the static URL of an analysis's rendered overlay video.
+    
+    Args:
+        analysis_record: Analysis record from storage
+        
+    Returns:
+        URL of the overlay video, or None if it has not been rendered
+    """
+    overlay_file = analysis_record.get("overlay_file")
+    if analysis_record.get("overlay_status") != "complete" or not overlay_file:
+        return None
+    # Extract filename from full path for URL
+    return f"/static/overlays/{Path(overlay_file).name}"
+
+
+def get_overlay_stream_url(analysis_record: dict) -> Optional[str]:
+    """
+    Get the static URL of an analysis's progressive overlay stream.
+    
+    The playlist is linked as soon as its first segment is written, so clients can
+    start playing while the overlay is still rendering.
+    
+    Args:
+        analysis_record: Analysis record from storage
+        
+    Returns:
+        URL of the HLS master playlist, or None if no stream is available
+    """
+    if analysis_record.get("overlay_status") not in ["rendering", "complete"]:
+        return None
+    
+    try:
+        stream_dir = get_overlay_stream_dir(analysis_record["id"], find_original_video(analysis_record["id"]))
+    except FileNotFoundError:
+        return None
+    
+    if not (stream_dir / STREAM_MASTER_PLAYLIST).exists():
+        return None
+    return f"/static/overlays/{stream_dir.name}/{STREAM_MASTER_PLAYLIST}"
+
+
+def get_overlay_status(analysis_record: dict) -> OverlayStatus:
+    """
+    Build the overlay status response for an analysis record.
+    
+    Args:
+        analysis_record: Analysis record from storage
+        
+    Returns:
+        OverlayStatus for the analysis
+    """
+    return OverlayStatus(
+        id=analysis_record["id"],
+        overlay_status=analysis_record["overlay_status"],
+        video_url=get_overlay_url(analysis_record),
+        stream_url=get_overlay_stream_url(analysis_record),
+        error_message=analysis_record.get("overlay_error")
+    )
+
+
+def get_completed_analysis_record(analysis_id: str) -> dict:
+    """
+    Get an analysis record whose pose data is ready for overlay rendering.
+    
+    Args:
+        analysis_id: Unique identifier for the analysis
+        
+    Returns:
+        Analysis record
+        
+    Raises:
+        HTTPException: If the analysis does not exist or has not completed
+    """
+    analysis_record = get_analysis_record(analysis_id)
+    
+    if not analysis_record:
+        raise HTTPException(
+            status_code=404,
+            detail="Analysis not found"
+        )
+    
+    if analysis_record["status"] != "complete":
+        raise HTTPException(
+            status_code=409,
+            detail="Analysis has not completed"
+        )
+    
+    return analysis_record
+
+
+def enqueue_overlay(analysis_id: str, background_tasks: BackgroundTasks, retry_failed: bool = False) -> None:
+    """
+    Start rendering an analysis's overlay unless it is cached or already rendering.
+    
+    Args:
+        analysis_id: Unique identifier for the analysis
+        background_tasks: FastAPI background tasks to run the render job on
+        retry_failed: Render again if the last render failed
+        
+    Raises:
+        HTTPException: If the original video is missing
+    """
+    try:
+        if request_overlay(analysis_id, retry_failed=retry_failed):
+            background_tasks.add_task(render_overlay_job, analysis_id)
+            logger.info(f"Started overlay rendering for analysis {analysis_id}")
+    except FileNotFoundError as e:
+        raise HTTPException(
+            status_code=404,
+            detail=str(e)
+        )
+
+
 @router.get("/results/{analysis_id}", response_model=Result)
 async def get_results(analysis_id: str):
     """
@@ -88,29 +220,29 @@ async def get_results(analysis_id: str):
             detail="Analysis not found"
         )
     
-    # Prepare metrics from processing info
-    metrics = None
-    processing_info = analysis_record.get("processing_info")
-    if processing_info:
-        # For M3c, we'll create basic metrics from pose data
-        # In M4, we'll add proper heuristic analysis
-        metrics = {
-            "avg_hip_angle": None,  # Will be calculated in M4
-            "avg_knee_angle": None,  # Will be calculated in M4
-            "stability_score": None   # Will be calculated in M4
-        }
+    # Metrics are computed from the pose track when processing completes
+    metrics = analysis_record.get("metrics")
     
     # Prepare video URL for overlay video
     video_url = None
+    overlay_mode = None
+    source_video_url = None
+    track_url = None
+    stream_url = None
     if analysis_record.get("status") == "complete":
-        # Check if overlay video was generated
+        # Overlay video is only linked once it has been rendered, its stream while rendering
         processing_info = analysis_record.get("processing_info", {})
-        overlay_file = processing_info.get("overlay_file")
-        if overlay_file:
-            # Extract filename from full path for URL
-            from pathlib import Path
-            filename = Path(overlay_file).name
-            video_url = f"/static/overlays/{filename}"
+        overlay_mode = processing_info.get("overlay_mode", "video")
+        video_url = get_overlay_url(analysis_record)
+        stream_url = get_overlay_stream_url(analysis_record)
+        
+        if overlay_mode == "client":
+            # The browser plays the original upload and draws the pose track itself
+            try:
+                source_video_url = f"/static/uploads/{Path(find_original_video(analysis_id)).name}"
+                track_url = f"/api/results/{analysis_id}/track"
+            except FileNotFoundError:
+                logger.warning(f"Original video not found for client overlay of analysis {analysis_id}")
     
     # Return result
     return Result(
@@ -120,5 +252,181 @@ async def get_results(analysis_id: str):
         metrics=metrics,
         feedback=None,  # Will be added in M4
         video_url=video_url,
-        error_message=analysis_record.get("error_message")
+        error_message=analysis_record.get("error_message"),
+        overlay_mode=overlay_mode,
+        overlay_status=analysis_record.get("overlay_status", "not_requested"),
+        source_video_url=source_video_url,
+        track_url=track_url,
+        stream_url=stream_url
     )
+
+
+@router.get("/results/{analysis_id}/pose_data")
+def get_pose_data(analysis_id: str):
+    """
+    Download pose data for an analysis as JSON.
+    
+    Pose results are stored in a binary format; the JSON file is converted
+    on first request and reused afterwards.
+    
+    Args:
+        analysis_id: Unique identifier for the analysis
+        
+    Returns:
+        FileResponse: pose_data JSON file
+        
+    Raises:
+        HTTPException: If no pose data exists for the analysis
+    """
+    pose_store_file = get_pose_store_path(analysis_id)
+    json_file = OUTPUT_DIR / f"pose_data_{analysis_id}.json"
+    
+    if not pose_store_file.exists():
+        raise HTTPException(
+            status_code=404,
+            detail="Pose data not found"
+        )
+    
+    if not json_file.exists() or json_file.stat().st_mtime < pose_store_file.stat().st_mtime:
+        export_pose_data_json(analysis_id)
+    
+    return FileResponse(json_file, media_type="application/json")
+
+
+@router.get("/results/{analysis_id}/track")
+def get_track(analysis_id: str):
+    """
+    Download the compact pose track for client-side overlay drawing.
+    
+    The track is exported from the saved pose data on first request and reused
+    afterwards; see pipeline/track_export.py for the binary layout.
+    
+    Args:
+        analysis_id: Unique identifier for the analysis
+        
+    Returns:
+        FileResponse: Binary track file
+        
+    Raises:
+        HTTPException: If no pose data or original video exists for the analysis
+    """
+    pose_store_file = get_pose_store_path(analysis_id)
+    track_file = get_track_path(analysis_id)
+    
+    if not pose_store_file.exists():
+        raise HTTPException(
+            status_code=404,
+            detail="Pose data not found"
+        )
+    
+    if not track_file.exists() or track_file.stat().st_mtime < pose_store_file.stat().st_mtime:
+        try:
+            export_compact_track(analysis_id)
+        except FileNotFoundError as e:
+            raise HTTPException(
+                status_code=404,
+                detail=str(e)
+            )
+    
+    return FileResponse(track_file, media_type="application/octet-stream")
+
+
+@router.post("/results/{analysis_id}/overlay", response_model=OverlayStatus, status_code=202)
+async def enqueue_overlay_rendering(analysis_id: str, background_tasks: BackgroundTasks):
+    """
+    Enqueue overlay video rendering for a completed analysis.
+    
+    This is the only way to retry a failed render.
+    
+    Args:
+        analysis_id: Unique identifier for the analysis
+        background_tasks: FastAPI background tasks
+        
+    Returns:
+        OverlayStatus: Overlay state after the request
+        
+    Raises:
+        HTTPException: If the analysis is missing or has not completed
+    """
+    analysis_record = get_completed_analysis_record(analysis_id)
+    enqueue_overlay(analysis_id, background_tasks, retry_failed=True)
+    return get_overlay_status(analysis_record)
+
+
+@router.get("/results/{analysis_id}/overlay")
+async def get_overlay(analysis_id: str, background_tasks: BackgroundTasks):
+    """
+    Get the overlay video, rendering it on first request.
+    
+    A failed render is reported, not retried, so polling clients do not start a
+    new render on every request; POST /results/{analysis_id}/overlay retries it.
+    
+    Args:
+        analysis_id: Unique identifier for the analysis
+        background_tasks: FastAPI background tasks
+        
+    Returns:
+        FileResponse with the overlay video once rendered, a 500 response with the
+        OverlayStatus if rendering failed, otherwise a 202 response with the OverlayStatus
+        
+    Raises:
+        HTTPException: If the analysis is missing or has not completed
+    """
+    analysis_record = get_completed_analysis_record(analysis_id)
+    enqueue_overlay(analysis_id, background_tasks)
+    
+    if analysis_record["overlay_status"] == "error":
+        return JSONResponse(status_code=500, content=get_overlay_status(analysis_record).model_dump())
+    
+    if analysis_record["overlay_status"] == "complete":
+        return FileResponse(analysis_record["overlay_file"], media_type="video/mp4")
+    return JSONResponse(status_code=202, content=get_overlay_status(analysis_record).model_dump())
+
+
+@router.get("/results/{analysis_id}/frames/{frame_index}")
+def get_frame(analysis_id: str, frame_index: int, overlay: bool = True, max_width: Optional[int] = None):
+    """
+    Get a single frame as a JPEG, for thumbnails, scrubbing previews and frame inspection.
+    
+    Frames are read through the shared keyframe index and decoder pool, so
+    arbitrary frames are served without reopening or re-scanning the video.
+    
+    Args:
+        analysis_id: Unique identifier for the analysis
+        frame_index: Index of the frame in the original video
+        overlay: Draw the skeleton and tracers (requires pose data)
+        max_width: Downscale the frame to at most this width
+        
+    Returns:
+        Response: JPEG image of the upright frame
+        
+    Raises:
+        HTTPException: If the analysis, its video or pose data, or the frame does not exist
+    """
+    if not get_analysis_record(analysis_id):
+        raise HTTPException(
+            status_code=404,
+            detail="Analysis not found"
+        )
+    
+    if max_width is not None and max_width <= 0:
+        raise HTTPException(
+            status_code=400,
+            detail="max_width must be positive"
+        )
+    
+    try:
+        frame = render_overlay_frame(analysis_id, frame_index, draw_overlay=overlay)
+    except (FileNotFoundError, ValueError) as e:
+        raise HTTPException(
+            status_code=404,
+            detail=str(e)
+        )
+    
+    if frame is None:
+        raise HTTPException(
+            status_code=404,
+            detail="Frame not found"
+        )
+    
+    return Response(content=encode_preview_jpeg(frame, max_width), media_type="image/jpeg")
@@ -13,6 +13,8 @@ class ResultMetrics(BaseModel):
     avg_hip_angle: Optional[float] = None
     avg_knee_angle: Optional[float] = None
     stability_score: Optional[float] = None
+    avg_com_velocity: Optional[float] = None
+    avg_com_jerk: Optional[float] = None
 
 class Result(BaseModel):
     id: str
@@ -22,3 +24,15 @@ class Result(BaseModel):
     feedback: Optional[List[str]] = None
     video_url: Optional[str] = None
     error_message: Optional[str] = None
+    overlay_mode: Optional[Literal["video", "client"]] = None
+    overlay_status: Literal["not_requested", "rendering", "complete", "error"] = "not_requested"
+    source_video_url: Optional[str] = None
+    track_url: Optional[str] = None
+    stream_url: Optional[str] = None
+
+class OverlayStatus(BaseModel):
+    id: str
+    overlay_status: Literal["not_requested", "rendering", "complete", "error"]
+    video_url: Optional[str] = None
+    stream_url: Optional[str] = None
+    error_message: Optional[str] = None
@@ -0,0 +1,107 @@
+"""
+Adaptive frame sampling for CruxVision.
+
+This module decides which frames need MediaPipe inference. Climbers often hang
+still for seconds at a time, so detection runs densely during dynamic moves and
+sparsely during rests. Motion is estimated cheaply from a tiny grayscale thumbnail
+difference against the last detected frame and from the hip velocity of recent poses.
+"""
+
+import logging
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+from backend.src.pipeline.pose_track import FramePose
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_WIDTH = 64  # Width of the grayscale thumbnail used for frame differencing
+
+
+class AdaptiveFrameSampler:
+    """
+    Chooses between running detection and interpolating for each incoming frame.
+    
+    A frame is skipped only when the scene barely changed since the last detected
+    frame, the last pose was found, the climber was not moving fast, and fewer than
+    max_skip_frames frames have been skipped in a row.
+    """
+    
+    def __init__(self, motion_threshold: float, velocity_threshold: float, max_skip_frames: int):
+        """
+        Initialize adaptive frame sampler.
+        
+        Args:
+            motion_threshold: Mean absolute thumbnail difference (0-255) that forces detection
+            velocity_threshold: Hip midpoint speed (normalized units per frame) that forces detection
+            max_skip_frames: Maximum consecutive frames to interpolate instead of detect
+        """
+        self.motion_threshold = motion_threshold
+        self.velocity_threshold = velocity_threshold
+        self.max_skip_frames = max_skip_frames
+        
+        self.keyframe_thumbnail: Optional[np.ndarray] = None
+        self.current_thumbnail: Optional[np.ndarray] = None
+        self.last_pose_detected = False
+        self.last_hip_position: Optional[Tuple[int, float, float]] = None  # (frame_index, x, y)
+        self.hip_velocity = 0.0
+        self.skipped_frames = 0
+    
+    def should_detect(self, frame: cv2.Mat) -> bool:
+        """
+        Decide whether a frame needs pose detection.
+        
+        Args:
+            frame: Decoded video frame (BGR)
+        
+        Returns:
+            True if the frame should be detected, False if it can be interpolated
+        """
+        height, width = frame.shape[:2]
+        thumbnail_height = max(1, round(height * THUMBNAIL_WIDTH / width))
+        thumbnail = cv2.resize(frame, (THUMBNAIL_WIDTH, thumbnail_height), interpolation=cv2.INTER_AREA)
+        self.current_thumbnail = cv2.cvtColor(thumbnail, cv2.COLOR_BGR2GRAY)
+        
+        if (
+            self.keyframe_thumbnail is None
+            or not self.last_pose_detected
+            or self.skipped_frames >= self.max_skip_frames
+            or self.hip_velocity > self.velocity_threshold
+        ):
+            return True
+        
+        motion_score = float(cv2.absdiff(self.current_thumbnail, self.keyframe_thumbnail).mean())
+        if motion_score > self.motion_threshold:
+            return True
+        
+        self.skipped_frames += 1
+        return False
+    
+    def record_detection(self, frame_pose: FramePose) -> None:
+        """
+        Update sampler state after a frame was detected.
+        
+        Args:
+            frame_pose: FramePose detection result for the frame
+        """
+        self.keyframe_thumbnail = self.current_thumbnail
+        self.last_pose_detected = frame_pose.pose_detected
+        self.skipped_frames = 0
+        
+        if not self.last_pose_detected:
+            self.last_hip_position = None
+            self.hip_velocity = 0.0
+            return
+        
+        # MediaPipe pose landmarks: left_hip (23), right_hip (24)
+        hip_x, hip_y = frame_pose.landmarks[23:25, :2].mean(axis=0).tolist()
+        
+        if self.last_hip_position is not None:
+            last_index, last_x, last_y = self.last_hip_position
+            frame_gap = max(1, frame_pose.frame_index - last_index)
+            self.hip_velocity = float(np.hypot(hip_x - last_x, hip_y - last_y)) / frame_gap
+        
+        self.last_hip_position = (frame_pose.frame_index, hip_x, hip_y)
@@ -0,0 +1,345 @@
+"""
+Chunked pose detection for long climbing sessions.
+
+Videos longer than MAX_FRAMES_TO_PROCESS are processed in fixed-duration chunks.
+Each chunk's pose results are written to disk as soon as the chunk is complete,
+together with a manifest recording which chunks are done and the state of the
+streaming metrics at that point. Memory stays flat no matter how long the video
+is, and a job interrupted by a worker restart resumes from the last completed
+chunk instead of starting over.
+"""
+
+import json
+import logging
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+from backend.src.utils.file_utils import OUTPUT_DIR
+from backend.src.utils.pose_store import get_pose_store_path, write_pose_store, concatenate_pose_stores, load_pose_store
+from backend.src.utils.result_cache import get_settings_fingerprint
+from backend.src.pipeline.pose_track import FramePose, PoseTrack
+from backend.src.pipeline.staged_executor import StagedPipeline
+from backend.src.pipeline.metrics import OnlineMetricsAccumulator
+from backend.src.pipeline import pose_detection
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Configuration
+CHUNKED_PROCESSING_ENABLED = True  # Process videos longer than MAX_FRAMES_TO_PROCESS in chunks
+CHUNK_DURATION_SECONDS = 10.0  # Video time covered by each chunk
+CHUNK_WARMUP_FRAMES = 30  # Frames decoded before the resume point so tracking warms up
+
+MANIFEST_FILE = "manifest.json"
+
+
+def should_use_chunked_processing(video_info: dict) -> bool:
+    """
+    Check whether a video is long enough to need chunked processing.
+    
+    Args:
+        video_info: Video metadata from read_video_info()
+    
+    Returns:
+        True if the video has more sampled frames than MAX_FRAMES_TO_PROCESS
+    """
+    return CHUNKED_PROCESSING_ENABLED and video_info["total_frames"] > pose_detection.MAX_FRAMES_TO_PROCESS * pose_detection.SAMPLE_RATE
+
+
+def get_chunk_dir(analysis_id: str) -> Path:
+    """Get the directory holding an analysis's chunk files and manifest"""
+    return OUTPUT_DIR / f"chunks_{analysis_id}"
+
+
+def load_chunk_manifest(analysis_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Load the chunk manifest for an analysis.
+    
+    Args:
+        analysis_id: Unique analysis identifier
+    
+    Returns:
+        Manifest dictionary, or None if there is no readable manifest
+    """
+    manifest_file = get_chunk_dir(analysis_id) / MANIFEST_FILE
+    if not manifest_file.exists():
+        return None
+    
+    try:
+        with open(manifest_file, 'r') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        logger.warning(f"Ignoring unreadable chunk manifest {manifest_file}: {str(e)}")
+        return None
+
+
+def save_chunk_manifest(analysis_id: str, manifest: Dict[str, Any]) -> None:
+    """
+    Write the chunk manifest atomically, so a crash never leaves a partial manifest.
+    
+    Args:
+        analysis_id: Unique analysis identifier
+        manifest: Manifest dictionary
+    """
+    manifest_file = get_chunk_dir(analysis_id) / MANIFEST_FILE
+    temp_file = manifest_file.with_suffix(".tmp")
+    
+    with open(temp_file, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(temp_file, manifest_file)
+
+
+def prepare_chunk_manifest(video_path: str, analysis_id: str, video_info: dict, chunk_frames: int) -> Dict[str, Any]:
+    """
+    Load the manifest of an interrupted run, or start a new one.
+    
+    A previous manifest is only reused when it was written for the same video,
+    chunk size and processing settings, and holds the metrics state to continue
+    from; otherwise its chunks are discarded.
+    
+    Args:
+        video_path: Path to the uploaded video file
+        analysis_id: Unique analysis identifier
+        video_info: Video metadata from read_video_info()
+        chunk_frames: Frames per chunk
+    
+    Returns:
+        Manifest dictionary
+    """
+    settings_fingerprint = get_settings_fingerprint(pose_detection.get_processing_settings())
+    manifest = load_chunk_manifest(analysis_id)
+    
+    if manifest is not None:
+        if manifest.get("video_path") == video_path and manifest.get("chunk_frames") == chunk_frames \
+                and manifest.get("settings_fingerprint") == settings_fingerprint and "metrics_state" in manifest:
+            logger.info(f"Resuming analysis {analysis_id} after {len(manifest['completed_chunks'])} completed chunks")
+            manifest["status"] = "processing"
+            save_chunk_manifest(analysis_id, manifest)
+            return manifest
+        logger.info(f"Discarding chunks of analysis {analysis_id} written with different settings")
+    
+    chunk_dir = get_chunk_dir(analysis_id)
+    shutil.rmtree(chunk_dir, ignore_errors=True)
+    chunk_dir.mkdir(parents=True)
+    
+    manifest = {
+        "analysis_id": analysis_id,
+        "video_path": video_path,
+        "video_info": video_info,
+        "chunk_frames": chunk_frames,
+        "settings_fingerprint": settings_fingerprint,
+        "status": "processing",
+        "completed_chunks": [],
+        "metrics_state": None  # OnlineMetricsAccumulator state after the last completed chunk
+    }
+    save_chunk_manifest(analysis_id, manifest)
+    return manifest
+
+
+def save_chunk(analysis_id: str, manifest: Dict[str, Any], chunk_track: PoseTrack, start_frame: int, frame_shape: Optional[Tuple[int, ...]], metrics_accumulator: OnlineMetricsAccumulator) -> None:
+    """
+    Write one completed chunk and record it in the manifest.
+    
+    Args:
+        analysis_id: Unique analysis identifier
+        manifest: Manifest to update
+        chunk_track: Chunk results, indexed relative to start_frame
+        start_frame: Video frame index of the chunk's first frame
+        frame_shape: Shape of the decoded frames, for the frame info file
+        metrics_accumulator: Accumulator that has seen every frame up to the end of the chunk
+    """
+    chunk_index = len(manifest["completed_chunks"])
+    chunk_file = get_chunk_dir(analysis_id) / f"chunk_{chunk_index:05d}.pose"
+    write_pose_store(chunk_track, chunk_file, {"start_frame": start_frame}, quantized=pose_detection.POSE_STORE_QUANTIZED)
+    
+    # Manifest is updated only after the chunk file is complete
+    manifest["completed_chunks"].append({
+        "index": chunk_index,
+        "file": chunk_file.name,
+        "start_frame": start_frame,
+        "end_frame": start_frame + manifest["chunk_frames"],
+        "frames": chunk_track.frames_stored,
+        "poses_detected": chunk_track.poses_detected,
+        "frame_shape": list(frame_shape) if frame_shape else None
+    })
+    manifest["metrics_state"] = metrics_accumulator.get_state()
+    save_chunk_manifest(analysis_id, manifest)
+    logger.info(f"Saved chunk {chunk_index} (frames {start_frame}-{start_frame + len(chunk_track) - 1}) for analysis {analysis_id}")
+
+
+def run_chunked_detection(video_path: str, analysis_id: str, video_info: dict, metrics_accumulator: Optional[OnlineMetricsAccumulator] = None) -> Tuple[PoseTrack, str, str]:
+    """
+    Detect poses chunk by chunk, resuming after the last completed chunk.
+    
+    Frames are decoded and detected in one continuous stream; chunk boundaries
+    only decide when results are flushed to disk. When resuming, decoding starts
+    CHUNK_WARMUP_FRAMES before the resume point and those frames are discarded.
+    
+    The metrics accumulator is checkpointed with every chunk and restored on resume,
+    so its final snapshot covers the whole video without reading the pose store back.
+    
+    Args:
+        video_path: Path to the uploaded video file
+        analysis_id: Unique analysis identifier
+        video_info: Video metadata from read_video_info()
+        metrics_accumulator: Updated with every frame; running metrics are published
+            to the analysis record. A new one is used when None
+    
+    Returns:
+        Tuple of (pose_track, pose_file, info_file); the pose track is memory-mapped
+        from the assembled pose store
+    """
+    chunk_frames = max(1, round(video_info["fps"] * CHUNK_DURATION_SECONDS))
+    manifest = prepare_chunk_manifest(video_path, analysis_id, video_info, chunk_frames)
+    
+    completed_chunks = manifest["completed_chunks"]
+    resume_frame = completed_chunks[-1]["end_frame"] if completed_chunks else 0
+    warmup_start = max(0, resume_frame - CHUNK_WARMUP_FRAMES)
+    
+    if metrics_accumulator is None:
+        metrics_accumulator = OnlineMetricsAccumulator(video_info["fps"], video_info["width"], video_info["height"], pose_detection.LANDMARK_THRESHOLDS)
+    if manifest["metrics_state"] is not None:
+        metrics_accumulator.load_state(manifest["metrics_state"])
+    
+    # Import here to avoid circular imports
+    from backend.src.utils.analysis_storage import update_analysis_metrics
+    
+    try:
+        if resume_frame < video_info["total_frames"]:
+            pipeline = StagedPipeline(
+                pose_detection.iter_video_frames(video_path, warmup_start, limit_frames=False),
+                [("infer", pose_detection.process_frames_with_pose)],
+                queue_size=pose_detection.PIPELINE_QUEUE_SIZE,
+                threaded=pose_detection.PIPELINED_DETECTION
+            )
+            
+            chunk_start = resume_frame
+            chunk_track = PoseTrack(capacity=chunk_frames)
+            frame_shape = None
+            
+            for frame, frame_pose in pipeline:
+                if frame_pose.frame_index < resume_frame:
+                    continue  # Warm-up frame, already saved in an earlier chunk
+                
+                while frame_pose.frame_index >= chunk_start + chunk_frames:
+                    save_chunk(analysis_id, manifest, chunk_track.trim(), chunk_start, frame_shape, metrics_accumulator)
+                    chunk_start += chunk_frames
+                    chunk_track = PoseTrack(capacity=chunk_frames)
+                
+                frame_shape = frame.shape
+                chunk_track.add_frame(FramePose(
+                    frame_pose.frame_index - chunk_start,
+                    frame_pose.landmarks,
+                    frame_pose.overall_confidence,
+                    frame_pose.interpolated,
+                    frame_pose.error
+                ))
+                
+                metrics_accumulator.update(frame_pose)
+                if metrics_accumulator.frames_seen % pose_detection.PARTIAL_METRICS_INTERVAL == 0:
+                    update_analysis_metrics(analysis_id, metrics_accumulator.snapshot())
+            
+            if len(chunk_track):
+                save_chunk(analysis_id, manifest, chunk_track.trim(), chunk_start, frame_shape, metrics_accumulator)
+    
+    except Exception:
+        # Leave the completed chunks for a retry, but don't auto-resume a failing job
+        manifest["status"] = "error"
+        save_chunk_manifest(analysis_id, manifest)
+        raise
+    
+    chunk_dir = get_chunk_dir(analysis_id)
+    chunk_files = [(chunk["start_frame"], chunk_dir / chunk["file"]) for chunk in manifest["completed_chunks"]]
+    
+    # Assemble without loading the whole video's results, then compute statistics
+    # from the memory-mapped store
+    pose_file = get_pose_store_path(analysis_id)
+    concatenate_pose_stores(chunk_files, pose_file, {"analysis_id": analysis_id, "video_info": video_info}, quantized=pose_detection.POSE_STORE_QUANTIZED)
+    pose_track, _ = load_pose_store(pose_file)
+    
+    info_file = save_chunk_info(manifest, video_info, analysis_id)
+    
+    shutil.rmtree(chunk_dir, ignore_errors=True)
+    logger.info(f"Chunked detection completed for analysis {analysis_id}: {len(chunk_files)} chunks, {len(pose_track)} frames")
+    
+    return pose_track, str(pose_file), info_file
+
+
+def save_chunk_info(manifest: Dict[str, Any], video_info: dict, analysis_id: str) -> str:
+    """
+    Save per-chunk frame information to a text file for debugging.
+    
+    Args:
+        manifest: Completed chunk manifest
+        video_info: Video metadata
+        analysis_id: Unique analysis identifier
+    
+    Returns:
+        Path to the saved info file
+    """
+    info_file = OUTPUT_DIR / f"frame_info_{analysis_id}.txt"
+    chunks = manifest["completed_chunks"]
+    
+    with open(info_file, 'w') as f:
+        f.write(f"Analysis ID: {analysis_id}\n")
+        f.write(f"Video Info: {video_info}\n")
+        f.write(f"Frames extracted: {sum(chunk['frames'] for chunk in chunks)}\n")
+        f.write(f"Sample rate: {pose_detection.SAMPLE_RATE}\n")
+        f.write(f"Chunks: {len(chunks)} x {manifest['chunk_frames']} frames\n")
+        
+        for chunk in chunks:
+            f.write(f"Chunk {chunk['index']}: Frames {chunk['start_frame']}-{chunk['end_frame'] - 1}, {chunk['frames']} extracted, {chunk['poses_detected']} poses, Shape {tuple(chunk['frame_shape'] or ())}\n")
+    
+    logger.info(f"Frame info saved to: {info_file}")
+    return str(info_file)
+
+
+def find_interrupted_analyses() -> List[Dict[str, Any]]:
+    """
+    Find chunked analyses that were still processing when the worker stopped.
+    
+    Returns:
+        Manifests with status "processing"
+    """
+    manifests = []
+    for manifest_file in OUTPUT_DIR.glob(f"chunks_*/{MANIFEST_FILE}"):
+        manifest = load_chunk_manifest(manifest_file.parent.name[len("chunks_"):])
+        if manifest is not None and manifest.get("status") == "processing":
+            manifests.append(manifest)
+    return manifests
+
+
+def resume_interrupted_analyses() -> int:
+    """
+    Restart background processing for chunked analyses interrupted by a restart.
+    
+    Each job runs in its own thread and continues after its last completed chunk.
+    
+    Returns:
+        Number of analyses resumed
+    """
+    # Import here to avoid circular imports
+    from backend.src.utils.analysis_storage import create_analysis_record, get_analysis_record
+    
+    manifests = find_interrupted_analyses()
+    for manifest in manifests:
+        analysis_id = manifest["analysis_id"]
+        if not Path(manifest["video_path"]).exists():
+            logger.warning(f"Cannot resume analysis {analysis_id}: video {manifest['video_path']} is gone")
+            continue
+        
+        if get_analysis_record(analysis_id) is None:
+            create_analysis_record(analysis_id)
+        
+        threading.Thread(
+            target=pose_detection.process_video_background_task,
+            args=(manifest["video_path"], analysis_id),
+            name=f"resume-{analysis_id[:8]}",
+            daemon=True
+        ).start()
+        logger.info(f"Resuming interrupted analysis {analysis_id}")
+    
+    return len(manifests)
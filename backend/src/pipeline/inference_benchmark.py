@@ -0,0 +1,138 @@
+"""
+Inference resolution benchmark for CruxVision.
+
+This module measures MediaPipe latency per frame against landmark drift for a few
+inference resolutions, so INFERENCE_LONG_EDGE can be tuned per machine and footage.
+Drift is measured against full-resolution inference on the same frames.
+
+Usage:
+    python -m backend.src.pipeline.inference_benchmark path/to/video.mov [max_frames]
+"""
+
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Sequence
+
+import numpy as np
+
+# Add the project root to Python path for imports
+sys.path.append(str(Path(__file__).parent.parent.parent.parent))
+
+from backend.src.pipeline.pose_detection import (
+    create_pose_estimator,
+    iter_video_frames,
+    prepare_inference_frame,
+)
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+BENCHMARK_LONG_EDGES = (0, 1280, 960, 640, 480)  # 0 = full resolution reference
+BENCHMARK_MAX_FRAMES = 300
+
+
+def run_inference_at_resolution(video_path: str, long_edge: int, max_frames: int) -> Dict[str, Any]:
+    """
+    Run pose inference over the first frames of a video at one inference resolution.
+    
+    Args:
+        video_path: Path to the video file
+        long_edge: Inference long edge in pixels (0 = full resolution)
+        max_frames: Number of frames to process
+        
+    Returns:
+        Dictionary with per-frame latencies, landmarks (NaN where no pose) and frame size
+    """
+    estimator = create_pose_estimator()
+    latencies = []
+    landmarks = np.full((max_frames, 33, 2), np.nan, dtype=np.float32)
+    frame_size = None
+    
+    try:
+        for frame_index, frame in iter_video_frames(video_path, 0, max_frames):
+            frame_size = frame.shape[:2]
+            
+            start_time = time.perf_counter()
+            results = estimator.process(prepare_inference_frame(frame, long_edge))
+            latencies.append(time.perf_counter() - start_time)
+            
+            if results.pose_landmarks:
+                landmarks[frame_index] = [(lm.x, lm.y) for lm in results.pose_landmarks.landmark]
+    finally:
+        estimator.close()
+    
+    return {
+        "latencies": np.array(latencies),
+        "landmarks": landmarks[:len(latencies)],
+        "frame_size": frame_size
+    }
+
+
+def benchmark_inference_resolution(video_path: str, long_edges: Sequence[int] = BENCHMARK_LONG_EDGES, max_frames: int = BENCHMARK_MAX_FRAMES) -> List[Dict[str, Any]]:
+    """
+    Compare latency per frame and landmark drift across inference resolutions.
+    
+    Args:
+        video_path: Path to the video file
+        long_edges: Inference long edges to test; 0 (full resolution) is always the reference
+        max_frames: Number of frames to process per resolution
+        
+    Returns:
+        List of result rows with latency (ms) and drift (normalized and pixels) per resolution
+    """
+    reference = run_inference_at_resolution(video_path, 0, max_frames)
+    frame_height, frame_width = reference["frame_size"]
+    
+    rows = []
+    for long_edge in long_edges:
+        run = reference if long_edge == 0 else run_inference_at_resolution(video_path, long_edge, max_frames)
+        
+        # Drift only over frames where both runs detected a pose
+        frame_count = min(len(run["landmarks"]), len(reference["landmarks"]))
+        offsets = run["landmarks"][:frame_count] - reference["landmarks"][:frame_count]
+        pixel_offsets = offsets * np.array([frame_width, frame_height], dtype=np.float32)
+        drift = np.linalg.norm(offsets, axis=-1)
+        pixel_drift = np.linalg.norm(pixel_offsets, axis=-1)
+        both_detected = ~np.isnan(drift).any(axis=1)
+        
+        rows.append({
+            "long_edge": long_edge,
+            "frames": len(run["latencies"]),
+            "detection_rate": float(np.mean(~np.isnan(run["landmarks"][:, 0, 0]))),
+            "latency_ms_mean": float(run["latencies"].mean() * 1000),
+            "latency_ms_p95": float(np.percentile(run["latencies"], 95) * 1000),
+            "drift_mean": float(np.nanmean(drift[both_detected])) if both_detected.any() else None,
+            "drift_px_mean": float(np.nanmean(pixel_drift[both_detected])) if both_detected.any() else None,
+            "drift_px_p95": float(np.nanpercentile(pixel_drift[both_detected], 95)) if both_detected.any() else None
+        })
+    
+    return rows
+
+
+def print_benchmark_table(rows: List[Dict[str, Any]]) -> None:
+    """
+    Print benchmark rows as a plain-text table.
+    
+    Args:
+        rows: Result rows from benchmark_inference_resolution()
+    """
+    def format_value(value: Optional[float], pattern: str) -> str:
+        return "n/a" if value is None else pattern.format(value)
+    
+    print(f"{'long edge':>9} {'frames':>6} {'detected':>8} {'ms/frame':>8} {'p95 ms':>7} {'drift':>8} {'drift px':>8} {'p95 px':>7}")
+    for row in rows:
+        print(
+            f"{row['long_edge'] or 'full':>9} {row['frames']:>6} {row['detection_rate']:>8.1%} "
+            f"{row['latency_ms_mean']:>8.2f} {row['latency_ms_p95']:>7.2f} "
+            f"{format_value(row['drift_mean'], '{:.4f}'):>8} {format_value(row['drift_px_mean'], '{:.1f}'):>8} "
+            f"{format_value(row['drift_px_p95'], '{:.1f}'):>7}"
+        )
+
+
+if __name__ == "__main__":
+    test_video = sys.argv[1] if len(sys.argv) > 1 else "backend/static/uploads/pose-test.MOV"
+    max_frames = int(sys.argv[2]) if len(sys.argv) > 2 else BENCHMARK_MAX_FRAMES
+    print_benchmark_table(benchmark_inference_resolution(test_video, max_frames=max_frames))
@@ -0,0 +1,476 @@
+"""
+Climbing metrics for CruxVision.
+
+This module computes joint angles, center-of-mass velocity, jerk and a stability
+score for a whole climb at once. Everything is expressed as NumPy operations on a
+(frames x 33 x 3) position array, with a per-landmark confidence mask built from
+LANDMARK_THRESHOLDS. Landmarks below their threshold become NaN, and NaN carries
+through every angle, difference and mean, so unreliable frames drop out without
+any per-frame Python loop.
+"""
+
+import logging
+from collections import deque
+from typing import Dict, Any, Optional
+
+import numpy as np
+
+from backend.src.pipeline.pose_track import FramePose, PoseTrack, LANDMARK_COUNT, X, Y, Z, VISIBILITY
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Landmark groups referred to by the LANDMARK_THRESHOLDS keys (MediaPipe indices)
+LANDMARK_GROUPS = {
+    "shoulders": [11, 12],
+    "elbows": [13, 14],
+    "hands": [15, 16, 17, 18, 19, 20, 21, 22],  # Wrists, pinkies, index fingers, thumbs
+    "hips": [23, 24],
+    "knees": [25, 26],
+    "feet": [27, 28, 29, 30, 31, 32]  # Ankles, heels, foot indices
+}
+DEFAULT_LANDMARK_THRESHOLD = 0.3  # Landmarks outside every group (face)
+
+# Joint angle triplets (end, vertex, end) for the left and right side
+HIP_ANGLE_JOINTS = np.array([[11, 23, 25], [12, 24, 26]])  # Shoulder - hip - knee
+KNEE_ANGLE_JOINTS = np.array([[23, 25, 27], [24, 26, 28]])  # Hip - knee - ankle
+
+SHOULDER_LANDMARKS = [11, 12]
+HIP_LANDMARKS = [23, 24]
+
+SMOOTHING_WINDOW_SECONDS = 0.1  # Moving average applied to the center of mass before differentiating
+STABILITY_JERK_REFERENCE = 50.0  # RMS center-of-mass jerk (torso lengths/s^3) that scores 50
+HIP_VARIANCE_WINDOW_SECONDS = 2.0  # Window for the running hip midpoint variance
+CONFIDENCE_HISTOGRAM_BINS = 10  # Equal-width overall confidence bins over 0-1
+TORSO_HISTOGRAM_BIN_PIXELS = 0.25  # Torso length bin width for the streaming median; it is off by at most half a bin
+
+
+def build_threshold_array(landmark_thresholds: Dict[str, float]) -> np.ndarray:
+    """
+    Expand per-group visibility thresholds to one threshold per landmark.
+    
+    Args:
+        landmark_thresholds: Group name -> threshold, e.g. LANDMARK_THRESHOLDS
+    
+    Returns:
+        (33,) float32 array of thresholds
+    """
+    thresholds = np.full(LANDMARK_COUNT, DEFAULT_LANDMARK_THRESHOLD, dtype=np.float32)
+    for group, threshold in landmark_thresholds.items():
+        if group in LANDMARK_GROUPS:
+            thresholds[LANDMARK_GROUPS[group]] = threshold
+    return thresholds
+
+
+def build_confidence_mask(pose_track: PoseTrack, landmark_thresholds: Dict[str, float]) -> np.ndarray:
+    """
+    Mark landmarks that are reliable enough for analysis.
+    
+    Args:
+        pose_track: Pose track to analyze
+        landmark_thresholds: Group name -> visibility threshold
+    
+    Returns:
+        (frames, 33) bool array, False for frames without a pose
+    """
+    frame_count = len(pose_track)
+    visibility = pose_track.landmarks[:frame_count, :, VISIBILITY]
+    return pose_track.pose_detected[:frame_count, None] & (visibility >= build_threshold_array(landmark_thresholds))
+
+
+def get_masked_positions(pose_track: PoseTrack, mask: np.ndarray, frame_width: int, frame_height: int) -> np.ndarray:
+    """
+    Convert normalized landmarks to pixel positions, with unreliable landmarks set to NaN.
+    
+    Args:
+        pose_track: Pose track to analyze
+        mask: (frames, 33) confidence mask
+        frame_width: Video frame width in pixels
+        frame_height: Video frame height in pixels
+    
+    Returns:
+        (frames, 33, 3) float64 array of x, y, z in pixels (z uses the x scale)
+    """
+    frame_count = len(pose_track)
+    scale = np.array([frame_width, frame_height, frame_width], dtype=np.float64)
+    positions = pose_track.landmarks[:frame_count, :, [X, Y, Z]].astype(np.float64) * scale
+    positions[~mask] = np.nan
+    return positions
+
+
+def compute_joint_angles(positions: np.ndarray, joints: np.ndarray) -> np.ndarray:
+    """
+    Compute image-plane joint angles for every frame.
+    
+    MediaPipe's z estimate is much noisier than x and y, so angles use x and y only.
+    
+    Args:
+        positions: (frames, 33, 3) positions with NaN for unreliable landmarks
+        joints: (joints, 3) landmark index triplets, vertex in the middle
+    
+    Returns:
+        (frames, joints) angles in degrees, NaN where any landmark is unreliable
+    """
+    first = positions[:, joints[:, 0], :2] - positions[:, joints[:, 1], :2]
+    second = positions[:, joints[:, 2], :2] - positions[:, joints[:, 1], :2]
+    
+    cross = first[..., 0] * second[..., 1] - first[..., 1] * second[..., 0]
+    dot = (first * second).sum(axis=-1)
+    return np.degrees(np.abs(np.arctan2(cross, dot)))
+
+
+def smooth_series(series: np.ndarray, window: int) -> np.ndarray:
+    """
+    Centered moving average over complete windows.
+    
+    Rows whose window reaches a NaN sample or the ends of the series become NaN;
+    a truncated window would be off-center and bias velocity and jerk.
+    
+    Args:
+        series: (frames, dims) array with NaN rows for missing samples
+        window: Window length in frames (odd)
+    
+    Returns:
+        Smoothed array with NaN rows where no complete window exists
+    """
+    if window <= 1 or len(series) == 0:
+        return series
+    
+    valid = ~np.isnan(series).any(axis=1)
+    filled = np.where(valid[:, None], series, 0.0)
+    kernel = np.ones(window)
+    
+    counts = np.convolve(valid.astype(np.float64), kernel, mode="same")
+    sums = np.stack([np.convolve(filled[:, dim], kernel, mode="same") for dim in range(series.shape[1])], axis=1)
+    
+    smoothed = sums / window
+    smoothed[counts < window - 0.5] = np.nan
+    return smoothed
+
+
+def nan_mean(values: np.ndarray) -> Optional[float]:
+    """Mean of the non-NaN values, or None if there are none."""
+    values = values[~np.isnan(values)]
+    return float(values.mean()) if values.size else None
+
+
+def get_smoothing_window(fps: float) -> int:
+    """Odd moving-average window, in frames, for SMOOTHING_WINDOW_SECONDS at the given frame rate."""
+    return max(1, int(round(fps * SMOOTHING_WINDOW_SECONDS)) | 1)
+
+
+def get_stability_score(rms_jerk: float) -> float:
+    """Map RMS center-of-mass jerk (torso lengths/s^3) to a 0-100 score; smoother is higher."""
+    return 100.0 / (1.0 + rms_jerk / STABILITY_JERK_REFERENCE)
+
+
+def compute_climb_metrics(pose_track: PoseTrack, fps: float, frame_width: int, frame_height: int, landmark_thresholds: Dict[str, float]) -> Dict[str, Any]:
+    """
+    Compute climbing metrics for a whole pose track.
+    
+    The center of mass is approximated by the torso center (mean of the shoulder and
+    hip midpoints). Its velocity and jerk are measured in torso lengths, so they do
+    not depend on resolution or how far the camera is from the wall.
+    
+    Args:
+        pose_track: Pose track to analyze
+        fps: Video frame rate
+        frame_width: Video frame width in pixels
+        frame_height: Video frame height in pixels
+        landmark_thresholds: Group name -> visibility threshold, e.g. LANDMARK_THRESHOLDS
+    
+    Returns:
+        Dictionary with avg_hip_angle, avg_knee_angle (degrees), avg_com_velocity
+        (torso lengths/s), avg_com_jerk (torso lengths/s^3), stability_score (0-100)
+        and frames_analyzed; values are None when there is not enough reliable data
+    """
+    mask = build_confidence_mask(pose_track, landmark_thresholds)
+    positions = get_masked_positions(pose_track, mask, frame_width, frame_height)
+    
+    hip_angles = compute_joint_angles(positions, HIP_ANGLE_JOINTS)
+    knee_angles = compute_joint_angles(positions, KNEE_ANGLE_JOINTS)
+    
+    # Torso center and size from the image-plane shoulder and hip midpoints
+    shoulder_midpoint = positions[:, SHOULDER_LANDMARKS, :2].mean(axis=1)
+    hip_midpoint = positions[:, HIP_LANDMARKS, :2].mean(axis=1)
+    torso_lengths = np.linalg.norm(shoulder_midpoint - hip_midpoint, axis=1)
+    torso_length = np.nanmedian(torso_lengths) if not np.isnan(torso_lengths).all() else np.nan
+    
+    metrics = {
+        "avg_hip_angle": nan_mean(hip_angles),
+        "avg_knee_angle": nan_mean(knee_angles),
+        "avg_com_velocity": None,
+        "avg_com_jerk": None,
+        "stability_score": None,
+        "frames_analyzed": int((~np.isnan(torso_lengths)).sum())
+    }
+    
+    if np.isnan(torso_length) or torso_length <= 0 or fps <= 0:
+        return metrics
+    
+    window = get_smoothing_window(fps)
+    center_of_mass = smooth_series((shoulder_midpoint + hip_midpoint) / 2 / torso_length, window)
+    
+    # Differences across a frame without a reliable torso are NaN and drop out
+    velocity = np.diff(center_of_mass, axis=0) * fps
+    jerk = np.diff(velocity, n=2, axis=0) * fps * fps
+    
+    metrics["avg_com_velocity"] = nan_mean(np.linalg.norm(velocity, axis=1))
+    
+    jerk_magnitude = np.linalg.norm(jerk, axis=1)
+    jerk_magnitude = jerk_magnitude[~np.isnan(jerk_magnitude)]
+    if jerk_magnitude.size:
+        rms_jerk = float(np.sqrt((jerk_magnitude ** 2).mean()))
+        metrics["avg_com_jerk"] = float(jerk_magnitude.mean())
+        metrics["stability_score"] = get_stability_score(rms_jerk)
+    
+    return metrics
+
+
+class OnlineMetricsAccumulator:
+    """
+    Computes the compute_climb_metrics() metrics incrementally, one frame at a time.
+    
+    Frames must arrive in frame order, as process_frames_with_pose() yields them.
+    Angles use Welford running means; the center of mass keeps only the last few
+    samples needed for smoothing and differencing, so the metrics are ready as soon
+    as the last frame is detected and a snapshot can be taken at any point.
+    Velocity and jerk are accumulated in pixels and divided by the median torso
+    length when a snapshot is taken, which gives the same values as the batch version
+    up to the median's precision: it comes from a fixed-bin torso length histogram
+    bounded by the frame diagonal, so memory stays flat however long the video is.
+    """
+    
+    def __init__(self, fps: float, frame_width: int, frame_height: int, landmark_thresholds: Dict[str, float]):
+        """
+        Initialize online metrics accumulator.
+        
+        Args:
+            fps: Video frame rate
+            frame_width: Video frame width in pixels
+            frame_height: Video frame height in pixels
+            landmark_thresholds: Group name -> visibility threshold, e.g. LANDMARK_THRESHOLDS
+        """
+        self.fps = fps
+        self.scale = np.array([frame_width, frame_height, frame_width], dtype=np.float64)
+        self.thresholds = build_threshold_array(landmark_thresholds)
+        self.window = get_smoothing_window(fps)
+        
+        # Welford running means: name -> [count, mean]
+        self.running_means = {"hip_angle": [0, 0.0], "knee_angle": [0, 0.0], "confidence": [0, 0.0]}
+        
+        self.frames_seen = 0
+        self.torso_count = 0
+        torso_bins = int(np.hypot(frame_width, frame_height) / TORSO_HISTOGRAM_BIN_PIXELS) + 1
+        self.torso_histogram = np.zeros(torso_bins, dtype=np.int64)
+        self.com_window: deque = deque(maxlen=self.window)  # (frame_index, com) raw, pixels
+        self.smoothed_com: deque = deque(maxlen=4)  # (frame_index, com) smoothed, pixels
+        self.velocity_sum = 0.0
+        self.velocity_count = 0
+        self.jerk_sum = 0.0
+        self.jerk_square_sum = 0.0
+        self.jerk_count = 0
+        
+        # Windowed hip midpoint variance (normalized coordinates)
+        self.hip_window: deque = deque(maxlen=max(1, int(round(fps * HIP_VARIANCE_WINDOW_SECONDS))))
+        self.hip_sum = np.zeros(2)
+        self.hip_square_sum = np.zeros(2)
+        
+        self.confidence_histogram = np.zeros(CONFIDENCE_HISTOGRAM_BINS, dtype=np.int64)
+    
+    def add_sample(self, name: str, value: float) -> None:
+        """Fold one sample into a Welford running mean."""
+        running = self.running_means[name]
+        running[0] += 1
+        running[1] += (value - running[1]) / running[0]
+    
+    def get_mean(self, name: str) -> Optional[float]:
+        """Current running mean, or None if it has no samples."""
+        count, mean = self.running_means[name]
+        return float(mean) if count else None
+    
+    def update(self, frame_pose: FramePose) -> None:
+        """
+        Add one frame's pose result.
+        
+        Args:
+            frame_pose: Pose result for the next frame
+        """
+        self.frames_seen += 1
+        
+        if frame_pose.landmarks is None:
+            self.com_window.clear()
+            return
+        
+        self.add_sample("confidence", frame_pose.overall_confidence)
+        bin_index = min(int(frame_pose.overall_confidence * CONFIDENCE_HISTOGRAM_BINS), CONFIDENCE_HISTOGRAM_BINS - 1)
+        self.confidence_histogram[max(bin_index, 0)] += 1
+        
+        # Same masking and angle definitions as the batch computation, on a single frame
+        positions = frame_pose.landmarks[:, [X, Y, Z]].astype(np.float64) * self.scale
+        positions[frame_pose.landmarks[:, VISIBILITY] < self.thresholds] = np.nan
+        positions = positions[None]
+        
+        for name, joints in (("hip_angle", HIP_ANGLE_JOINTS), ("knee_angle", KNEE_ANGLE_JOINTS)):
+            for angle in compute_joint_angles(positions, joints)[0]:
+                if not np.isnan(angle):
+                    self.add_sample(name, float(angle))
+        
+        shoulder_midpoint = positions[0, SHOULDER_LANDMARKS, :2].mean(axis=0)
+        hip_midpoint = positions[0, HIP_LANDMARKS, :2].mean(axis=0)
+        torso_length = float(np.linalg.norm(shoulder_midpoint - hip_midpoint))
+        
+        if np.isnan(torso_length):
+            self.com_window.clear()
+            return
+        
+        # Off-frame landmarks can make the torso longer than the diagonal; the last bin takes those
+        self.torso_histogram[min(int(torso_length / TORSO_HISTOGRAM_BIN_PIXELS), len(self.torso_histogram) - 1)] += 1
+        self.torso_count += 1
+        self.hip_window_push(hip_midpoint / self.scale[:2])
+        self.update_center_of_mass(frame_pose.frame_index, (shoulder_midpoint + hip_midpoint) / 2)
+    
+    def update_center_of_mass(self, frame_index: int, center_of_mass: np.ndarray) -> None:
+        """
+        Smooth the center of mass and accumulate velocity and jerk.
+        
+        A smoothed sample exists only for a complete window of consecutive frames,
+        and differences only between consecutive smoothed samples, matching
+        smooth_series() and np.diff() in the batch computation.
+        """
+        if self.com_window and self.com_window[-1][0] != frame_index - 1:
+            self.com_window.clear()
+        self.com_window.append((frame_index, center_of_mass))
+        
+        if len(self.com_window) < self.window:
+            return
+        
+        smoothed_index = frame_index - self.window // 2
+        smoothed = sum(com for _, com in self.com_window) / self.window
+        
+        if self.smoothed_com and self.smoothed_com[-1][0] != smoothed_index - 1:
+            self.smoothed_com.clear()
+        self.smoothed_com.append((smoothed_index, smoothed))
+        
+        if len(self.smoothed_com) >= 2:
+            self.velocity_sum += float(np.linalg.norm(self.smoothed_com[-1][1] - self.smoothed_com[-2][1])) * self.fps
+            self.velocity_count += 1
+        
+        if len(self.smoothed_com) == 4:
+            # Third difference of position = second difference of velocity
+            samples = [com for _, com in self.smoothed_com]
+            jerk = float(np.linalg.norm(samples[3] - 3 * samples[2] + 3 * samples[1] - samples[0])) * self.fps ** 3
+            self.jerk_sum += jerk
+            self.jerk_square_sum += jerk * jerk
+            self.jerk_count += 1
+    
+    def hip_window_push(self, hip_midpoint: np.ndarray) -> None:
+        """Slide the hip variance window by one reliable hip midpoint."""
+        if len(self.hip_window) == self.hip_window.maxlen:
+            oldest = self.hip_window[0]
+            self.hip_sum -= oldest
+            self.hip_square_sum -= oldest * oldest
+        self.hip_window.append(hip_midpoint)
+        self.hip_sum += hip_midpoint
+        self.hip_square_sum += hip_midpoint * hip_midpoint
+    
+    def get_hip_variance(self) -> Optional[float]:
+        """Variance of the hip midpoint over the current window (x + y, normalized units squared)."""
+        count = len(self.hip_window)
+        if count < 2:
+            return None
+        mean = self.hip_sum / count
+        return float(np.maximum(self.hip_square_sum / count - mean * mean, 0.0).sum())
+    
+    def get_torso_median(self) -> float:
+        """Median torso length in pixels from the histogram (bin centers), or 0.0 without samples."""
+        if not self.torso_count:
+            return 0.0
+        cumulative = np.cumsum(self.torso_histogram)
+        # Bins holding the middle sample(s), averaged for an even count like np.median
+        lower = int(np.searchsorted(cumulative, (self.torso_count - 1) // 2, side="right"))
+        upper = int(np.searchsorted(cumulative, self.torso_count // 2, side="right"))
+        return (lower + upper + 1) / 2 * TORSO_HISTOGRAM_BIN_PIXELS
+    
+    def get_state(self) -> Dict[str, Any]:
+        """
+        Convert the running state to a JSON-serializable dictionary.
+        
+        Used to checkpoint the accumulator next to completed detection chunks; its
+        size is bounded by the histograms and windows, not by the video length.
+        
+        Returns:
+            Dictionary for load_state()
+        """
+        torso_bins = np.flatnonzero(self.torso_histogram)
+        return {
+            "running_means": {name: list(running) for name, running in self.running_means.items()},
+            "frames_seen": self.frames_seen,
+            "torso_count": self.torso_count,
+            "torso_histogram": [torso_bins.tolist(), self.torso_histogram[torso_bins].tolist()],  # Sparse: bins, counts
+            "com_window": [(frame_index, com.tolist()) for frame_index, com in self.com_window],
+            "smoothed_com": [(frame_index, com.tolist()) for frame_index, com in self.smoothed_com],
+            "velocity": [self.velocity_sum, self.velocity_count],
+            "jerk": [self.jerk_sum, self.jerk_square_sum, self.jerk_count],
+            "hip_window": [hip_midpoint.tolist() for hip_midpoint in self.hip_window],
+            "hip_sums": [self.hip_sum.tolist(), self.hip_square_sum.tolist()],
+            "confidence_histogram": self.confidence_histogram.tolist()
+        }
+    
+    def load_state(self, state: Dict[str, Any]) -> None:
+        """
+        Continue from a state saved with get_state().
+        
+        The accumulator must have been created with the same frame rate, frame size
+        and thresholds; the next update() is the frame after the last one in the state.
+        
+        Args:
+            state: Dictionary from get_state()
+        """
+        self.running_means = {name: [int(running[0]), float(running[1])] for name, running in state["running_means"].items()}
+        self.frames_seen = state["frames_seen"]
+        self.torso_count = state["torso_count"]
+        self.torso_histogram[:] = 0
+        self.torso_histogram[state["torso_histogram"][0]] = state["torso_histogram"][1]
+        self.com_window = deque(((frame_index, np.array(com)) for frame_index, com in state["com_window"]), maxlen=self.window)
+        self.smoothed_com = deque(((frame_index, np.array(com)) for frame_index, com in state["smoothed_com"]), maxlen=4)
+        self.velocity_sum, self.velocity_count = state["velocity"]
+        self.jerk_sum, self.jerk_square_sum, self.jerk_count = state["jerk"]
+        self.hip_window = deque((np.array(hip_midpoint) for hip_midpoint in state["hip_window"]), maxlen=self.hip_window.maxlen)
+        self.hip_sum, self.hip_square_sum = np.array(state["hip_sums"][0]), np.array(state["hip_sums"][1])
+        self.confidence_histogram = np.array(state["confidence_histogram"], dtype=np.int64)
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get metrics for the frames seen so far.
+        
+        Returns:
+            Dictionary with the compute_climb_metrics() keys plus hip_variance,
+            avg_confidence, confidence_histogram and frames_seen
+        """
+        torso_length = self.get_torso_median()
+        
+        metrics = {
+            "avg_hip_angle": self.get_mean("hip_angle"),
+            "avg_knee_angle": self.get_mean("knee_angle"),
+            "avg_com_velocity": None,
+            "avg_com_jerk": None,
+            "stability_score": None,
+            "frames_analyzed": self.torso_count,
+            "hip_variance": self.get_hip_variance(),
+            "avg_confidence": self.get_mean("confidence"),
+            "confidence_histogram": self.confidence_histogram.tolist(),
+            "frames_seen": self.frames_seen
+        }
+        
+        if torso_length <= 0 or self.fps <= 0:
+            return metrics
+        
+        if self.velocity_count:
+            metrics["avg_com_velocity"] = self.velocity_sum / self.velocity_count / torso_length
+        if self.jerk_count:
+            rms_jerk = float(np.sqrt(self.jerk_square_sum / self.jerk_count)) / torso_length
+            metrics["avg_com_jerk"] = self.jerk_sum / self.jerk_count / torso_length
+            metrics["stability_score"] = get_stability_score(rms_jerk)
+        
+        return metrics
@@ -3,14 +3,30 @@ Motion tracer module for CruxVision.
 
 This module handles tracking and rendering motion trails for pose landmarks,
 specifically designed for visualizing movement paths in climbing videos.
+
+MotionTracer follows an anchor frame by frame in a fixed-size ring buffer (used
+when poses arrive while rendering). AnchorTrails computes the anchor positions and
+trail windows for a whole pose track at once, before rendering starts.
 """
 
 import logging
-from typing import List, Tuple, Optional, Dict, Any
+from typing import Dict, List, Tuple, Optional
+
+import numpy as np
+
+from backend.src.pipeline.pose_track import PoseTrack, X, Y, VISIBILITY
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+HIP_ANCHOR_LANDMARKS = (23, 24)  # left_hip, right_hip
+SHOULDER_ANCHOR_LANDMARKS = (11, 12)  # left_shoulder, right_shoulder
+ANCHOR_MIN_VISIBILITY = 0.3  # Both landmarks need this visibility to place an anchor
+
+# Trail as (positions, frame_indices): (K, 2) pixel positions and (K,) frame indices,
+# oldest first
+Trail = Tuple[np.ndarray, np.ndarray]
+
 
 class MotionTracer:
     """
@@ -18,6 +34,8 @@ class MotionTracer:
     
     Stores position history with frame indices and provides frame-rate-aware
     persistence for consistent trail duration across different video frame rates.
+    History lives in a fixed-capacity ring buffer holding one persistence window,
+    assuming at most one position per frame.
     """
     
     def __init__(self, fps: float, persistence_seconds: float = 2.0):
@@ -32,17 +50,21 @@ class MotionTracer:
         self.persistence_seconds = persistence_seconds
         self.max_age_frames = int(fps * persistence_seconds)
         
-        # Store position history as list of (x, y, frame_index) tuples
-        self.position_history: List[Tuple[float, float, int]] = []
+        # Ring buffer of positions; head is the next slot to write
+        self.capacity = self.max_age_frames + 1
+        self.positions = np.zeros((self.capacity, 2), dtype=np.float64)
+        self.frame_indices = np.zeros(self.capacity, dtype=np.int64)
+        self.head = 0
+        self.size = 0
         
-        logger.info(f"MotionTracer initialized: {fps}fps, {persistence_seconds}s persistence ({self.max_age_frames} frames)")
+        logger.debug(f"MotionTracer initialized: {fps}fps, {persistence_seconds}s persistence ({self.max_age_frames} frames)")
     
-    def calculate_hip_midpoint(self, landmarks_json: List[Dict], image_shape: Tuple[int, int, int]) -> Optional[Tuple[float, float]]:
+    def calculate_hip_midpoint(self, landmarks: np.ndarray, image_shape: Tuple[int, int, int]) -> Optional[Tuple[float, float]]:
         """
         Calculate hip midpoint anchor from MediaPipe landmarks.
         
         Args:
-            landmarks_json: List of landmark data from JSON
+            landmarks: (33, 4) array of normalized x, y, z, visibility (e.g. PoseTrack.get_landmarks())
             image_shape: Image dimensions (height, width, channels)
             
         Returns:
@@ -53,16 +75,16 @@ class MotionTracer:
             left_hip_idx = 23
             right_hip_idx = 24
             
-            if len(landmarks_json) <= max(left_hip_idx, right_hip_idx):
+            if landmarks is None or len(landmarks) <= max(left_hip_idx, right_hip_idx):
                 logger.warning("Not enough landmarks for hip midpoint calculation")
                 return None
             
-            left_hip = landmarks_json[left_hip_idx]
-            right_hip = landmarks_json[right_hip_idx]
+            left_hip = landmarks[left_hip_idx]
+            right_hip = landmarks[right_hip_idx]
             
             # Check confidence of both hips
-            left_confidence = left_hip.get("visibility", 0.0)
-            right_confidence = right_hip.get("visibility", 0.0)
+            left_confidence = left_hip[VISIBILITY]
+            right_confidence = right_hip[VISIBILITY]
             
             logger.debug(f"Hip confidence: left={left_confidence:.2f}, right={right_confidence:.2f}")
             
@@ -71,8 +93,8 @@ class MotionTracer:
                 return None
             
             # Calculate midpoint in normalized coordinates
-            mid_x = (left_hip["x"] + right_hip["x"]) / 2
-            mid_y = (left_hip["y"] + right_hip["y"]) / 2
+            mid_x = (left_hip[X] + right_hip[X]) / 2
+            mid_y = (left_hip[Y] + right_hip[Y]) / 2
             
             # Convert to pixel coordinates
             pixel_x = int(mid_x * image_shape[1])
@@ -85,7 +107,7 @@ class MotionTracer:
                 logger.debug(f"Hip midpoint out of bounds: ({pixel_x}, {pixel_y})")
                 return None
                 
-        except (KeyError, IndexError, TypeError) as e:
+        except (IndexError, TypeError) as e:
             logger.warning(f"Error calculating hip midpoint: {e}")
             return None
     
@@ -93,19 +115,35 @@ class MotionTracer:
         """
         Add a new position to the trail history.
         
+        Overwrites the oldest slot, which is outside the persistence window by the
+        time the buffer wraps around.
+        
         Args:
             x: X coordinate in pixels
             y: Y coordinate in pixels
             frame_index: Current frame index
         """
-        self.position_history.append((x, y, frame_index))
+        self.positions[self.head] = (x, y)
+        self.frame_indices[self.head] = frame_index
+        self.head = (self.head + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+    
+    def get_active_arrays(self, current_frame_index: int) -> Trail:
+        """
+        Get positions within the persistence window as arrays.
         
-        # Clean up old positions outside persistence window
-        current_frame = frame_index
-        self.position_history = [
-            (px, py, fi) for px, py, fi in self.position_history
-            if (current_frame - fi) <= self.max_age_frames
-        ]
+        Args:
+            current_frame_index: Current frame index
+            
+        Returns:
+            Tuple of ((K, 2) positions, (K,) frame indices), oldest first
+        """
+        order = (np.arange(self.head - self.size, self.head)) % self.capacity
+        positions = self.positions[order]
+        frame_indices = self.frame_indices[order]
+        
+        active = (current_frame_index - frame_indices) <= self.max_age_frames
+        return positions[active], frame_indices[active]
     
     def get_active_trail(self, current_frame_index: int) -> List[Tuple[float, float, int]]:
         """
@@ -117,10 +155,20 @@ class MotionTracer:
         Returns:
             List of (x, y, frame_index) tuples within persistence window
         """
-        return [
-            (x, y, fi) for x, y, fi in self.position_history
-            if (current_frame_index - fi) <= self.max_age_frames
-        ]
+        positions, frame_indices = self.get_active_arrays(current_frame_index)
+        return [(float(x), float(y), int(fi)) for (x, y), fi in zip(positions, frame_indices)]
+    
+    def get_fade_opacities(self, frame_ages: np.ndarray) -> np.ndarray:
+        """
+        Calculate fade opacities for an array of frame ages.
+        
+        Args:
+            frame_ages: Number of frames since each position was recorded
+            
+        Returns:
+            Opacity values between 0.0 (fully transparent) and 1.0 (fully opaque)
+        """
+        return get_fade_opacities(np.asarray(frame_ages), self.max_age_frames)
     
     def get_fade_opacity(self, frame_age: int) -> float:
         """
@@ -132,12 +180,7 @@ class MotionTracer:
         Returns:
             Opacity value between 0.0 (fully transparent) and 1.0 (fully opaque)
         """
-        if frame_age >= self.max_age_frames:
-            return 0.0
-        
-        # Linear fade: opacity decreases linearly with age
-        opacity = 1.0 - (frame_age / self.max_age_frames)
-        return max(0.0, opacity)
+        return float(self.get_fade_opacities(np.array([frame_age]))[0])
     
     def get_current_anchor_position(self) -> Optional[Tuple[float, float]]:
         """
@@ -146,8 +189,147 @@ class MotionTracer:
         Returns:
             (x, y) coordinates of the most recent position, or None if no history
         """
-        if not self.position_history:
+        if not self.size:
             return None
         
         # Return the most recent position
-        return self.position_history[-1][:2]
+        x, y = self.positions[(self.head - 1) % self.capacity]
+        return float(x), float(y)
+
+
+class AnchorTrails:
+    """
+    Anchor positions and per-frame trail windows for a whole video.
+    
+    Anchors are computed for every frame of a pose track in one vectorized pass.
+    The trail for frame i is the slice of anchors recorded in the frames
+    (i - persistence_frames, i], found by binary search, so rendering never filters
+    position lists.
+    """
+    
+    def __init__(self, frame_indices: np.ndarray, positions: np.ndarray, persistence_frames: int):
+        """
+        Initialize anchor trails.
+        
+        Args:
+            frame_indices: (M,) increasing indices of the frames that have an anchor
+            positions: (M, 2) integer pixel positions of those anchors
+            persistence_frames: Trail length in frames
+        """
+        self.frame_indices = frame_indices
+        self.positions = positions
+        self.persistence_frames = persistence_frames
+    
+    @classmethod
+    def from_pose_track(cls, pose_track: PoseTrack, image_shape: Tuple[int, ...], anchor_landmarks: Tuple[int, int], persistence_frames: int) -> "AnchorTrails":
+        """
+        Compute anchors for every frame of a pose track.
+        
+        Args:
+            pose_track: Pose track for the video
+            image_shape: Frame shape (height, width, ...) the anchors are drawn on
+            anchor_landmarks: Indices of the two landmarks whose midpoint is the anchor
+            persistence_frames: Trail length in frames
+            
+        Returns:
+            AnchorTrails for the track
+        """
+        frame_count = len(pose_track)
+        positions, valid = compute_anchor_positions(pose_track.landmarks[:frame_count], image_shape, anchor_landmarks)
+        valid &= pose_track.pose_detected[:frame_count]
+        
+        frame_indices = np.flatnonzero(valid)
+        return cls(frame_indices, positions[frame_indices], persistence_frames)
+    
+    def slice(self, start_frame: int, end_frame: Optional[int]) -> "AnchorTrails":
+        """
+        Get the anchors recorded in a frame range, keeping absolute frame indices.
+        
+        Args:
+            start_frame: First frame to keep
+            end_frame: Frame index to stop before, or None for the end of the video
+            
+        Returns:
+            AnchorTrails holding only that range (e.g. for one render segment)
+        """
+        start = np.searchsorted(self.frame_indices, start_frame, side="left")
+        end = len(self.frame_indices) if end_frame is None else np.searchsorted(self.frame_indices, end_frame, side="left")
+        return AnchorTrails(self.frame_indices[start:end], self.positions[start:end], self.persistence_frames)
+    
+    def get_trail(self, frame_index: int) -> Trail:
+        """
+        Get the trail to draw on a frame.
+        
+        Args:
+            frame_index: Frame being rendered
+            
+        Returns:
+            Tuple of ((K, 2) positions, (K,) frame indices), oldest first
+        """
+        start = np.searchsorted(self.frame_indices, frame_index - self.persistence_frames, side="right")
+        end = np.searchsorted(self.frame_indices, frame_index, side="right")
+        return self.positions[start:end], self.frame_indices[start:end]
+
+
+def compute_anchor_positions(landmarks: np.ndarray, image_shape: Tuple[int, ...], anchor_landmarks: Tuple[int, int]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compute the midpoint anchor of two landmarks for many frames at once.
+    
+    Matches the per-frame anchor calculation: both landmarks need
+    ANCHOR_MIN_VISIBILITY, normalized coordinates are truncated to pixels and the
+    anchor has to fall inside the image.
+    
+    Args:
+        landmarks: (N, 33, 4) array of normalized x, y, z, visibility
+        image_shape: Image dimensions (height, width, ...)
+        anchor_landmarks: Indices of the two landmarks
+        
+    Returns:
+        Tuple of ((N, 2) int32 pixel positions, (N,) bool mask of valid anchors)
+    """
+    height, width = image_shape[0], image_shape[1]
+    left = landmarks[:, anchor_landmarks[0]]
+    right = landmarks[:, anchor_landmarks[1]]
+    
+    positions = np.stack([
+        ((left[:, X] + right[:, X]) / 2 * width).astype(np.int32),
+        ((left[:, Y] + right[:, Y]) / 2 * height).astype(np.int32)
+    ], axis=1)
+    
+    valid = (left[:, VISIBILITY] >= ANCHOR_MIN_VISIBILITY) & (right[:, VISIBILITY] >= ANCHOR_MIN_VISIBILITY)
+    valid &= (positions[:, 0] >= 0) & (positions[:, 0] < width) & (positions[:, 1] >= 0) & (positions[:, 1] < height)
+    return positions, valid
+
+
+def compute_track_anchor_trails(pose_track: PoseTrack, image_shape: Tuple[int, ...], persistence_frames: int) -> Dict[str, AnchorTrails]:
+    """
+    Compute hip and shoulder anchor trails for a whole pose track.
+    
+    Args:
+        pose_track: Pose track for the video
+        image_shape: Frame shape (height, width, ...) the anchors are drawn on
+        persistence_frames: Trail length in frames
+        
+    Returns:
+        Dictionary with "hip" and "shoulder" AnchorTrails
+    """
+    return {
+        "hip": AnchorTrails.from_pose_track(pose_track, image_shape, HIP_ANCHOR_LANDMARKS, persistence_frames),
+        "shoulder": AnchorTrails.from_pose_track(pose_track, image_shape, SHOULDER_ANCHOR_LANDMARKS, persistence_frames)
+    }
+
+
+def get_fade_opacities(frame_ages: np.ndarray, max_age_frames: int) -> np.ndarray:
+    """
+    Linear fade: opacity 1.0 for a new position down to 0.0 at max_age_frames.
+    
+    Args:
+        frame_ages: Number of frames since each position was recorded
+        max_age_frames: Age at which positions become fully transparent
+        
+    Returns:
+        Opacity values between 0.0 and 1.0
+    """
+    opacities = np.clip(1.0 - frame_ages / max_age_frames, 0.0, 1.0)
+    opacities[frame_ages >= max_age_frames] = 0.0
+    return opacities
@@ -10,15 +10,24 @@ import cv2
 import json
 import logging
 import numpy as np
+import shutil
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Union
 
 # Add the project root to Python path for imports
 import sys
 sys.path.append(str(Path(__file__).parent.parent.parent.parent))
 
 from backend.src.utils.file_utils import OUTPUT_DIR, OVERLAY_DIR
-from backend.src.pipeline.motion_tracer import MotionTracer
+from backend.src.pipeline import video_encoder
+from backend.src.pipeline.video_encoder import FFmpegPipeEncoder, FFMPEG_BINARY, ffmpeg_available, get_copyable_audio_source, get_rotation_args
+from backend.src.pipeline.motion_tracer import MotionTracer, AnchorTrails, Trail, compute_track_anchor_trails, get_fade_opacities
+from backend.src.pipeline.pose_track import PoseTrack, LANDMARK_NAMES, X, Y, VISIBILITY
+from backend.src.utils.pose_store import get_pose_store_path, load_pose_store
+from backend.src.utils.video_metadata import VideoMetadata, get_video_metadata
+from backend.src.utils.frame_access import read_frame, orient_frame, iter_frames
+from backend.src.utils.result_cache import get_settings_fingerprint
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -36,6 +45,13 @@ TRACER_DOT_RADIUS = 10
 TRACER_PERSISTENCE_SECONDS = 2.0  # Frame-rate aware
 TRACER_DOT_SPACING = 1  # Draw every N frames
 
+# Segment-parallel rendering configuration
+PARALLEL_OVERLAY_WORKERS = 0  # Worker processes for overlay rendering; 0 or 1 renders serially
+MIN_RENDER_SEGMENT_FRAMES = 300  # Shorter videos are not worth splitting
+
+# Single-frame preview configuration
+PREVIEW_JPEG_QUALITY = 85
+
 # MediaPipe pose connections (climbing-focused, simplified)
 POSE_CONNECTIONS = [
     # Simple head indicator (nose to shoulders)
@@ -52,18 +68,6 @@ POSE_CONNECTIONS = [
     (16, 18), (18, 20), (20, 22), (22, 16),  # Right hand (wrist, pinky, index, thumb)
 ]
 
-# Landmark names for reference (33 landmarks total)
-LANDMARK_NAMES = [
-    "nose", "left_eye_inner", "left_eye", "left_eye_outer", "right_eye_inner",
-    "right_eye", "right_eye_outer", "left_ear", "right_ear", "mouth_left",
-    "mouth_right", "left_shoulder", "right_shoulder", "left_elbow", "right_elbow",
-    "left_wrist", "right_wrist", "left_pinky", "right_pinky", "left_index",
-    "right_index", "left_thumb", "right_thumb", "left_hip", "right_hip",
-    "left_knee", "right_knee", "left_ankle", "right_ankle", "left_heel",
-    "right_heel", "left_foot_index", "right_foot_index"
-]
-
-
 def load_pose_data(analysis_id: str) -> Dict[str, Any]:
     """
     Load pose data from JSON file.
@@ -95,28 +99,110 @@ def load_pose_data(analysis_id: str) -> Dict[str, Any]:
         raise
 
 
+def load_pose_track(analysis_id: str) -> Tuple[PoseTrack, Dict[str, Any]]:
+    """
+    Load pose results for an analysis, preferring the binary pose store.
+    
+    Analyses saved before the binary store existed fall back to the JSON file.
+    
+    Args:
+        analysis_id: Unique analysis identifier
+        
+    Returns:
+        Tuple of (pose_track, video_info)
+        
+    Raises:
+        FileNotFoundError: If no pose data exists for the analysis
+    """
+    store_file = get_pose_store_path(analysis_id)
+    if store_file.exists():
+        pose_track, metadata = load_pose_store(store_file)
+        logger.info(f"Loaded pose store for analysis {analysis_id}")
+        return pose_track, metadata.get("video_info", {})
+    
+    pose_data = load_pose_data(analysis_id)
+    return PoseTrack.from_frame_dicts(pose_data.get("frames", [])), pose_data.get("video_info", {})
+
+
+# Connection endpoints as a (C, 2) index array, and the landmarks drawn as joints
+# (all face landmarks except the nose are skipped)
+CONNECTION_ENDPOINTS = np.array(POSE_CONNECTIONS, dtype=np.intp)
+DRAWN_LANDMARK_MASK = np.ones(33, dtype=bool)
+DRAWN_LANDMARK_MASK[1:11] = False
+
+
+class RenderStats:
+    """
+    Counters for skeleton rendering, logged once per video instead of per frame.
+    """
+    
+    def __init__(self):
+        self.frames = 0
+        self.connections_total = 0
+        self.connections_filtered = 0
+        self.landmarks_total = 0
+        self.landmarks_filtered = 0
+    
+    def to_dict(self) -> Dict[str, int]:
+        """
+        Convert counters to a dictionary.
+        
+        Returns:
+            Dictionary of counters
+        """
+        return dict(vars(self))
+    
+    def log_summary(self) -> None:
+        """Log the share of connections and landmarks filtered out by confidence."""
+        if not self.frames:
+            return
+        connection_percentage = 100 * self.connections_filtered / max(self.connections_total, 1)
+        landmark_percentage = 100 * self.landmarks_filtered / max(self.landmarks_total, 1)
+        logger.info(
+            f"Skeleton rendering over {self.frames} frames: "
+            f"connections {self.connections_filtered}/{self.connections_total} ({connection_percentage:.1f}%) filtered out, "
+            f"landmarks {self.landmarks_filtered}/{self.landmarks_total} ({landmark_percentage:.1f}%) filtered out"
+        )
+
+
+def landmarks_to_pixels(landmarks: np.ndarray, image_shape: Tuple[int, ...]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Convert all landmarks to pixel coordinates at once.
+    
+    Args:
+        landmarks: (33, 4) array of normalized x, y, z, visibility
+        image_shape: Image shape (height, width, channels)
+        
+    Returns:
+        Tuple of ((33, 2) int32 pixel coordinates, (33,) bool mask of landmarks inside the image)
+    """
+    height, width = image_shape[0], image_shape[1]
+    pixels = np.stack([
+        (landmarks[:, X] * width).astype(np.int32),
+        (landmarks[:, Y] * height).astype(np.int32)
+    ], axis=1)
+    in_bounds = (pixels[:, 0] >= 0) & (pixels[:, 0] < width) & (pixels[:, 1] >= 0) & (pixels[:, 1] < height)
+    return pixels, in_bounds
 
 
-def get_landmark_coords(landmarks_json: List[Dict], landmark_index: int, image_shape: Tuple[int, int]) -> Optional[Tuple[int, int]]:
+def get_landmark_coords(landmarks: np.ndarray, landmark_index: int, image_shape: Tuple[int, int]) -> Optional[Tuple[int, int]]:
     """
     Get pixel coordinates for a landmark by index.
     
     Args:
-        landmarks_json: List of landmark data from JSON
+        landmarks: (33, 4) array of normalized x, y, z, visibility
         landmark_index: Index of the landmark (0-32)
         image_shape: Image shape (height, width, channels)
         
     Returns:
         Tuple of (x, y) pixel coordinates, or None if landmark not found
     """
-    if landmark_index >= len(landmarks_json):
+    if landmark_index >= len(landmarks):
         return None
     
-    landmark = landmarks_json[landmark_index]
-    
     # Convert normalized coordinates to pixel coordinates
-    x = int(landmark["x"] * image_shape[1])
-    y = int(landmark["y"] * image_shape[0])
+    x = int(landmarks[landmark_index, X] * image_shape[1])
+    y = int(landmarks[landmark_index, Y] * image_shape[0])
     
     # Check if coordinates are within image bounds
     if 0 <= x < image_shape[1] and 0 <= y < image_shape[0]:
@@ -125,14 +211,16 @@ def get_landmark_coords(landmarks_json: List[Dict], landmark_index: int, image_s
     return None
 
 
-def draw_skeleton_connections(image: cv2.Mat, landmarks_json: List[Dict], style: Dict[str, Any] = None) -> cv2.Mat:
+def draw_skeleton_connections(image: cv2.Mat, landmarks: np.ndarray, style: Dict[str, Any] = None, stats: Optional[RenderStats] = None, pixels: Optional[Tuple[np.ndarray, np.ndarray]] = None) -> cv2.Mat:
     """
-    Draw skeleton connections between landmarks.
+    Draw skeleton connections between landmarks in place.
     
     Args:
         image: OpenCV image to draw on
-        landmarks_json: List of landmark data from JSON
+        landmarks: (33, 4) array of normalized x, y, z, visibility
         style: Drawing style configuration
+        stats: Counters to update with filtering statistics
+        pixels: Result of landmarks_to_pixels(), if already computed
         
     Returns:
         Image with skeleton connections drawn
@@ -143,49 +231,35 @@ def draw_skeleton_connections(image: cv2.Mat, landmarks_json: List[Dict], style:
             "connection_thickness": 5  # Increased thickness for better visibility
         }
     
-    # Track connection filtering statistics
-    total_connections = 0
-    filtered_connections = 0
+    points, in_bounds = pixels if pixels is not None else landmarks_to_pixels(landmarks, image.shape)
     
-    for connection in POSE_CONNECTIONS:
-        total_connections += 1
-        
-        # Check confidence of both endpoints
-        landmark1 = landmarks_json[connection[0]]
-        landmark2 = landmarks_json[connection[1]]
-        
-        confidence1 = landmark1.get("visibility", 0.0)
-        confidence2 = landmark2.get("visibility", 0.0)
-        
-        # Both endpoints must pass confidence threshold
-        both_pass_threshold = confidence1 >= CONFIDENCE_THRESHOLD and confidence2 >= CONFIDENCE_THRESHOLD
-        
-        if both_pass_threshold:
-            point1 = get_landmark_coords(landmarks_json, connection[0], image.shape)
-            point2 = get_landmark_coords(landmarks_json, connection[1], image.shape)
-            
-            if point1 and point2:
-                cv2.line(image, point1, point2, style["connection_color"], style["connection_thickness"])
-        else:
-            filtered_connections += 1
+    # Both endpoints must pass the confidence threshold and lie inside the image
+    confident = landmarks[:, VISIBILITY] >= CONFIDENCE_THRESHOLD
+    passes_threshold = confident[CONNECTION_ENDPOINTS].all(axis=1)
+    visible = passes_threshold & in_bounds[CONNECTION_ENDPOINTS].all(axis=1)
     
-    # Log filtering statistics
-    if total_connections > 0:
-        filtered_percentage = (filtered_connections / total_connections) * 100
-        logger.info(f"Connection filtering: {filtered_connections}/{total_connections} ({filtered_percentage:.1f}%) filtered out")
+    if visible.any():
+        # One 2-point polyline per connection: same pixels as individual cv2.line calls
+        cv2.polylines(image, list(points[CONNECTION_ENDPOINTS[visible]]), False, style["connection_color"], style["connection_thickness"])
+    
+    if stats is not None:
+        stats.connections_total += len(CONNECTION_ENDPOINTS)
+        stats.connections_filtered += int((~passes_threshold).sum())
     
     return image
 
 
-def draw_skeleton_landmarks(image: cv2.Mat, landmarks_json: List[Dict], style: Dict[str, Any] = None) -> cv2.Mat:
+def draw_skeleton_landmarks(image: cv2.Mat, landmarks: np.ndarray, style: Dict[str, Any] = None, stats: Optional[RenderStats] = None, pixels: Optional[Tuple[np.ndarray, np.ndarray]] = None) -> cv2.Mat:
     """
-    Draw skeleton landmarks (joint points).
+    Draw skeleton landmarks (joint points) in place.
     For climbing analysis, we only draw the nose and body landmarks, skipping face details.
     
     Args:
         image: OpenCV image to draw on
-        landmarks_json: List of landmark data from JSON
+        landmarks: (33, 4) array of normalized x, y, z, visibility
         style: Drawing style configuration
+        stats: Counters to update with filtering statistics
+        pixels: Result of landmarks_to_pixels(), if already computed
         
     Returns:
         Image with skeleton landmarks drawn
@@ -197,62 +271,43 @@ def draw_skeleton_landmarks(image: cv2.Mat, landmarks_json: List[Dict], style: D
             "confidence_based": True
         }
     
-    # Face landmark indices to skip (except nose which is 0)
-    face_landmarks_to_skip = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]  # All face landmarks except nose
+    points, in_bounds = pixels if pixels is not None else landmarks_to_pixels(landmarks, image.shape)
+    confidence = landmarks[:, VISIBILITY]
+    drawn_mask = DRAWN_LANDMARK_MASK[:len(landmarks)]
     
-    # Track filtering statistics
-    total_landmarks = 0
-    filtered_landmarks = 0
+    # Apply confidence filtering based on mode
+    candidates = drawn_mask & in_bounds
+    below_threshold = candidates & (confidence < CONFIDENCE_THRESHOLD)
+    should_draw = candidates if DEBUG_MODE else candidates & ~below_threshold
     
-    for i, landmark in enumerate(landmarks_json):
-        # Skip face landmarks except nose
-        if i in face_landmarks_to_skip:
-            continue
-            
-        total_landmarks += 1
-        coords = get_landmark_coords(landmarks_json, i, image.shape)
-        if coords:
-            x, y = coords
-            
-            # Get confidence score
-            confidence = landmark.get("visibility", 0.0)
-            
-            # Apply confidence filtering based on mode
-            should_draw = True
-            if not DEBUG_MODE:
-                # Regular mode: filter by confidence threshold
-                should_draw = confidence >= CONFIDENCE_THRESHOLD
-                if not should_draw:
-                    filtered_landmarks += 1
-            
-            if should_draw:
-                # Determine landmark color based on confidence if enabled
-                if style.get("confidence_based", False):
-                    if confidence > 0.8:
-                        color = (0, 255, 0)  # Green - high confidence
-                    elif confidence > 0.5:
-                        color = (255, 255, 0)  # Yellow - medium confidence
-                    else:
-                        color = (255, 0, 0)  # Red - low confidence
-                else:
-                    color = style["landmark_color"]
-                
-                cv2.circle(image, (x, y), style["landmark_radius"], color, -1)
+    for i in np.flatnonzero(should_draw):
+        # Determine landmark color based on confidence if enabled
+        if style.get("confidence_based", False):
+            if confidence[i] > 0.8:
+                color = (0, 255, 0)  # Green - high confidence
+            elif confidence[i] > 0.5:
+                color = (255, 255, 0)  # Yellow - medium confidence
+            else:
+                color = (255, 0, 0)  # Red - low confidence
+        else:
+            color = style["landmark_color"]
+        
+        cv2.circle(image, (int(points[i, 0]), int(points[i, 1])), style["landmark_radius"], color, -1)
     
-    # Log filtering statistics
-    if total_landmarks > 0:
-        filtered_percentage = (filtered_landmarks / total_landmarks) * 100
-        logger.info(f"Landmark filtering: {filtered_landmarks}/{total_landmarks} ({filtered_percentage:.1f}%) filtered out")
+    if stats is not None:
+        stats.landmarks_total += int(drawn_mask.sum())
+        if not DEBUG_MODE:
+            stats.landmarks_filtered += int(below_threshold.sum())
     
     return image
 
 
-def calculate_shoulder_midpoint(landmarks_json: List[Dict], image_shape: Tuple[int, int, int]) -> Optional[Tuple[int, int]]:
+def calculate_shoulder_midpoint(landmarks: np.ndarray, image_shape: Tuple[int, int, int]) -> Optional[Tuple[int, int]]:
     """
     Calculate shoulder midpoint anchor from MediaPipe landmarks.
     
     Args:
-        landmarks_json: List of landmark data from JSON
+        landmarks: (33, 4) array of normalized x, y, z, visibility
         image_shape: Image shape (height, width, channels)
         
     Returns:
@@ -263,21 +318,21 @@ def calculate_shoulder_midpoint(landmarks_json: List[Dict], image_shape: Tuple[i
         left_shoulder_idx = 11
         right_shoulder_idx = 12
         
-        if len(landmarks_json) <= max(left_shoulder_idx, right_shoulder_idx):
+        if len(landmarks) <= max(left_shoulder_idx, right_shoulder_idx):
             return None
         
-        left_shoulder = landmarks_json[left_shoulder_idx]
-        right_shoulder = landmarks_json[right_shoulder_idx]
+        left_shoulder = landmarks[left_shoulder_idx]
+        right_shoulder = landmarks[right_shoulder_idx]
         
-        left_confidence = left_shoulder.get("visibility", 0.0)
-        right_confidence = right_shoulder.get("visibility", 0.0)
+        left_confidence = left_shoulder[VISIBILITY]
+        right_confidence = right_shoulder[VISIBILITY]
         
         if left_confidence < 0.3 or right_confidence < 0.3:
             return None
         
         # Calculate midpoint in normalized coordinates
-        mid_x = (left_shoulder["x"] + right_shoulder["x"]) / 2
-        mid_y = (left_shoulder["y"] + right_shoulder["y"]) / 2
+        mid_x = (left_shoulder[X] + right_shoulder[X]) / 2
+        mid_y = (left_shoulder[Y] + right_shoulder[Y]) / 2
         
         # Convert to pixel coordinates
         pixel_x = int(mid_x * image_shape[1])
@@ -294,12 +349,12 @@ def calculate_shoulder_midpoint(landmarks_json: List[Dict], image_shape: Tuple[i
         return None
 
 
-def calculate_hip_midpoint(landmarks_json: List[Dict], image_shape: Tuple[int, int, int]) -> Optional[Tuple[int, int]]:
+def calculate_hip_midpoint(landmarks: np.ndarray, image_shape: Tuple[int, int, int]) -> Optional[Tuple[int, int]]:
     """
     Calculate hip midpoint anchor from MediaPipe landmarks.
     
     Args:
-        landmarks_json: List of landmark data from JSON
+        landmarks: (33, 4) array of normalized x, y, z, visibility
         image_shape: Image shape (height, width, channels)
         
     Returns:
@@ -310,21 +365,21 @@ def calculate_hip_midpoint(landmarks_json: List[Dict], image_shape: Tuple[int, i
         left_hip_idx = 23
         right_hip_idx = 24
         
-        if len(landmarks_json) <= max(left_hip_idx, right_hip_idx):
+        if len(landmarks) <= max(left_hip_idx, right_hip_idx):
             return None
         
-        left_hip = landmarks_json[left_hip_idx]
-        right_hip = landmarks_json[right_hip_idx]
+        left_hip = landmarks[left_hip_idx]
+        right_hip = landmarks[right_hip_idx]
         
-        left_confidence = left_hip.get("visibility", 0.0)
-        right_confidence = right_hip.get("visibility", 0.0)
+        left_confidence = left_hip[VISIBILITY]
+        right_confidence = right_hip[VISIBILITY]
         
         if left_confidence < 0.3 or right_confidence < 0.3:
             return None
         
         # Calculate midpoint in normalized coordinates
-        mid_x = (left_hip["x"] + right_hip["x"]) / 2
-        mid_y = (left_hip["y"] + right_hip["y"]) / 2
+        mid_x = (left_hip[X] + right_hip[X]) / 2
+        mid_y = (left_hip[Y] + right_hip[Y]) / 2
         
         # Convert to pixel coordinates
         pixel_x = int(mid_x * image_shape[1])
@@ -341,13 +396,93 @@ def calculate_hip_midpoint(landmarks_json: List[Dict], image_shape: Tuple[int, i
         return None
 
 
-def draw_motion_tracers(image: cv2.Mat, landmarks_json: List[Dict], hip_tracer_positions: List[Tuple[int, int]], shoulder_tracer_positions: List[Tuple[int, int]], current_frame_index: int, fps: float) -> cv2.Mat:
+def blend_tracer_dot(image: cv2.Mat, center: Tuple[int, int], color: Tuple[int, int, int], opacity: float) -> None:
+    """
+    Alpha-blend a filled tracer dot into an image in place.
+    
+    Only the dot's bounding box is blended, so the cost depends on TRACER_DOT_RADIUS
+    rather than the frame size. Pixels outside the dot are unchanged by the blend,
+    so the result is identical to blending a full-frame copy with cv2.addWeighted.
+    
+    Args:
+        image: OpenCV image to draw on (modified in place)
+        center: Dot center in pixels
+        color: Dot color in BGR
+        opacity: Dot opacity between 0.0 and 1.0
+    """
+    x, y = center
+    height, width = image.shape[:2]
+    x0, y0 = max(x - TRACER_DOT_RADIUS, 0), max(y - TRACER_DOT_RADIUS, 0)
+    x1, y1 = min(x + TRACER_DOT_RADIUS + 1, width), min(y + TRACER_DOT_RADIUS + 1, height)
+    if x0 >= x1 or y0 >= y1:
+        return  # Dot lies completely outside the frame
+    
+    roi = image[y0:y1, x0:x1]
+    dot_roi = roi.copy()
+    cv2.circle(dot_roi, (x - x0, y - y0), TRACER_DOT_RADIUS, color, -1)
+    roi[:] = cv2.addWeighted(roi, 1.0 - opacity, dot_roi, opacity, 0)
+
+
+def draw_tracer_trail(image: cv2.Mat, trail: Trail, color: Tuple[int, int, int], current_frame_index: int, persistence_frames: int) -> None:
+    """
+    Draw a fading tracer trail in place.
+    
+    Args:
+        image: OpenCV image to draw on (modified in place)
+        trail: (positions, frame_indices) of the trail, oldest first
+        color: Dot color in BGR
+        current_frame_index: Current frame number
+        persistence_frames: Trail length in frames
+    """
+    positions, frame_indices = trail
+    if not len(frame_indices):
+        return
+    
+    # Calculate fade opacity (1.0 = solid, 0.0 = transparent) for all dots at once
+    opacities = get_fade_opacities(current_frame_index - frame_indices, persistence_frames)
+    
+    # Only draw dots that are visible enough
+    for (x, y), opacity in zip(positions[opacities > 0.1], opacities[opacities > 0.1]):
+        blend_tracer_dot(image, (int(x), int(y)), color, float(opacity))
+
+
+def draw_anchor_trails(image: cv2.Mat, hip_trail: Trail, shoulder_trail: Trail, hip_anchor: Optional[Tuple[int, int]], shoulder_anchor: Optional[Tuple[int, int]], current_frame_index: int, persistence_frames: int) -> None:
+    """
+    Draw hip and shoulder tracer trails and the current anchor dots in place.
+    
+    Args:
+        image: OpenCV image to draw on (modified in place)
+        hip_trail: Hip trail (positions, frame_indices)
+        shoulder_trail: Shoulder trail (positions, frame_indices)
+        hip_anchor: Current hip midpoint in pixels, or None
+        shoulder_anchor: Current shoulder midpoint in pixels, or None
+        current_frame_index: Current frame number
+        persistence_frames: Trail length in frames
+    """
+    draw_tracer_trail(image, hip_trail, HIP_TRACER_COLOR, current_frame_index, persistence_frames)
+    draw_tracer_trail(image, shoulder_trail, SHOULDER_TRACER_COLOR, current_frame_index, persistence_frames)
+    
+    if hip_anchor:
+        cv2.circle(image, hip_anchor, TRACER_DOT_RADIUS, HIP_TRACER_COLOR, -1)
+    if shoulder_anchor:
+        cv2.circle(image, shoulder_anchor, TRACER_DOT_RADIUS, SHOULDER_TRACER_COLOR, -1)
+
+
+def positions_to_trail(tracer_positions: List[Tuple[int, int, int]]) -> Trail:
+    """Convert a list of (x, y, frame_index) tuples to trail arrays."""
+    if not tracer_positions:
+        return np.zeros((0, 2), dtype=np.int32), np.zeros(0, dtype=np.int64)
+    positions = np.array(tracer_positions, dtype=np.int64)
+    return positions[:, :2], positions[:, 2]
+
+
+def draw_motion_tracers(image: cv2.Mat, landmarks: Optional[np.ndarray], hip_tracer_positions: List[Tuple[int, int]], shoulder_tracer_positions: List[Tuple[int, int]], current_frame_index: int, fps: float) -> cv2.Mat:
     """
     Draw red dot at hip midpoint and purple dot at shoulder midpoint with tracer trails.
     
     Args:
         image: OpenCV image to draw on
-        landmarks_json: List of landmark data from JSON
+        landmarks: (33, 4) array of normalized x, y, z, visibility
         hip_tracer_positions: List of (x, y, frame_index) tuples from last 2 seconds for hip
         shoulder_tracer_positions: List of (x, y, frame_index) tuples from last 2 seconds for shoulder
         current_frame_index: Current frame number
@@ -356,54 +491,19 @@ def draw_motion_tracers(image: cv2.Mat, landmarks_json: List[Dict], hip_tracer_p
     Returns:
         Image with hip and shoulder midpoint dots and tracer trails drawn
     """
-    if not TRACER_ENABLED or not landmarks_json:
+    if not TRACER_ENABLED or landmarks is None or not len(landmarks):
         return image
     
     try:
-        # Draw hip tracer trail
-        persistence_frames = int(fps * TRACER_PERSISTENCE_SECONDS)
-        
-        # Draw hip tracer trail
-        for x, y, frame_idx in hip_tracer_positions:
-            frame_age = current_frame_index - frame_idx
-            if frame_age < persistence_frames:
-                # Calculate fade opacity (1.0 = solid, 0.0 = transparent)
-                opacity = 1.0 - (frame_age / persistence_frames)
-                opacity = max(0.0, min(1.0, opacity))  # Clamp between 0 and 1
-                
-                # Draw faded dot
-                if opacity > 0.1:  # Only draw if visible enough
-                    # Create temporary image for alpha blending
-                    temp_image = image.copy()
-                    cv2.circle(temp_image, (x, y), TRACER_DOT_RADIUS, HIP_TRACER_COLOR, -1)
-                    image = cv2.addWeighted(image, 1.0 - opacity, temp_image, opacity, 0)
-        
-        # Draw shoulder tracer trail
-        for x, y, frame_idx in shoulder_tracer_positions:
-            frame_age = current_frame_index - frame_idx
-            if frame_age < persistence_frames:
-                # Calculate fade opacity (1.0 = solid, 0.0 = transparent)
-                opacity = 1.0 - (frame_age / persistence_frames)
-                opacity = max(0.0, min(1.0, opacity))  # Clamp between 0 and 1
-                
-                # Draw faded dot
-                if opacity > 0.1:  # Only draw if visible enough
-                    # Create temporary image for alpha blending
-                    temp_image = image.copy()
-                    cv2.circle(temp_image, (x, y), TRACER_DOT_RADIUS, SHOULDER_TRACER_COLOR, -1)
-                    image = cv2.addWeighted(image, 1.0 - opacity, temp_image, opacity, 0)
-        
-        # Calculate and draw current hip position
-        hip_midpoint = calculate_hip_midpoint(landmarks_json, image.shape)
-        if hip_midpoint:
-            pixel_x, pixel_y = hip_midpoint
-            cv2.circle(image, (pixel_x, pixel_y), TRACER_DOT_RADIUS, HIP_TRACER_COLOR, -1)
-        
-        # Calculate and draw current shoulder position
-        shoulder_midpoint = calculate_shoulder_midpoint(landmarks_json, image.shape)
-        if shoulder_midpoint:
-            pixel_x, pixel_y = shoulder_midpoint
-            cv2.circle(image, (pixel_x, pixel_y), TRACER_DOT_RADIUS, SHOULDER_TRACER_COLOR, -1)
+        draw_anchor_trails(
+            image,
+            positions_to_trail(hip_tracer_positions),
+            positions_to_trail(shoulder_tracer_positions),
+            calculate_hip_midpoint(landmarks, image.shape),
+            calculate_shoulder_midpoint(landmarks, image.shape),
+            current_frame_index,
+            int(fps * TRACER_PERSISTENCE_SECONDS)
+        )
         
     except Exception as e:
         logger.warning(f"Error drawing motion tracers: {e}")
@@ -411,14 +511,18 @@ def draw_motion_tracers(image: cv2.Mat, landmarks_json: List[Dict], hip_tracer_p
     return image
 
 
-def draw_skeleton_overlay(image: cv2.Mat, landmarks_json: List[Dict], style: Dict[str, Any] = None, hip_tracer_positions: List[Tuple[int, int]] = None, shoulder_tracer_positions: List[Tuple[int, int]] = None, current_frame_index: int = 0, fps: float = 30.0) -> cv2.Mat:
+def draw_skeleton_overlay(image: cv2.Mat, landmarks: np.ndarray, style: Dict[str, Any] = None, hip_tracer_positions: List[Tuple[int, int]] = None, shoulder_tracer_positions: List[Tuple[int, int]] = None, current_frame_index: int = 0, fps: float = 30.0, draw_tracers: bool = True, in_place: bool = False, stats: Optional[RenderStats] = None) -> cv2.Mat:
     """
     Draw complete skeleton overlay on an image.
     
     Args:
         image: OpenCV image to draw on
-        landmarks_json: List of landmark data from JSON
+        landmarks: (33, 4) array of normalized x, y, z, visibility
         style: Drawing style configuration
+        draw_tracers: Draw hip/shoulder dots and trails; OverlayFrameRenderer turns
+            this off and draws its own tracked trails
+        in_place: Draw directly on image instead of a copy
+        stats: Counters to update with filtering statistics
         
     Returns:
         Image with complete skeleton overlay
@@ -432,106 +536,52 @@ def draw_skeleton_overlay(image: cv2.Mat, landmarks_json: List[Dict], style: Dic
             "confidence_based": True
         }
     
-    # Create a copy to avoid modifying the original
-    annotated_image = image.copy()
+    # Draw on a copy unless the caller owns the frame
+    annotated_image = image if in_place else image.copy()
+    
+    # All landmarks are converted to pixels once for connections and joints
+    pixels = landmarks_to_pixels(landmarks, annotated_image.shape)
     
     # Draw connections first (so landmarks appear on top)
-    annotated_image = draw_skeleton_connections(annotated_image, landmarks_json, style)
+    annotated_image = draw_skeleton_connections(annotated_image, landmarks, style, stats, pixels)
     
     # Draw landmarks
-    annotated_image = draw_skeleton_landmarks(annotated_image, landmarks_json, style)
-    
-    # Draw hip and shoulder midpoint dots and tracers
-    annotated_image = draw_motion_tracers(annotated_image, landmarks_json, hip_tracer_positions or [], shoulder_tracer_positions or [], current_frame_index, fps)
-    
-    return annotated_image
-
-
-def draw_motion_tracer(image: cv2.Mat, tracer: MotionTracer, current_frame_index: int) -> cv2.Mat:
-    """
-    Draw motion tracer trail on an image.
-    
-    Args:
-        image: OpenCV image to draw on
-        tracer: MotionTracer instance with position history
-        current_frame_index: Current frame index for fade calculations
-        
-    Returns:
-        Image with motion tracer trail drawn
-    """
-    if not TRACER_ENABLED or not tracer:
-        return image
+    annotated_image = draw_skeleton_landmarks(annotated_image, landmarks, style, stats, pixels)
     
-    # Create a copy to avoid modifying the original
-    annotated_image = image.copy()
+    if stats is not None:
+        stats.frames += 1
     
-    try:
-        # Get active trail positions
-        active_trail = tracer.get_active_trail(current_frame_index)
-        
-        if not active_trail:
-            logger.info(f"No active trail for frame {current_frame_index}")
-            return annotated_image
-        
-        # Draw trail dots (older to newer for proper layering)
-        for x, y, frame_index in active_trail:
-            frame_age = current_frame_index - frame_index
-            
-            # Calculate fade opacity
-            opacity = tracer.get_fade_opacity(frame_age)
-            
-            if opacity > 0.0:
-                # Create a temporary image for the dot
-                dot_image = annotated_image.copy()
-                cv2.circle(dot_image, (int(x), int(y)), TRACER_DOT_RADIUS, TRACER_COLOR, -1)
-                
-                # Blend with main image using alpha blending
-                annotated_image = cv2.addWeighted(annotated_image, 1.0 - opacity, dot_image, opacity, 0)
-        
-        # Draw current anchor position as solid red circle
-        current_pos = tracer.get_current_anchor_position()
-        if current_pos:
-            x, y = current_pos
-            cv2.circle(annotated_image, (int(x), int(y)), TRACER_DOT_RADIUS, TRACER_COLOR, -1)
-        
-        logger.info(f"Motion tracer drawn: {len(active_trail)} trail dots, current position: {current_pos}")
-        
-    except Exception as e:
-        logger.warning(f"Error drawing motion tracer: {e}")
+    # Draw hip and shoulder midpoint dots and tracers
+    if draw_tracers:
+        annotated_image = draw_motion_tracers(annotated_image, landmarks, hip_tracer_positions or [], shoulder_tracer_positions or [], current_frame_index, fps)
     
     return annotated_image
 
 
-def load_video_frame(video_path: str, frame_index: int) -> Optional[cv2.Mat]:
+def load_video_frame(video_path: str, frame_index: int, analysis_id: Optional[str] = None) -> Optional[cv2.Mat]:
     """
     Load a specific frame from a video file.
     
+    Frames come from the shared frame access service, which indexes the video
+    once and keeps decoders open, so repeated calls do not reopen the file.
+    
     Args:
         video_path: Path to the video file
         frame_index: Index of the frame to load
+        analysis_id: Analysis the video belongs to; its record caches the metadata
         
     Returns:
         OpenCV Mat object or None if frame not found
     """
-    cap = cv2.VideoCapture(video_path)
-    if not cap.isOpened():
-        logger.error(f"Cannot open video file: {video_path}")
+    try:
+        frame = read_frame(video_path, frame_index, analysis_id)
+    except ValueError as e:
+        logger.error(f"Cannot open video file: {video_path}: {str(e)}")
         return None
     
-    try:
-        # Set frame position
-        cap.set(cv2.CAP_PROP_POS_FRAMES, frame_index)
-        
-        # Read frame
-        ret, frame = cap.read()
-        if ret:
-            return frame
-        else:
-            logger.warning(f"Could not read frame {frame_index} from {video_path}")
-            return None
-            
-    finally:
-        cap.release()
+    if frame is None:
+        logger.warning(f"Could not read frame {frame_index} from {video_path}")
+    return frame
 
 
 def test_overlay_on_sample_frames(analysis_id: str, num_frames: int = 5) -> None:
@@ -546,12 +596,10 @@ def test_overlay_on_sample_frames(analysis_id: str, num_frames: int = 5) -> None
     
     try:
         # Load pose data
-        pose_data = load_pose_data(analysis_id)
-        frames_data = pose_data["frames"]
-        video_info = pose_data["video_info"]
+        pose_track, video_info = load_pose_track(analysis_id)
         
         # Determine sample frame indices
-        total_frames = len(frames_data)
+        total_frames = len(pose_track)
         sample_indices = [i * total_frames // num_frames for i in range(num_frames)]
         
         logger.info(f"Testing overlay on {num_frames} sample frames: {sample_indices}")
@@ -576,26 +624,20 @@ def test_overlay_on_sample_frames(analysis_id: str, num_frames: int = 5) -> None
                 logger.error(f"No video file found in uploads directory")
                 return
         
-        # Test overlay on each sample frame
+        # Orientation is the same for every sample
+        rotation = get_decoded_frame_rotation(video_path, analysis_id)
+        
+        # Test overlay on each sample frame; samples are in order, so the pooled decoder
+        # only seeks when a keyframe lies between two samples
         for i, frame_idx in enumerate(sample_indices):
-            frame_data = frames_data[frame_idx]
             
             # Load original frame
-            original_frame = load_video_frame(video_path, frame_idx)
+            original_frame = load_video_frame(video_path, frame_idx, analysis_id)
             if original_frame is None:
                 logger.warning(f"Could not load frame {frame_idx}")
                 continue
             
             # Apply rotation if needed (same logic as video generation)
-            rotation = get_video_rotation(video_path)
-            
-            # Get original video dimensions before rotation
-            cap = cv2.VideoCapture(video_path)
-            original_width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-            original_height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-            original_shape = (original_height, original_width)
-            cap.release()
-            
             if rotation != 0:
                 if rotation == 90:
                     original_frame = cv2.rotate(original_frame, cv2.ROTATE_90_CLOCKWISE)
@@ -605,8 +647,8 @@ def test_overlay_on_sample_frames(analysis_id: str, num_frames: int = 5) -> None
                     original_frame = cv2.rotate(original_frame, cv2.ROTATE_90_COUNTERCLOCKWISE)
             
             # Draw skeleton overlay if pose was detected
-            if frame_data.get("pose_detected", False):
-                landmarks = frame_data["landmarks"]
+            landmarks = pose_track.get_landmarks(frame_idx)
+            if landmarks is not None:
                 
                 # Create overlay with custom styling
                 style = {
@@ -617,7 +659,7 @@ def test_overlay_on_sample_frames(analysis_id: str, num_frames: int = 5) -> None
                     "confidence_based": True
                 }
                 
-                annotated_frame = draw_skeleton_overlay(original_frame, landmarks, style, rotation, original_shape)
+                annotated_frame = draw_skeleton_overlay(original_frame, landmarks, style)
                 
                 # Save test image
                 output_path = OUTPUT_DIR / f"overlay_test_frame_{frame_idx}_{analysis_id}.jpg"
@@ -626,7 +668,7 @@ def test_overlay_on_sample_frames(analysis_id: str, num_frames: int = 5) -> None
                 logger.info(f"Saved overlay test image: {output_path}")
                 
                 # Log pose detection info
-                confidence = frame_data.get("overall_confidence", 0.0)
+                confidence = float(pose_track.overall_confidence[frame_idx])
                 logger.info(f"Frame {frame_idx}: Pose detected with confidence {confidence:.3f}")
             else:
                 logger.info(f"Frame {frame_idx}: No pose detected")
@@ -644,7 +686,7 @@ def test_overlay_with_existing_data() -> None:
     logger.info("Testing overlay rendering with existing pose data")
     
     # Find the most recent pose data file
-    pose_files = list(OUTPUT_DIR.glob("pose_data_*.json"))
+    pose_files = list(OUTPUT_DIR.glob("pose_data_*.pose")) + list(OUTPUT_DIR.glob("pose_data_*.json"))
     if not pose_files:
         logger.error("No pose data files found in output directory")
         return
@@ -693,272 +735,541 @@ def find_original_video(analysis_id: str) -> str:
 
 
 
-def get_video_rotation(video_path: str) -> int:
+def get_video_rotation(video_path: str, analysis_id: Optional[str] = None) -> int:
     """
-    Get video rotation from metadata using ffprobe.
+    Get video rotation from the display-matrix metadata.
     
     Args:
         video_path: Path to the video file
+        analysis_id: Analysis whose record caches the probed metadata
         
     Returns:
         Rotation angle in degrees (0, 90, 180, 270)
     """
     try:
-        import subprocess
-        import json
-        
-        # Use ffprobe to get rotation metadata
-        cmd = [
-            'ffprobe', '-v', 'quiet', '-print_format', 'json', 
-            '-show_streams', video_path
-        ]
-        
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        data = json.loads(result.stdout)
-        
-        # Find video stream and check for rotation
-        rotation = 0
-        for stream in data.get('streams', []):
-            if stream.get('codec_type') == 'video':
-                # Check side_data for Display Matrix rotation
-                side_data_list = stream.get('side_data_list', [])
-                for side_data in side_data_list:
-                    if side_data.get('side_data_type') == 'Display Matrix':
-                        rotation = side_data.get('rotation', 0)
-                        break
-                break
-        
-        # Normalize rotation to 0, 90, 180, 270
-        rotation = rotation % 360
-        if rotation not in [0, 90, 180, 270]:
-            logger.warning(f"Unexpected rotation angle {rotation}, defaulting to 0")
-            rotation = 0
-            
+        rotation = get_video_metadata(video_path, analysis_id).rotation
         logger.info(f"Video rotation detected: {rotation} degrees")
         return rotation
         
     except Exception as e:
-        logger.warning(f"Failed to detect video rotation with ffprobe: {str(e)}, defaulting to 0")
+        logger.warning(f"Failed to detect video rotation: {str(e)}, defaulting to 0")
+        return 0
+
+
+def get_decoded_frame_rotation(video_path: str, analysis_id: Optional[str] = None) -> int:
+    """
+    Get the rotation that frames decoded by OpenCV still need for display.
+    
+    Recent OpenCV builds apply the display matrix while decoding
+    (CAP_PROP_ORIENTATION_AUTO), so frames and the landmarks detected on them
+    are already upright; older builds return the stored orientation.
+    
+    Args:
+        video_path: Path to the video file
+        analysis_id: Analysis whose record caches the probed metadata
+        
+    Returns:
+        Rotation angle in degrees (0, 90, 180, 270), 0 if frames are already upright
+    """
+    try:
+        return get_video_metadata(video_path, analysis_id).decoded_rotation
+    except Exception as e:
+        logger.warning(f"Failed to detect video rotation: {str(e)}, defaulting to 0")
         return 0
 
 
-def setup_video_writer(analysis_id: str, video_path: str) -> Tuple[cv2.VideoWriter, Dict[str, Any]]:
+def get_overlay_output_path(analysis_id: str, video_path: str) -> str:
     """
-    Setup OpenCV VideoWriter for overlay video generation.
+    Get the overlay video path for an analysis.
+    
+    The name includes a fingerprint of the render settings, so an existing file is
+    a finished overlay for the current settings and can be served as is.
     
     Args:
         analysis_id: Unique identifier for the analysis
         video_path: Path to the original video file
         
     Returns:
-        Tuple of (video_writer, video_properties)
-    """
-    # Get video properties from original video
-    cap = cv2.VideoCapture(video_path)
-    fps = int(cap.get(cv2.CAP_PROP_FPS))
-    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-    height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-    cap.release()
-    
-    # Check rotation to adjust output dimensions
-    rotation = get_video_rotation(video_path)
-    if rotation in [90, 270, -90]:
-        # Swap width and height for portrait videos
-        width, height = height, width
-        logger.info(f"Rotation detected: {rotation}°, swapping dimensions to {width}x{height}")
-    
-    # Setup output video path with original filename
+        Path of the overlay video in the overlays directory
+    """
     original_filename = Path(video_path).stem  # Get filename without extension
     analysis_prefix = analysis_id[:8]  # First 8 characters of analysis ID
-    output_path = f"backend/static/overlays/overlay_{original_filename}_{analysis_prefix}.mp4"
+    render_key = get_settings_fingerprint(get_render_settings())[:8]  # Changes with any render setting
+    return f"backend/static/overlays/overlay_{original_filename}_{analysis_prefix}_{render_key}.mp4"
+
+
+def get_overlay_stream_dir(analysis_id: str, video_path: str) -> Path:
+    """
+    Get the directory of the progressive HLS stream written alongside the overlay video.
+    
+    Args:
+        analysis_id: Unique identifier for the analysis
+        video_path: Path to the original video file
+        
+    Returns:
+        Stream directory, named after the overlay video it mirrors
+    """
+    overlay_file = Path(get_overlay_output_path(analysis_id, video_path))
+    return overlay_file.with_name(f"{overlay_file.stem}_stream")
+
+
+def get_render_settings() -> Dict[str, Any]:
+    """
+    Collect every setting that changes the rendered overlay video.
+    
+    Returns:
+        JSON-serializable dictionary of overlay and encoder settings
+    """
+    return {
+        "overlay": [
+            CONFIDENCE_THRESHOLD, DEBUG_MODE, TRACER_ENABLED,
+            HIP_TRACER_COLOR, SHOULDER_TRACER_COLOR, TRACER_DOT_RADIUS,
+            TRACER_PERSISTENCE_SECONDS, TRACER_DOT_SPACING
+        ],
+        "encoder": [
+            ffmpeg_available(), video_encoder.ENCODE_PRESET, video_encoder.ENCODE_CRF, video_encoder.COPY_AUDIO,
+            video_encoder.PROGRESSIVE_OUTPUT, video_encoder.STREAM_SEGMENT_SECONDS
+        ]
+    }
+
+
+def create_video_writer(output_path: str, video_properties: Dict[str, Any], audio_source: Optional[str] = None) -> Union[FFmpegPipeEncoder, cv2.VideoWriter]:
+    """
+    Open the overlay video encoder.
+    
+    Uses a single ffmpeg encode when ffmpeg is installed (rotation as metadata,
+    exact frame rate, copied audio), otherwise an H264 OpenCV VideoWriter. When
+    video_properties["stream_dir"] is set, the directory is emptied and the ffmpeg
+    encoder also writes the progressive HLS stream there.
+    
+    Args:
+        output_path: Path of the video file to write
+        video_properties: Output properties from get_video_properties()
+        audio_source: Video whose audio is copied into the output (ffmpeg only), or None
+        
+    Returns:
+        Opened video writer
+        
+    Raises:
+        RuntimeError: If the writer cannot be opened
+    """
+    width, height = video_properties["width"], video_properties["height"]
+    
+    if video_properties["encoder"] == "ffmpeg":
+        stream_dir = video_properties.get("stream_dir")
+        if stream_dir:
+            # Never append to the playlist of an earlier, possibly interrupted render
+            shutil.rmtree(stream_dir, ignore_errors=True)
+            Path(stream_dir).mkdir(parents=True)
+        return FFmpegPipeEncoder(output_path, width, height, video_properties["frame_rate"], video_properties["rotation"], audio_source, stream_dir=stream_dir)
     
-    # Create video writer with rotated dimensions
     fourcc = cv2.VideoWriter_fourcc(*'H264')
-    video_writer = cv2.VideoWriter(output_path, fourcc, fps, (width, height))
+    video_writer = cv2.VideoWriter(output_path, fourcc, float(video_properties["frame_rate"]), (width, height))
     
     if not video_writer.isOpened():
         raise RuntimeError(f"Failed to create video writer for {output_path}")
+    return video_writer
+
+
+def get_video_properties(analysis_id: str, video_path: str, output_path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Work out the overlay output properties from the cached video metadata.
+    
+    Nothing is opened or written, so callers that render through other writers
+    (e.g. segment workers) can use the properties without starting an encoder.
+    
+    Args:
+        analysis_id: Unique identifier for the analysis
+        video_path: Path to the original video file
+        output_path: Where to write the overlay, defaults to get_overlay_output_path()
+        
+    Returns:
+        Output properties; "frame_rotation" is the rotation the renderer has to apply
+        to pixels (0 with the ffmpeg encoder) and "stream_dir" the progressive stream
+        directory, if any
+    """
+    # Get video properties from the metadata probed at upload
+    metadata = get_video_metadata(video_path, analysis_id)
+    width, height = metadata.width, metadata.height
+    rotation = metadata.decoded_rotation
+    encoder = "ffmpeg" if ffmpeg_available() else "opencv"
+    
+    # OpenCV cannot write rotation metadata, so frames are rotated instead
+    frame_rotation = rotation if encoder == "opencv" else 0
+    if frame_rotation in [90, 270, -90]:
+        # Swap width and height for portrait videos
+        width, height = height, width
+        logger.info(f"Rotation detected: {rotation}°, swapping dimensions to {width}x{height}")
+    
+    # Setup output video path with original filename
+    output_path = output_path or get_overlay_output_path(analysis_id, video_path)
     
     video_properties = {
-        "fps": fps,
+        "fps": metadata.fps,
+        "frame_rate": metadata.frame_rate,
         "width": width,
         "height": height,
         "output_path": output_path,
         "original_video_path": video_path,
-        "rotation": rotation
+        "rotation": rotation,
+        "frame_rotation": frame_rotation,
+        "encoder": encoder,
+        "audio_source": get_copyable_audio_source(video_path, metadata.audio_codec) if encoder == "ffmpeg" else None,
+        # Keyed by the final overlay name, also when rendering to a partial file
+        "stream_dir": str(get_overlay_stream_dir(analysis_id, video_path)) if encoder == "ffmpeg" and video_encoder.PROGRESSIVE_OUTPUT else None
     }
+    return video_properties
+
+
+def setup_video_writer(analysis_id: str, video_path: str, output_path: Optional[str] = None) -> Tuple[Union[FFmpegPipeEncoder, cv2.VideoWriter], Dict[str, Any]]:
+    """
+    Setup the video writer for overlay video generation.
+    
+    Args:
+        analysis_id: Unique identifier for the analysis
+        video_path: Path to the original video file
+        output_path: Where to write the overlay, defaults to get_overlay_output_path()
+        
+    Returns:
+        Tuple of (video_writer, video_properties) with the properties from
+        get_video_properties()
+    """
+    video_properties = get_video_properties(analysis_id, video_path, output_path)
+    video_writer = create_video_writer(video_properties["output_path"], video_properties, video_properties["audio_source"])
     
-    logger.info(f"Video writer setup: {width}x{height} @ {fps}fps -> {output_path}")
+    logger.info(f"Video writer setup ({video_properties['encoder']}): {video_properties['width']}x{video_properties['height']} @ {video_properties['frame_rate']}fps -> {video_properties['output_path']}")
     return video_writer, video_properties
 
 
-def get_pose_for_frame(pose_data: List[Dict], frame_index: int) -> Optional[Dict]:
+def index_pose_frames(pose_data: List[Dict]) -> Dict[int, Dict]:
+    """
+    Build a frame-index lookup for pose data dictionaries.
+    
+    Frames missing from the list (sampled out, errored or never decoded) simply
+    have no key, so lookups for them return None without scanning.
+    
+    Args:
+        pose_data: List of pose data dictionaries, each with a frame_index
+        
+    Returns:
+        Dictionary mapping frame index to its pose data dictionary
+    """
+    return {pose_frame["frame_index"]: pose_frame for pose_frame in pose_data if "frame_index" in pose_frame}
+
+
+def get_pose_for_frame(pose_index: Dict[int, Dict], frame_index: int) -> Optional[Dict]:
     """
     Get pose data for a specific frame index.
     
+    Rendering loops should use the PoseTrack arrays (get_landmarks) instead; this
+    serves callers still working with pose_data dictionaries.
+    
     Args:
-        pose_data: List of pose data dictionaries
+        pose_index: Frame-index lookup from index_pose_frames()
         frame_index: Frame index to get pose data for
         
     Returns:
         Pose data dictionary for the frame, or None if not found
     """
-    for pose_frame in pose_data:
-        if pose_frame.get("frame_index") == frame_index:
-            return pose_frame
+    return pose_index.get(frame_index)
+
+
+def get_current_anchor(trail: Trail, frame_index: int) -> Optional[Tuple[int, int]]:
+    """Get a trail's anchor position for the given frame, or None if it has none."""
+    positions, frame_indices = trail
+    if len(frame_indices) and frame_indices[-1] == frame_index:
+        return int(positions[-1, 0]), int(positions[-1, 1])
     return None
 
 
-def process_video_frames(video_path: str, pose_data: List[Dict], video_writer: cv2.VideoWriter, rotation: int = 0) -> None:
+class OverlayFrameRenderer:
+    """
+    Renders skeleton and motion tracer overlays one frame at a time.
+    
+    Carries the hip/shoulder tracer trails between frames so it can be fed either
+    by a decode loop over saved pose data (re-rendering) or directly by the pose
+    detection loop (fused single-decode pipeline).
+    """
+    
+    def __init__(self, fps: float, rotation: int = 0, anchor_trails: Optional[Dict[str, AnchorTrails]] = None):
+        """
+        Initialize overlay frame renderer.
+        
+        Args:
+            fps: Video frame rate, used for frame-rate-aware tracer persistence
+            rotation: Rotation angle in degrees (0, 90, 180, 270, or -90)
+            anchor_trails: Hip and shoulder trails precomputed for the whole video
+                (compute_track_anchor_trails()); when None, trails are tracked as
+                frames are rendered
+        """
+        self.fps = fps
+        self.rotation = rotation
+        self.persistence_frames = int(fps * TRACER_PERSISTENCE_SECONDS)
+        self.frames_rendered = 0
+        self.frames_with_overlay = 0
+        self.anchor_trails = anchor_trails
+        self.stats = RenderStats()
+        
+        # Ring-buffer trails for poses that arrive while rendering; not needed when
+        # trails are precomputed (e.g. single-frame previews)
+        self.hip_tracer = None
+        self.shoulder_tracer = None
+        if anchor_trails is None:
+            self.hip_tracer = MotionTracer(fps, TRACER_PERSISTENCE_SECONDS)
+            self.shoulder_tracer = MotionTracer(fps, TRACER_PERSISTENCE_SECONDS)
+    
+    def get_trails(self, frame: cv2.Mat, frame_index: int, landmarks: np.ndarray) -> Tuple[Trail, Trail]:
+        """
+        Get the hip and shoulder trails ending at this frame.
+        
+        Each anchor midpoint is computed once per frame (or once per video when
+        trails were precomputed).
+        
+        Args:
+            frame: Decoded video frame (BGR)
+            frame_index: Index of the frame in the video
+            landmarks: (33, 4) landmark array for this frame
+            
+        Returns:
+            Tuple of (hip_trail, shoulder_trail)
+        """
+        if self.anchor_trails is not None:
+            return self.anchor_trails["hip"].get_trail(frame_index), self.anchor_trails["shoulder"].get_trail(frame_index)
+        
+        hip_midpoint = calculate_hip_midpoint(landmarks, frame.shape)
+        if hip_midpoint:
+            self.hip_tracer.add_position(*hip_midpoint, frame_index)
+        
+        shoulder_midpoint = calculate_shoulder_midpoint(landmarks, frame.shape)
+        if shoulder_midpoint:
+            self.shoulder_tracer.add_position(*shoulder_midpoint, frame_index)
+        
+        return self.hip_tracer.get_active_arrays(frame_index), self.shoulder_tracer.get_active_arrays(frame_index)
+    
+    def render(self, frame: cv2.Mat, frame_index: int, landmarks: Optional[np.ndarray]) -> cv2.Mat:
+        """
+        Draw the overlay for one frame and apply output rotation.
+        
+        Args:
+            frame: Decoded video frame (BGR)
+            frame_index: Index of the frame in the video
+            landmarks: (33, 4) landmark array for this frame, or None if no pose
+            
+        Returns:
+            Frame ready to be written to the overlay video
+        """
+        if landmarks is not None:
+            if len(landmarks):
+                hip_trail, shoulder_trail = self.get_trails(frame, frame_index, landmarks)
+                
+                # The decoded frame is owned by the renderer, so draw on it directly
+                frame = draw_skeleton_overlay(frame, landmarks, draw_tracers=False, in_place=True, stats=self.stats)
+                if TRACER_ENABLED:
+                    # The current anchor is the newest trail position when it is from this frame
+                    draw_anchor_trails(
+                        frame, hip_trail, shoulder_trail,
+                        get_current_anchor(hip_trail, frame_index), get_current_anchor(shoulder_trail, frame_index),
+                        frame_index, self.persistence_frames
+                    )
+                self.frames_with_overlay += 1
+                
+        # If no pose data, just use original frame
+        
+        # Rotate frame to compensate for original rotation
+        if self.rotation == 90:
+            frame = cv2.rotate(frame, cv2.ROTATE_90_COUNTERCLOCKWISE)
+        elif self.rotation == 180:
+            frame = cv2.rotate(frame, cv2.ROTATE_180)
+        elif self.rotation == 270 or self.rotation == -90:
+            frame = cv2.rotate(frame, cv2.ROTATE_90_CLOCKWISE)
+        
+        self.frames_rendered += 1
+        return frame
+
+
+def process_video_frames(video_path: str, pose_track: PoseTrack, video_writer: cv2.VideoWriter, metadata: VideoMetadata, rotation: int = 0, start_frame: int = 0, end_frame: Optional[int] = None, anchor_trails: Optional[Dict[str, AnchorTrails]] = None) -> None:
     """
     Process video frames and write overlay video.
     
+    Used to re-render an overlay from saved pose data; the fused pipeline in
+    pose_detection feeds OverlayFrameRenderer directly instead of decoding twice.
+    
     Args:
         video_path: Path to the original video file
-        pose_data: List of pose data dictionaries
+        pose_track: Pose track for the video
         video_writer: OpenCV VideoWriter for output
+        metadata: Video metadata probed at upload (get_video_metadata()); frame size
+            and frame rate come from here, like in every other rendering path
         rotation: Rotation angle in degrees (0, 90, 180, 270, or -90)
+        start_frame: First frame to render (seeks frame-accurately when > 0)
+        end_frame: Frame index to stop before, or None for the end of the video
+        anchor_trails: Precomputed hip and shoulder trails; computed from the pose
+            track when None
     """
-    cap = cv2.VideoCapture(video_path)
-
-    # Get original video dimensions and fps
-    original_width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-    original_height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-    fps = cap.get(cv2.CAP_PROP_FPS)
+    # Decoded frame size and frame rate from the cached metadata
+    original_width, original_height = metadata.width, metadata.height
 
-    frame_index = 0
-    frames_processed = 0
-    frames_with_overlay = 0
-    
-    # Initialize tracer position storage
-    hip_tracer_positions = []  # List of (x, y, frame_index) tuples for hip
-    shoulder_tracer_positions = []  # List of (x, y, frame_index) tuples for shoulder
+    # All anchor positions and trail windows are known up front when re-rendering
+    if anchor_trails is None:
+        anchor_trails = compute_track_anchor_trails(pose_track, (original_height, original_width), int(metadata.fps * TRACER_PERSISTENCE_SECONDS))
+    renderer = OverlayFrameRenderer(metadata.fps, rotation, anchor_trails)
 
-    logger.info(f"Starting video frame processing for {len(pose_data)} pose frames")
+    logger.info(f"Starting video frame processing for {pose_track.frames_stored} pose frames")
     logger.info(f"Original video dimensions: {original_width}x{original_height}, rotation: {rotation}°")
 
-    while True:
-        ret, frame = cap.read()
-        if not ret:
-            break
-
-        # Get pose data for this frame
-        frame_pose_data = get_pose_for_frame(pose_data, frame_index)
-
-        if frame_pose_data and frame_pose_data.get("pose_detected", False):
-            # Draw skeleton overlay
-            landmarks = frame_pose_data.get("landmarks", [])
-            if landmarks:
-                # Calculate hip midpoint for tracer
-                hip_midpoint = calculate_hip_midpoint(landmarks, frame.shape)
-                if hip_midpoint:
-                    x, y = hip_midpoint
-                    hip_tracer_positions.append((x, y, frame_index))
-                
-                # Calculate shoulder midpoint for tracer
-                shoulder_midpoint = calculate_shoulder_midpoint(landmarks, frame.shape)
-                if shoulder_midpoint:
-                    x, y = shoulder_midpoint
-                    shoulder_tracer_positions.append((x, y, frame_index))
-                
-                # Remove old positions (keep only last 2 seconds)
-                persistence_frames = int(fps * TRACER_PERSISTENCE_SECONDS)
-                hip_tracer_positions = [
-                    pos for pos in hip_tracer_positions 
-                    if frame_index - pos[2] < persistence_frames
-                ]
-                shoulder_tracer_positions = [
-                    pos for pos in shoulder_tracer_positions 
-                    if frame_index - pos[2] < persistence_frames
-                ]
-                
-                frame = draw_skeleton_overlay(frame, landmarks, None, hip_tracer_positions, shoulder_tracer_positions, frame_index, fps)
-                frames_with_overlay += 1
-                
-        # If no pose data, just use original frame
-
-        # Rotate frame to compensate for original rotation
-        if rotation == 90:
-            frame = cv2.rotate(frame, cv2.ROTATE_90_COUNTERCLOCKWISE)
-        elif rotation == 180:
-            frame = cv2.rotate(frame, cv2.ROTATE_180)
-        elif rotation == 270 or rotation == -90:
-            frame = cv2.rotate(frame, cv2.ROTATE_90_CLOCKWISE)
+    for frame_index, frame in iter_frames(video_path, start_frame, end_frame, metadata):
+        # Get landmarks for this frame
+        landmarks = pose_track.get_landmarks(frame_index)
 
-        video_writer.write(frame)
-        frames_processed += 1
-        frame_index += 1
+        video_writer.write(renderer.render(frame, frame_index, landmarks))
 
         # Log progress every 50 frames
-        if frame_index % 50 == 0:
-            logger.info(f"Processed frame {frame_index}, overlay applied to {frames_with_overlay} frames")
+        if (frame_index + 1) % 50 == 0:
+            logger.info(f"Processed frame {frame_index + 1}, overlay applied to {renderer.frames_with_overlay} frames")
     
-    cap.release()
-    logger.info(f"Video processing completed: {frames_processed} frames processed, {frames_with_overlay} frames with overlay")
+    logger.info(f"Video processing completed: {renderer.frames_rendered} frames processed, {renderer.frames_with_overlay} frames with overlay")
+    renderer.stats.log_summary()
 
 
-def apply_video_rotation(original_video_path: str, overlay_video_path: str) -> None:
+def plan_render_segments(total_frames: int, workers: int) -> List[Tuple[int, Optional[int]]]:
     """
-    Apply video rotation to match original video orientation using ffmpeg.
+    Split a video into contiguous render segments.
     
     Args:
-        original_video_path: Path to the original video file
-        overlay_video_path: Path to the overlay video file
-    """
-    try:
-        import subprocess
-        import os
-        
-        # Convert to absolute paths
-        overlay_video_path = os.path.abspath(overlay_video_path)
-        original_video_path = os.path.abspath(original_video_path)
-        
-        logger.info(f"Applying rotation to {overlay_video_path}")
-        
-        # Get rotation from original video
-        rotation = get_video_rotation(original_video_path)
-        
-        if rotation == 0:
-            logger.info("No rotation needed for overlay video")
-            return
-        
-        # Determine transpose filter based on rotation
-        if rotation == 90:
-            transpose_filter = "transpose=1"  # 90 degrees clockwise
-        elif rotation == 180:
-            transpose_filter = "transpose=2,transpose=2"  # 180 degrees
-        elif rotation == 270 or rotation == -90:
-            transpose_filter = "transpose=2"  # 270 degrees clockwise (or -90)
-        else:
-            logger.warning(f"Unsupported rotation angle: {rotation}")
-            return
-        
-        # Use ffmpeg to rotate the video
-        cmd = [
-            'ffmpeg', '-i', overlay_video_path,
-            '-vf', transpose_filter,
-            '-c:v', 'libx264', '-c:a', 'aac',
-            '-y',  # Overwrite output file
-            overlay_video_path + '.tmp'
-        ]
+        total_frames: Number of frames in the video
+        workers: Number of worker processes
         
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        
-        # Replace the original file with the rotation-corrected version
-        import shutil
-        shutil.move(overlay_video_path + '.tmp', overlay_video_path)
+    Returns:
+        List of (start, end) frame ranges; the last segment's end is None so it
+        renders to the real end of the video even if the frame count is off
+    """
+    if total_frames <= 0:
+        return [(0, None)]
+    
+    segment_count = max(1, min(workers, total_frames // MIN_RENDER_SEGMENT_FRAMES))
+    segment_length = -(-total_frames // segment_count)  # Ceiling division
+    
+    starts = list(range(0, total_frames, segment_length))
+    return [(start, start + segment_length if i < len(starts) - 1 else None) for i, start in enumerate(starts)]
+
+
+def render_overlay_segment(analysis_id: str, video_path: str, segment_path: str, start: int, end: Optional[int], anchor_trails: Dict[str, AnchorTrails], video_properties: Dict[str, Any], metadata: VideoMetadata) -> str:
+    """
+    Render one overlay segment inside a worker process.
+    
+    Args:
+        analysis_id: Unique identifier for the analysis
+        video_path: Path to the original video file
+        segment_path: Path of the segment video to write
+        start: First frame of the segment
+        end: Frame index to stop before, or None for the end of the video
+        anchor_trails: Trails covering the segment and the persistence window before it
+        video_properties: Output properties from get_video_properties()
+        metadata: Video metadata from the parent process, so workers never probe the video
         
-        logger.info(f"Successfully rotated video ({rotation}°) for {overlay_video_path}")
+    Returns:
+        Path to the rendered segment
+    """
+    # Pose store is memory-mapped, so each worker only touches its own frames
+    pose_track, _ = load_pose_track(analysis_id)
+    
+    # Audio and rotation are added when the segments are joined
+    video_writer = create_video_writer(segment_path, {**video_properties, "rotation": 0, "stream_dir": None})
+    try:
+        process_video_frames(video_path, pose_track, video_writer, metadata, video_properties["frame_rotation"], start, end, anchor_trails)
+    finally:
+        video_writer.release()
+    
+    return segment_path
+
+
+def concatenate_video_segments(segment_paths: List[str], output_path: str, rotation: int = 0, audio_source: Optional[str] = None) -> None:
+    """
+    Join encoded video segments with the ffmpeg concat demuxer, without re-encoding.
+    
+    Every segment is a separate encode that starts on a keyframe, so the streams
+    can be copied as-is.
+    
+    Args:
+        segment_paths: Segment videos in playback order
+        output_path: Path of the joined video
+        rotation: Display rotation in degrees, written as metadata
+        audio_source: Video whose first audio stream is copied into the output, or None
         
+    Raises:
+        RuntimeError: If ffmpeg fails
+    """
+    import subprocess
+    import os
+    
+    list_path = f"{output_path}.segments.txt"
+    with open(list_path, 'w') as f:
+        for segment_path in segment_paths:
+            f.write(f"file '{os.path.abspath(segment_path)}'\n")
+    
+    rotation_input_args, rotation_output_args = get_rotation_args(rotation)
+    cmd = [FFMPEG_BINARY, '-v', 'error', *rotation_input_args, '-f', 'concat', '-safe', '0', '-i', list_path]
+    if audio_source:
+        cmd += ['-i', audio_source, '-map', '0:v:0', '-map', '1:a:0', '-shortest']
+    cmd += ['-c', 'copy', *rotation_output_args, '-movflags', '+faststart', '-y', output_path]
+    
+    try:
+        subprocess.run(cmd, capture_output=True, text=True, check=True)
     except subprocess.CalledProcessError as e:
-        logger.error(f"Failed to rotate video: {str(e)}, stderr: {e.stderr}")
-    except Exception as e:
-        logger.error(f"Failed to rotate video: {str(e)}")
-        # Clean up temp file if it exists
-        import os
-        temp_file = overlay_video_path + '.tmp'
-        if os.path.exists(temp_file):
-            os.remove(temp_file)
+        raise RuntimeError(f"Failed to concatenate overlay segments: {e.stderr}")
+    finally:
+        os.remove(list_path)
+
+
+def render_overlay_parallel(analysis_id: str, video_path: str, pose_track: PoseTrack, video_properties: Dict[str, Any], workers: int) -> None:
+    """
+    Render the overlay video in time segments across a process pool.
+    
+    Anchor trails are computed once for the whole video; each worker gets the
+    slice covering its segment plus the TRACER_PERSISTENCE_SECONDS before it, so
+    trails continue seamlessly across segment boundaries.
+    
+    Args:
+        analysis_id: Unique identifier for the analysis
+        video_path: Path to the original video file
+        pose_track: Pose track for the video
+        video_properties: Output properties from get_video_properties()
+        workers: Number of worker processes
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    import multiprocessing
+    
+    metadata = get_video_metadata(video_path, analysis_id)
+    total_frames = metadata.total_frames
+    frame_shape = (metadata.height, metadata.width)
+    persistence_frames = int(metadata.fps * TRACER_PERSISTENCE_SECONDS)
+    
+    anchor_trails = compute_track_anchor_trails(pose_track, frame_shape, persistence_frames)
+    segments = plan_render_segments(total_frames, workers)
+    
+    segment_dir = OVERLAY_DIR / f".segments_{analysis_id[:8]}"
+    shutil.rmtree(segment_dir, ignore_errors=True)
+    segment_dir.mkdir(parents=True)
+    
+    logger.info(f"Rendering overlay in {len(segments)} segments across {workers} worker processes")
+    
+    try:
+        # Spawn so workers never inherit a forked copy of the parent's MediaPipe graph
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+            futures = [
+                executor.submit(
+                    render_overlay_segment, analysis_id, video_path, str(segment_dir / f"segment_{index:03d}.mp4"), start, end,
+                    {name: trails.slice(start - persistence_frames, end) for name, trails in anchor_trails.items()},
+                    video_properties, metadata
+                )
+                for index, (start, end) in enumerate(segments)
+            ]
+            segment_paths = [future.result() for future in futures]
+        
+        concatenate_video_segments(segment_paths, video_properties["output_path"], video_properties["rotation"], video_properties["audio_source"])
+    finally:
+        shutil.rmtree(segment_dir, ignore_errors=True)
 
 
 def cleanup_video_writer(video_writer: cv2.VideoWriter) -> None:
@@ -973,12 +1284,13 @@ def cleanup_video_writer(video_writer: cv2.VideoWriter) -> None:
         logger.info("Video writer cleaned up")
 
 
-def generate_overlay_video(analysis_id: str) -> str:
+def generate_overlay_video(analysis_id: str, output_path: Optional[str] = None) -> str:
     """
     Generate complete overlay video from pose data and original video.
     
     Args:
         analysis_id: Unique identifier for the analysis
+        output_path: Where to write the overlay, defaults to get_overlay_output_path()
         
     Returns:
         Path to the generated overlay video file
@@ -991,27 +1303,34 @@ def generate_overlay_video(analysis_id: str) -> str:
     
     try:
         # Load pose data
-        pose_data_dict = load_pose_data(analysis_id)
-        if not pose_data_dict:
-            raise FileNotFoundError(f"No pose data found for analysis {analysis_id}")
-        
-        # Extract frames from pose data
-        pose_data = pose_data_dict.get("frames", [])
-        if not pose_data:
+        pose_track, _ = load_pose_track(analysis_id)
+        if not len(pose_track):
             raise FileNotFoundError(f"No frame data found in pose data for analysis {analysis_id}")
         
         # Find original video file
         video_path = find_original_video(analysis_id)
         
-        # Setup video writer
-        video_writer, video_properties = setup_video_writer(analysis_id, video_path)
-        
-        # Process video frames with rotation
-        rotation = video_properties.get("rotation", 0)
-        process_video_frames(video_path, pose_data, video_writer, rotation)
-        
-        # Cleanup
-        cleanup_video_writer(video_writer)
+        video_properties = get_video_properties(analysis_id, video_path, output_path)
+        
+        rendered = False
+        if PARALLEL_OVERLAY_WORKERS > 1 and video_properties["encoder"] == "ffmpeg" and len(pose_track) >= 2 * MIN_RENDER_SEGMENT_FRAMES:
+            # Segment workers write their own files; no serial writer or progressive stream
+            if video_properties["stream_dir"]:
+                shutil.rmtree(video_properties["stream_dir"], ignore_errors=True)
+            try:
+                render_overlay_parallel(analysis_id, video_path, pose_track, video_properties, PARALLEL_OVERLAY_WORKERS)
+                rendered = True
+            except Exception as parallel_error:
+                logger.warning(f"Parallel overlay rendering failed, rendering serially: {str(parallel_error)}")
+        
+        if not rendered:
+            video_writer = create_video_writer(video_properties["output_path"], video_properties, video_properties["audio_source"])
+            
+            # Process video frames, rotating pixels only when the encoder cannot write rotation metadata
+            process_video_frames(video_path, pose_track, video_writer, get_video_metadata(video_path, analysis_id), video_properties["frame_rotation"])
+            
+            # Cleanup
+            cleanup_video_writer(video_writer)
         
         output_path = video_properties["output_path"]
         original_video_path = video_properties["original_video_path"]
@@ -1024,3 +1343,78 @@ def generate_overlay_video(analysis_id: str) -> str:
         raise RuntimeError(f"Overlay video generation failed: {str(e)}")
 
 
+
+
+@lru_cache(maxsize=8)
+def load_frame_overlay_data(analysis_id: str, pose_mtime_ns: int, frame_shape: Tuple[int, int], persistence_frames: int) -> Tuple[PoseTrack, Dict[str, AnchorTrails]]:
+    """Load a pose track and its anchor trails once per version of the pose data."""
+    pose_track, _ = load_pose_track(analysis_id)
+    return pose_track, compute_track_anchor_trails(pose_track, frame_shape, persistence_frames)
+
+
+def render_overlay_frame(analysis_id: str, frame_index: int, draw_overlay: bool = True) -> Optional[cv2.Mat]:
+    """
+    Render a single frame of the overlay video, e.g. for thumbnails and scrubbing previews.
+    
+    The frame is read through the frame access service and drawn exactly like the
+    overlay video renders it, tracer trails included.
+    
+    Args:
+        analysis_id: Unique identifier for the analysis
+        frame_index: Index of the frame to render
+        draw_overlay: Draw the skeleton and tracers; False returns the upright original frame
+    
+    Returns:
+        Upright BGR frame, or None if the video has no frame at that index
+    
+    Raises:
+        FileNotFoundError: If the original video, or the pose data when drawing the overlay, is missing
+        ValueError: If the video cannot be opened
+    """
+    video_path = find_original_video(analysis_id)
+    metadata = get_video_metadata(video_path, analysis_id)
+    
+    frame = read_frame(video_path, frame_index, analysis_id)
+    if frame is None:
+        return None
+    
+    if not draw_overlay:
+        # Only the rotation the decoded frame still needs for display
+        return orient_frame(frame, metadata.decoded_rotation % 360)
+    
+    store_file = get_pose_store_path(analysis_id)
+    if not store_file.exists():
+        raise FileNotFoundError(f"Pose data not found for analysis {analysis_id}")
+    
+    persistence_frames = int(metadata.fps * TRACER_PERSISTENCE_SECONDS)
+    pose_track, anchor_trails = load_frame_overlay_data(analysis_id, store_file.stat().st_mtime_ns, (metadata.height, metadata.width), persistence_frames)
+    landmarks = pose_track.get_landmarks(frame_index)
+    
+    # The renderer also applies the display rotation; with precomputed trails it
+    # holds no tracer state, so a fresh one per frame is cheap
+    renderer = OverlayFrameRenderer(metadata.fps, metadata.decoded_rotation, anchor_trails)
+    return renderer.render(frame, frame_index, landmarks)
+
+
+def encode_preview_jpeg(frame: cv2.Mat, max_width: Optional[int] = None) -> bytes:
+    """
+    Encode a rendered frame as a JPEG preview.
+    
+    Args:
+        frame: BGR frame
+        max_width: Downscale wider frames to this width, keeping the aspect ratio
+        
+    Returns:
+        JPEG data
+        
+    Raises:
+        RuntimeError: If encoding fails
+    """
+    height, width = frame.shape[:2]
+    if max_width and width > max_width:
+        frame = cv2.resize(frame, (max_width, max(1, round(height * max_width / width))), interpolation=cv2.INTER_AREA)
+    
+    success, data = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, PREVIEW_JPEG_QUALITY])
+    if not success:
+        raise RuntimeError("Failed to encode preview frame")
+    return data.tobytes()
@@ -0,0 +1,134 @@
+"""
+Lazy overlay rendering for CruxVision.
+
+Analyses finish as soon as poses are extracted. The overlay video is a separate
+stage that runs the first time it is requested, or when a client enqueues it
+explicitly. Rendered overlays are kept on disk under a name keyed by analysis and
+render settings (get_overlay_output_path()), so later requests reuse them and a
+change in render settings renders a fresh one.
+
+While a job runs, the encoder also writes a progressive HLS stream next to the
+overlay (get_overlay_stream_dir()), so clients can start watching the first
+segments before the whole video is rendered.
+
+In this mode overlays are never rendered in the fused detection pass (that is
+pose_detection.LAZY_OVERLAY_RENDERING = False). A finished render is added to the
+analysis's result cache entry instead, so re-uploads of the clip reuse it.
+"""
+
+import logging
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Optional, Set
+
+from backend.src.pipeline.overlay import find_original_video, get_overlay_output_path, get_overlay_stream_dir, generate_overlay_video
+from backend.src.utils.analysis_storage import get_analysis_record, update_overlay_status
+from backend.src.utils.result_cache import attach_cached_overlay
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Analyses whose overlay is being rendered; guards against duplicate jobs
+active_renders: Set[str] = set()
+active_renders_lock = threading.Lock()
+
+
+def get_cached_overlay(analysis_id: str) -> Optional[str]:
+    """
+    Find a finished overlay for an analysis rendered with the current settings.
+    
+    Args:
+        analysis_id: Unique identifier for the analysis
+    
+    Returns:
+        Path of the overlay video, or None if it has not been rendered
+    
+    Raises:
+        FileNotFoundError: If the original video is missing
+    """
+    overlay_file = get_overlay_output_path(analysis_id, find_original_video(analysis_id))
+    return overlay_file if Path(overlay_file).exists() else None
+
+
+def request_overlay(analysis_id: str, retry_failed: bool = False) -> bool:
+    """
+    Request the overlay for a completed analysis.
+    
+    A cached overlay is picked up immediately; otherwise the analysis is marked as
+    rendering and the caller has to run render_overlay_job() (e.g. as a background task).
+    A failed render is only started again when retry_failed is set.
+    
+    Args:
+        analysis_id: Unique identifier for the analysis
+        retry_failed: Render again if the last render failed
+    
+    Returns:
+        True if a render job has to be started, False if the overlay is cached,
+        already being rendered, or failed and not retried
+    
+    Raises:
+        FileNotFoundError: If the original video is missing
+    """
+    with active_renders_lock:
+        if analysis_id in active_renders:
+            return False
+        
+        record = get_analysis_record(analysis_id)
+        cached_overlay = get_cached_overlay(analysis_id)
+        if cached_overlay:
+            if record is not None and record["overlay_status"] != "complete":
+                update_overlay_status(analysis_id, "complete", cached_overlay)
+            return False
+        
+        if record is not None and record["overlay_status"] == "error" and not retry_failed:
+            return False
+        
+        active_renders.add(analysis_id)
+    
+    update_overlay_status(analysis_id, "rendering")
+    return True
+
+
+def render_overlay_job(analysis_id: str) -> None:
+    """
+    Render the overlay for an analysis and record the result.
+    
+    The video is written to a partial file and renamed when complete, so an
+    interrupted render is never mistaken for a cached overlay. A failed render's
+    progressive stream is removed as well. A finished overlay is added to the
+    analysis's result cache entry.
+    
+    Args:
+        analysis_id: Unique identifier for the analysis
+    """
+    partial_file = None
+    stream_dir = None
+    try:
+        video_path = find_original_video(analysis_id)
+        overlay_file = Path(get_overlay_output_path(analysis_id, video_path))
+        stream_dir = get_overlay_stream_dir(analysis_id, video_path)
+        partial_file = overlay_file.with_name(f"{overlay_file.stem}.partial.mp4")
+        
+        generate_overlay_video(analysis_id, str(partial_file))
+        os.replace(partial_file, overlay_file)
+        
+        record = get_analysis_record(analysis_id)
+        if record is not None and record.get("cache_key"):
+            attach_cached_overlay(record["cache_key"], str(overlay_file))
+        
+        update_overlay_status(analysis_id, "complete", str(overlay_file))
+        logger.info(f"Overlay rendered on request for analysis {analysis_id}: {overlay_file}")
+    
+    except Exception as e:
+        logger.error(f"Overlay rendering failed for analysis {analysis_id}: {str(e)}")
+        if partial_file is not None:
+            partial_file.unlink(missing_ok=True)
+        if stream_dir is not None:
+            shutil.rmtree(stream_dir, ignore_errors=True)
+        update_overlay_status(analysis_id, "error", error_message=str(e))
+    
+    finally:
+        with active_renders_lock:
+            active_renders.discard(analysis_id)
@@ -7,16 +7,28 @@ using OpenCV and MediaPipe. For M3b, we add MediaPipe pose detection to sampled
 
 import cv2
 import mediapipe as mp
+import numpy as np
 import logging
 import sys
 import json
+import threading
 from pathlib import Path
-from typing import List, Tuple, Optional, Dict, Any
+from typing import List, Tuple, Optional, Dict, Any, Iterable, Iterator
 
 # Add the project root to Python path for imports
 sys.path.append(str(Path(__file__).parent.parent.parent.parent))
 
 from backend.src.utils.file_utils import OUTPUT_DIR
+from backend.src.utils.frame_access import iter_frames
+from backend.src.pipeline.pose_estimator_pool import PoseEstimatorPool
+from backend.src.pipeline.adaptive_sampler import AdaptiveFrameSampler
+from backend.src.pipeline.pose_track import FramePose, PoseTrack, LANDMARK_NAMES, VISIBILITY
+from backend.src.pipeline.staged_executor import StagedPipeline
+from backend.src.pipeline.roi_tracker import RoiTracker, Region, map_region_landmarks_to_frame
+from backend.src.pipeline.metrics import build_threshold_array, compute_climb_metrics, OnlineMetricsAccumulator
+from backend.src.utils.pose_store import get_pose_store_path, write_pose_store, load_pose_store
+from backend.src.utils.result_cache import RESULT_CACHE_ENABLED, get_cache_key, lookup_cached_result, store_cached_result, copy_artifact
+from backend.src.utils.video_metadata import get_video_metadata
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -25,6 +37,33 @@ logger = logging.getLogger(__name__)
 # Configuration
 SAMPLE_RATE = 1  # Process every frame for analysis and overlay
 MAX_FRAMES_TO_PROCESS = 6000  # Safety limit: supports 60s videos at 60 FPS (60*60 = 3600 frames)
+FUSED_OVERLAY_RENDERING = True  # Render the overlay from the detection decode instead of decoding the video twice (eager mode only)
+CLIENT_OVERLAY_MODE = False  # Skip overlay encoding; the browser draws the pose track from GET /api/results/{id}/track
+LAZY_OVERLAY_RENDERING = True  # Finish jobs once poses are extracted; render the overlay when it is first requested (False = eager, fused when possible)
+INFERENCE_LONG_EDGE = 960  # Downscale frames to this long edge before inference (None = full resolution)
+
+# Adaptive sampling configuration
+ADAPTIVE_SAMPLING_ENABLED = True  # Detect densely during moves, interpolate landmarks during rests
+ADAPTIVE_MOTION_THRESHOLD = 3.0  # Mean thumbnail difference (0-255) that forces detection
+ADAPTIVE_VELOCITY_THRESHOLD = 0.004  # Hip speed (normalized units per frame) that forces detection
+ADAPTIVE_MAX_SKIP_FRAMES = 3  # Never interpolate more than this many frames in a row
+
+# Region-of-interest configuration
+ROI_TRACKING_ENABLED = True  # Crop frames around the previous pose before inference
+ROI_MARGIN = 0.25  # Padding on each side, as a fraction of the landmark box's longer side
+ROI_MIN_VISIBILITY = 0.5  # Landmarks below this visibility are ignored for the crop box
+ROI_MAX_AREA_FRACTION = 0.6  # Search the full frame when the crop would cover more than this
+
+# Stage pipelining configuration
+PIPELINED_DETECTION = True  # Run decode, inference, rendering and encoding in concurrent threads
+PIPELINE_QUEUE_SIZE = 8  # Frames buffered between stages before the upstream stage blocks
+
+# Metrics configuration
+PARTIAL_METRICS_INTERVAL = 30  # Publish running metrics to the analysis record every N frames
+
+# Pose data storage configuration
+POSE_STORE_QUANTIZED = False  # Store landmarks as int16 instead of float32 (about half the file size)
+WRITE_POSE_JSON = False  # Also write pose_data JSON on every run (otherwise exported on demand)
 
 # Confidence thresholds for different landmarks (from testing strategy)
 CONFIDENCE_LEVELS = {
@@ -41,266 +80,716 @@ LANDMARK_THRESHOLDS = {
     "elbows": 0.3,       # Important for technique
     "knees": 0.3         # Important for technique
 }
+PER_LANDMARK_THRESHOLDS = build_threshold_array(LANDMARK_THRESHOLDS).tolist()  # LANDMARK_THRESHOLDS per landmark, in LANDMARK_NAMES order
+
+POSE_POOL_SIZE = 2  # Pre-warmed Pose estimators, i.e. analyses that can detect poses concurrently
+
+# Parallel detection configuration
+PARALLEL_DETECTION_WORKERS = 0  # Worker processes for segment-parallel detection (0 or 1 = sequential)
+SEGMENT_OVERLAP_FRAMES = 30  # Frames decoded before each segment so tracking warms up at the boundary
 
 # Initialize MediaPipe Pose
 mp_pose = mp.solutions.pose
 mp_drawing = mp.solutions.drawing_utils
-pose = mp_pose.Pose(
-    static_image_mode=False,
-    model_complexity=1,
-    enable_segmentation=False,
-    min_detection_confidence=0.5,
-    min_tracking_confidence=0.5
-)
 
 
-def read_video_frames(video_path: str) -> Tuple[List[cv2.Mat], dict]:
+def get_processing_settings() -> Dict[str, Any]:
+    """
+    Collect every setting that changes pose or overlay results.
+    
+    Used to fingerprint cached results: an upload is only served from the cache
+    when it was processed with the same settings.
+    
+    Returns:
+        JSON-serializable dictionary of settings
+    """
+    from backend.src.pipeline import overlay
+    
+    return {
+        "mediapipe": mp.__version__,
+        "sample_rate": SAMPLE_RATE,
+        "max_frames": MAX_FRAMES_TO_PROCESS,
+        "inference_long_edge": INFERENCE_LONG_EDGE,
+        "adaptive_sampling": [ADAPTIVE_SAMPLING_ENABLED, ADAPTIVE_MOTION_THRESHOLD, ADAPTIVE_VELOCITY_THRESHOLD, ADAPTIVE_MAX_SKIP_FRAMES],
+        "roi_tracking": [ROI_TRACKING_ENABLED, ROI_MARGIN, ROI_MIN_VISIBILITY, ROI_MAX_AREA_FRACTION],
+        "pose_store_quantized": POSE_STORE_QUANTIZED,
+        "client_overlay_mode": CLIENT_OVERLAY_MODE,
+        **overlay.get_render_settings()
+    }
+
+
+def create_pose_estimator() -> Any:
+    """
+    Create a MediaPipe Pose estimator configured for video tracking.
+    
+    Returns:
+        mp.solutions.pose.Pose instance
+    """
+    return mp_pose.Pose(
+        static_image_mode=False,
+        model_complexity=1,
+        enable_segmentation=False,
+        min_detection_confidence=0.5,
+        min_tracking_confidence=0.5
+    )
+
+
+# Shared pool of estimators, created on first use so importing this module stays cheap
+pose_estimator_pool: Optional[PoseEstimatorPool] = None
+pose_estimator_pool_lock = threading.Lock()
+
+# Per-process estimator used by segment-parallel detection workers
+worker_pose_estimator = None
+
+
+def get_pose_estimator_pool() -> PoseEstimatorPool:
+    """
+    Get the process-wide Pose estimator pool, creating it with POSE_POOL_SIZE on first use.
+    
+    Returns:
+        Shared PoseEstimatorPool
+    """
+    global pose_estimator_pool
+    with pose_estimator_pool_lock:
+        if pose_estimator_pool is None:
+            pose_estimator_pool = PoseEstimatorPool(POSE_POOL_SIZE, create_pose_estimator)
+        return pose_estimator_pool
+
+
+def configure_pose_estimator_pool(size: int) -> None:
+    """
+    Replace the shared Pose estimator pool with one of a new size.
+    
+    Call at startup, before analyses run; jobs holding an estimator from the
+    previous pool keep it until they finish.
+    
+    Args:
+        size: Number of estimators, i.e. analyses that can detect poses concurrently
+    """
+    global pose_estimator_pool, POSE_POOL_SIZE
+    with pose_estimator_pool_lock:
+        POSE_POOL_SIZE = size
+        pose_estimator_pool = PoseEstimatorPool(size, create_pose_estimator)
+
+
+def read_video_info(video_path: str, analysis_id: Optional[str] = None) -> dict:
     """
-    Read video file and extract sampled frames using OpenCV.
+    Read video metadata without decoding the video.
+    
+    The metadata is probed once per video and cached with the analysis record,
+    so repeated calls for the same analysis do not reopen the file.
     
     Args:
         video_path: Path to the video file
+        analysis_id: Analysis whose record caches the probed metadata
         
     Returns:
-        Tuple of (sampled_frames, video_info)
-        - sampled_frames: List of OpenCV Mat objects (every Nth frame)
-        - video_info: Dictionary with video metadata
+        Dictionary with video metadata
         
     Raises:
         ValueError: If video file cannot be opened
-        RuntimeError: If video processing fails
+    """
+    metadata = get_video_metadata(video_path, analysis_id)
+    
+    video_info = {
+        "fps": metadata.fps,
+        "total_frames": metadata.total_frames,
+        "width": metadata.width,
+        "height": metadata.height,
+        "duration": metadata.duration,
+        "sample_rate": SAMPLE_RATE
+    }
+    
+    logger.info(f"Video info: {metadata.total_frames} frames, {metadata.fps:.2f} FPS, {metadata.duration:.2f}s duration")
+    return video_info
+
+
+def iter_video_frames(video_path: str, start_frame: int = 0, end_frame: Optional[int] = None, limit_frames: bool = True) -> Iterator[Tuple[int, cv2.Mat]]:
+    """
+    Decode a video lazily, yielding one sampled frame at a time.
+    
+    Only the frame currently being yielded is held in memory, so callers that
+    consume frames as they arrive keep memory flat regardless of video length.
+    
+    Args:
+        video_path: Path to the video file
+        start_frame: Index of the first frame to decode (seeks frame-accurately when > 0)
+        end_frame: Index to stop before, or None to read until the end of the video
+        limit_frames: Stop after MAX_FRAMES_TO_PROCESS frames; chunked processing turns
+            this off because it never holds more than one chunk
+        
+    Yields:
+        Tuple of (frame_index, frame) where frame_index is the position in the video
+        
+    Raises:
+        ValueError: If video file cannot be opened
+        RuntimeError: If no frames could be decoded from the start of the video
     """
     logger.info(f"Reading video: {video_path}")
     
-    # Check if file exists
     if not Path(video_path).exists():
         raise ValueError(f"Video file not found: {video_path}")
     
-    # Open video capture
-    cap = cv2.VideoCapture(video_path)
-    if not cap.isOpened():
-        raise ValueError(f"Cannot open video file: {video_path}")
+    decoded_count = 0
+    processed_count = 0
     
+    # OpenCV's CAP_PROP_POS_FRAMES seek lands a few frames off on variable
+    # frame rate video, so segments start from the previous keyframe instead
+    frames = iter_frames(video_path, start_frame, end_frame)
     try:
-        # Get video properties
-        fps = cap.get(cv2.CAP_PROP_FPS)
-        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-        duration = total_frames / fps if fps > 0 else 0
-        
-        video_info = {
-            "fps": fps,
-            "total_frames": total_frames,
-            "width": width,
-            "height": height,
-            "duration": duration,
-            "sample_rate": SAMPLE_RATE
-        }
-        
-        logger.info(f"Video info: {total_frames} frames, {fps:.2f} FPS, {duration:.2f}s duration")
-        
-        # Extract sampled frames
-        sampled_frames = []
-        frame_count = 0
-        processed_count = 0
-        
-        while True:
-            ret, frame = cap.read()
-            if not ret:
-                break
-                
-            # Process every frame
-            if frame_count % SAMPLE_RATE == 0:
-                sampled_frames.append(frame.copy())
+        for frame_index, frame in frames:
+            decoded_count += 1
+            
+            if frame_index % SAMPLE_RATE == 0:
+                yield frame_index, frame
                 processed_count += 1
                 
                 # Safety check
-                if processed_count >= MAX_FRAMES_TO_PROCESS:
+                if limit_frames and processed_count >= MAX_FRAMES_TO_PROCESS:
                     logger.warning(f"Reached maximum frames limit ({MAX_FRAMES_TO_PROCESS})")
                     break
-                    
-            frame_count += 1
         
-        logger.info(f"Processed {processed_count} frames from {total_frames} total frames")
+        logger.info(f"Processed {processed_count} frames from {decoded_count} decoded frames")
         
-        if len(sampled_frames) == 0:
+        # A segment past the real end of the video may legitimately be empty
+        if processed_count == 0 and start_frame == 0:
             raise RuntimeError("No frames were extracted from video")
             
-        return sampled_frames, video_info
-        
     finally:
-        cap.release()
+        frames.close()
+
+
+def get_confidence_level(confidence: float) -> str:
+    """
+    Map a confidence score to its "high", "medium" or "low" label.
+    
+    Args:
+        confidence: Visibility or overall confidence score (0-1)
+        
+    Returns:
+        Confidence level label
+    """
+    if confidence >= CONFIDENCE_LEVELS["high"]:
+        return "high"
+    if confidence >= CONFIDENCE_LEVELS["medium"]:
+        return "medium"
+    return "low"
+
+
+def prepare_inference_frame(frame: cv2.Mat, long_edge: Optional[int] = None) -> cv2.Mat:
+    """
+    Resize a frame to the inference resolution and convert it to RGB for MediaPipe.
+    
+    The resize keeps the aspect ratio and covers the full field of view, so the
+    normalized landmark coordinates MediaPipe returns are already relative to the
+    original frame: back-projection to full resolution is the identity and
+    overlay/motion tracer code keeps working unchanged.
+    
+    Args:
+        frame: OpenCV Mat object (BGR format)
+        long_edge: Target long edge in pixels; defaults to INFERENCE_LONG_EDGE, 0 keeps full resolution
+        
+    Returns:
+        RGB frame whose long edge is at most the target size
+    """
+    if long_edge is None:
+        long_edge = INFERENCE_LONG_EDGE
+    
+    height, width = frame.shape[:2]
+    if long_edge and max(height, width) > long_edge:
+        scale = long_edge / max(height, width)
+        frame = cv2.resize(frame, (round(width * scale), round(height * scale)), interpolation=cv2.INTER_AREA)
+    
+    return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
 
 
-def detect_pose_in_frame(frame: cv2.Mat) -> Tuple[Dict[str, Any], Any]:
+def calculate_overall_confidence(landmarks: np.ndarray) -> float:
     """
-    Detect pose landmarks in a single frame using MediaPipe, returning both JSON and MediaPipe formats.
+    Calculate the mean visibility of the visible landmarks.
+    
+    Args:
+        landmarks: (33, 4) array of x, y, z, visibility
+        
+    Returns:
+        Overall confidence (0-1), or 0.0 if no landmark is visible
+    """
+    visibility = landmarks[:, VISIBILITY]
+    visible = visibility > 0
+    return float(visibility[visible].mean()) if visible.any() else 0.0
+
+
+def detect_pose_in_frame(frame: cv2.Mat, pose_estimator: Any, frame_index: int = 0, region: Optional[Region] = None) -> FramePose:
+    """
+    Detect pose landmarks in a single frame using MediaPipe.
     
     Args:
         frame: OpenCV Mat object (BGR format)
+        pose_estimator: MediaPipe Pose instance owned by the calling job
+        frame_index: Index of the frame in the video
+        region: Crop region (x0, y0, x1, y1) to run inference on, or None for the full frame;
+            landmarks are always returned in full-frame normalized coordinates
         
     Returns:
-        Tuple of (json_pose_data, mediapipe_results)
+        FramePose with a (33, 4) landmark array, or without landmarks if no pose was found
     """
-    # Convert BGR to RGB for MediaPipe
-    rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    # Crop first so the resize and color conversion only touch the region
+    inference_frame = frame if region is None else frame[region[1]:region[3], region[0]:region[2]]
+    
+    # Downscale once, then convert BGR to RGB for MediaPipe
+    rgb_frame = prepare_inference_frame(inference_frame)
     
     # Process frame with MediaPipe
-    results = pose.process(rgb_frame)
+    results = pose_estimator.process(rgb_frame)
+    
+    if not results.pose_landmarks:
+        return FramePose(frame_index)
+    
+    landmarks = np.array(
+        [(landmark.x, landmark.y, landmark.z, landmark.visibility) for landmark in results.pose_landmarks.landmark],
+        dtype=np.float32
+    )
+    if region is not None:
+        landmarks = map_region_landmarks_to_frame(landmarks, region, frame.shape)
+    return FramePose(frame_index, landmarks, calculate_overall_confidence(landmarks))
+
+
+def detect_pose_with_roi(frame: cv2.Mat, pose_estimator: Any, frame_index: int, roi_tracker: Optional[RoiTracker]) -> FramePose:
+    """
+    Detect the pose inside the tracked region, falling back to the full frame.
+    
+    When the crop loses the climber the same frame is searched again at full size.
+    The estimator is reset whenever the region moves, because MediaPipe tracks in the
+    coordinates of the image it was given and those change with the crop.
+    
+    Args:
+        frame: OpenCV Mat object (BGR format)
+        pose_estimator: MediaPipe Pose instance owned by the calling job
+        frame_index: Index of the frame in the video
+        roi_tracker: ROI tracker for this job, or None to always use the full frame
+        
+    Returns:
+        FramePose in full-frame normalized coordinates
+    """
+    if roi_tracker is None:
+        return detect_pose_in_frame(frame, pose_estimator, frame_index)
+    
+    region = roi_tracker.region
+    frame_pose = detect_pose_in_frame(frame, pose_estimator, frame_index, region)
+    
+    if region is not None and not frame_pose.pose_detected:
+        # Tracking lost inside the crop: search the full frame
+        roi_tracker.tracking_lost += 1
+        pose_estimator.reset()
+        region = None
+        frame_pose = detect_pose_in_frame(frame, pose_estimator, frame_index)
+    
+    roi_tracker.record_frame(region)
+    if roi_tracker.update(frame_pose.landmarks, frame.shape):
+        pose_estimator.reset()
+    
+    return frame_pose
+
+
+def process_frames_with_pose(indexed_frames: Iterable[Tuple[int, cv2.Mat]], pose_estimator: Any = None) -> Iterator[Tuple[cv2.Mat, FramePose]]:
+    """
+    Run MediaPipe pose detection over a stream of frames, yielding results as they are produced.
+    
+    Frames are pulled from `indexed_frames` one at a time and released once the caller
+    moves on, so a decode -> detect pipeline never holds more than the current frame.
+    
+    Args:
+        indexed_frames: Iterable of (frame_index, frame) tuples, e.g. from iter_video_frames()
+        pose_estimator: MediaPipe Pose instance to use; when None, one is checked out of
+            the shared pool for the lifetime of the generator
+        
+    Yields:
+        Tuple of (frame, frame_pose) for each frame
+    """
+    if pose_estimator is None:
+        with get_pose_estimator_pool().checkout() as pooled_estimator:
+            yield from process_frames_with_pose(indexed_frames, pooled_estimator)
+        return
+    
+    logger.info("Starting streaming MediaPipe pose detection")
+    
+    sampler = None
+    if ADAPTIVE_SAMPLING_ENABLED:
+        sampler = AdaptiveFrameSampler(ADAPTIVE_MOTION_THRESHOLD, ADAPTIVE_VELOCITY_THRESHOLD, ADAPTIVE_MAX_SKIP_FRAMES)
+    
+    roi_tracker = None
+    if ROI_TRACKING_ENABLED:
+        roi_tracker = RoiTracker(ROI_MARGIN, ROI_MIN_VISIBILITY, ROI_MAX_AREA_FRACTION)
+    
+    frames_processed = 0
+    frames_interpolated = 0
+    skipped_frames = []  # (frame_index, frame) awaiting the next detection, at most ADAPTIVE_MAX_SKIP_FRAMES
+    last_detection = None
+    
+    for frame_index, frame in indexed_frames:
+        if sampler is not None and not sampler.should_detect(frame):
+            skipped_frames.append((frame_index, frame))
+            continue
+        
+        try:
+            frame_pose = detect_pose_with_roi(frame, pose_estimator, frame_index, roi_tracker)
+                
+        except Exception as e:
+            logger.warning(f"Error processing frame {frame_index}: {str(e)}")
+            # Add error frame data
+            frame_pose = FramePose(frame_index, error=str(e))
+        
+        # Fill frames skipped since the last detection, in order, before this one
+        for skipped_index, skipped_frame in skipped_frames:
+            yield skipped_frame, interpolate_frame_pose(last_detection, frame_pose, skipped_index)
+            frames_interpolated += 1
+        frames_processed += len(skipped_frames)
+        skipped_frames = []
+        
+        if sampler is not None:
+            sampler.record_detection(frame_pose)
+        last_detection = frame_pose
+        
+        yield frame, frame_pose
+        frames_processed += 1
+        
+        if frames_processed % 50 == 0:  # Log progress every 50 frames
+            logger.info(f"Processed frame {frame_index} ({frames_processed} frames so far)")
+    
+    # Frames skipped at the very end hold the last detected pose
+    for skipped_index, skipped_frame in skipped_frames:
+        yield skipped_frame, interpolate_frame_pose(last_detection, None, skipped_index)
+        frames_interpolated += 1
+    frames_processed += len(skipped_frames)
+    
+    logger.info(f"Completed pose detection on {frames_processed} frames ({frames_interpolated} interpolated)")
+    if roi_tracker is not None:
+        logger.info(f"ROI tracking: {roi_tracker.cropped_frames} cropped, {roi_tracker.full_frames} full-frame, {roi_tracker.tracking_lost} times lost")
+
+
+def interpolate_frame_pose(start_pose: FramePose, end_pose: Optional[FramePose], frame_index: int) -> FramePose:
+    """
+    Build the pose for a skipped frame from the detections around it.
+    
+    Landmarks are linearly interpolated when both neighbouring detections found a
+    pose; otherwise the earlier detection is held. The result is flagged as
+    interpolated so consumers can tell it apart from a real detection.
+    
+    Args:
+        start_pose: Pose of the last detected frame before frame_index
+        end_pose: Pose of the next detected frame, or None at the end of the video
+        frame_index: Index of the skipped frame
+        
+    Returns:
+        FramePose for the skipped frame
+    """
+    if not (end_pose and end_pose.pose_detected and start_pose.pose_detected):
+        return FramePose(frame_index, start_pose.landmarks, start_pose.overall_confidence, interpolated=True)
+    
+    # Weight of the end pose at this frame
+    t = (frame_index - start_pose.frame_index) / (end_pose.frame_index - start_pose.frame_index)
+    
+    landmarks = start_pose.landmarks + (end_pose.landmarks - start_pose.landmarks) * np.float32(t)
+    overall_confidence = start_pose.overall_confidence + (end_pose.overall_confidence - start_pose.overall_confidence) * t
+    
+    return FramePose(frame_index, landmarks, overall_confidence, interpolated=True)
+
+
+def plan_detection_segments(total_frames: int, segment_count: int, overlap_frames: int = SEGMENT_OVERLAP_FRAMES) -> List[Tuple[int, int, Optional[int]]]:
+    """
+    Split a video into contiguous detection segments with a warm-up overlap.
+    
+    Args:
+        total_frames: Number of frames to cover
+        segment_count: Number of segments to create
+        overlap_frames: Frames decoded before each segment start to warm up tracking
+        
+    Returns:
+        List of (warmup_start, start, end) tuples; the last segment's end is None
+        so it reads to the real end of the video even if the frame count is off
+    """
+    # Containers that report no frame count still get one segment reading the whole video
+    if total_frames <= 0:
+        return [(0, 0, None)]
+    
+    segment_count = max(1, min(segment_count, total_frames))
+    segment_length = -(-total_frames // segment_count)  # Ceiling division
+    
+    segments = []
+    for start in range(0, total_frames, segment_length):
+        end = start + segment_length if start + segment_length < total_frames else None
+        segments.append((max(0, start - overlap_frames), start, end))
     
+    return segments
+
+
+def init_detection_worker() -> None:
+    """Create the per-process Pose estimator for a segment-parallel detection worker."""
+    global worker_pose_estimator
+    worker_pose_estimator = create_pose_estimator()
+
+
+def detect_segment_poses(video_path: str, warmup_start: int, start: int, end: Optional[int]) -> Tuple[List[FramePose], List[Tuple[Tuple[int, ...], str]]]:
+    """
+    Detect poses for one video segment inside a worker process.
+    
+    Tracking is reset, then warmed up on the overlap frames before `start`;
+    results for the warm-up frames are discarded.
+    
+    Args:
+        video_path: Path to the video file
+        warmup_start: First frame to decode (warm-up only)
+        start: First frame whose results are kept
+        end: Frame index to stop before, or None for the end of the video
+        
+    Returns:
+        Tuple of (frame_poses, frame_shapes) for frames in [start, end)
+    """
+    if worker_pose_estimator is None:
+        init_detection_worker()
+    estimator = worker_pose_estimator
+    estimator.reset()
+    
+    frame_poses = []
+    frame_shapes = []
+    
+    if end is None:
+        end = MAX_FRAMES_TO_PROCESS * SAMPLE_RATE
+    
+    for frame, frame_pose in process_frames_with_pose(iter_video_frames(video_path, warmup_start, end), estimator):
+        if frame_pose.frame_index < start:
+            continue
+        frame_poses.append(frame_pose)
+        frame_shapes.append((frame.shape, str(frame.dtype)))
+    
+    return frame_poses, frame_shapes
+
+
+def detect_poses_parallel(video_path: str, video_info: dict, workers: int) -> Tuple[PoseTrack, List[Tuple[Tuple[int, ...], str]]]:
+    """
+    Detect poses by splitting the video into time segments across a process pool.
+    
+    Each worker owns one MediaPipe Pose instance. Segments overlap by
+    SEGMENT_OVERLAP_FRAMES so tracking has warmed up by each segment start, and
+    merged results keep the same frame_index layout as sequential detection.
+    
+    Args:
+        video_path: Path to the video file
+        video_info: Video metadata from read_video_info()
+        workers: Number of worker processes
+        
+    Returns:
+        Tuple of (pose_track, frame_shapes) with frame shapes ordered by frame index
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    import multiprocessing
+    
+    total_frames = min(video_info["total_frames"], MAX_FRAMES_TO_PROCESS * SAMPLE_RATE)
+    segments = plan_detection_segments(total_frames, workers)
+    
+    logger.info(f"Detecting poses in {len(segments)} segments across {workers} worker processes")
+    
+    # Spawn so workers never inherit a forked copy of the parent's MediaPipe graph
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=init_detection_worker) as executor:
+        futures = [
+            executor.submit(detect_segment_poses, video_path, warmup_start, start, end)
+            for warmup_start, start, end in segments
+        ]
+        segment_results = [future.result() for future in futures]
+    
+    pose_track = PoseTrack(capacity=total_frames)
+    frame_shapes = []
+    for segment_poses, segment_shapes in segment_results:
+        for frame_pose in segment_poses:
+            pose_track.add_frame(frame_pose)
+        frame_shapes.extend(segment_shapes)
+    
+    if not frame_shapes:
+        raise RuntimeError("No frames were extracted from video")
+    
+    logger.info(f"Completed parallel pose detection on {len(frame_shapes)} frames")
+    return pose_track.trim(), frame_shapes
+
+
+def build_frame_pose_data(pose_track: PoseTrack, frame_index: int) -> Dict[str, Any]:
+    """
+    Convert one frame of a pose track to the per-frame dictionary used in JSON output.
+    
+    Args:
+        pose_track: Pose track holding the frame
+        frame_index: Frame index to convert
+        
+    Returns:
+        Pose data dictionary with landmarks, confidence levels and quality flags
+    """
+    error = pose_track.errors.get(frame_index)
+    if error:
+        return {
+            "frame_index": frame_index,
+            "pose_detected": False,
+            "overall_confidence": 0.0,
+            "confidence_level": "low",
+            "landmarks": [],
+            "quality_flags": {},
+            "interpolated": False,
+            "error": error
+        }
+    
+    overall_confidence = float(pose_track.overall_confidence[frame_index])
     pose_data = {
+        "frame_index": frame_index,
         "pose_detected": False,
-        "overall_confidence": 0.0,
-        "confidence_level": "low",
+        "overall_confidence": overall_confidence,
+        "confidence_level": get_confidence_level(overall_confidence),
         "landmarks": [],
         "quality_flags": {
             "hands_occluded": False,
             "feet_hidden": False,
             "dynamic_movement": False,
             "lighting_poor": False
-        }
+        },
+        "interpolated": bool(pose_track.interpolated[frame_index])
     }
     
-    if results.pose_landmarks:
-        pose_data["pose_detected"] = True
-        
-        # Extract landmark data
-        landmarks = []
-        total_confidence = 0.0
-        visible_landmarks = 0
-        
-        for idx, landmark in enumerate(results.pose_landmarks.landmark):
-            landmark_name = mp_pose.PoseLandmark(idx).name.lower()
-            
-            # Get confidence level based on landmark type
-            confidence_threshold = LANDMARK_THRESHOLDS.get(landmark_name.split('_')[0], 0.3)
-            confidence_level = "high" if landmark.visibility >= CONFIDENCE_LEVELS["high"] else \
-                             "medium" if landmark.visibility >= CONFIDENCE_LEVELS["medium"] else "low"
-            
-            landmark_data = {
-                "name": landmark_name,
-                "x": landmark.x,
-                "y": landmark.y,
-                "z": landmark.z,
-                "visibility": landmark.visibility,
-                "confidence": confidence_level,
-                "threshold": confidence_threshold
-            }
-            
-            landmarks.append(landmark_data)
-            
-            # Track overall confidence
-            if landmark.visibility > 0:
-                total_confidence += landmark.visibility
-                visible_landmarks += 1
-        
-        # Calculate overall confidence
-        if visible_landmarks > 0:
-            pose_data["overall_confidence"] = total_confidence / visible_landmarks
-            pose_data["confidence_level"] = "high" if pose_data["overall_confidence"] >= CONFIDENCE_LEVELS["high"] else \
-                                          "medium" if pose_data["overall_confidence"] >= CONFIDENCE_LEVELS["medium"] else "low"
-        
-        pose_data["landmarks"] = landmarks
+    landmarks_array = pose_track.get_landmarks(frame_index)
+    if landmarks_array is None:
+        return pose_data
+    
+    pose_data["pose_detected"] = True
+    
+    landmarks = []
+    for landmark_name, (x, y, z, visibility), threshold in zip(LANDMARK_NAMES, landmarks_array.tolist(), PER_LANDMARK_THRESHOLDS):
+        landmarks.append({
+            "name": landmark_name,
+            "x": x,
+            "y": y,
+            "z": z,
+            "visibility": visibility,
+            "confidence": get_confidence_level(visibility),
+            # Confidence threshold of the landmark's group (shoulders, hips, ...)
+            "threshold": threshold
+        })
+    pose_data["landmarks"] = landmarks
+    
+    # Set quality flags based on landmark visibility
+    hand_landmarks = [lm for lm in landmarks if "hand" in lm["name"]]
+    foot_landmarks = [lm for lm in landmarks if "foot" in lm["name"] or "ankle" in lm["name"]]
+    
+    pose_data["quality_flags"]["hands_occluded"] = any(lm["confidence"] == "low" for lm in hand_landmarks)
+    pose_data["quality_flags"]["feet_hidden"] = any(lm["confidence"] == "low" for lm in foot_landmarks)
+    
+    return pose_data
+
+
+def pose_track_to_frame_dicts(pose_track: PoseTrack) -> List[Dict[str, Any]]:
+    """
+    Convert a pose track to the list of per-frame dictionaries used in JSON output.
+    
+    Args:
+        pose_track: Pose track to convert
         
-        # Set quality flags based on landmark visibility
-        hand_landmarks = [lm for lm in landmarks if "hand" in lm["name"]]
-        foot_landmarks = [lm for lm in landmarks if "foot" in lm["name"] or "ankle" in lm["name"]]
+    Returns:
+        List of pose data dictionaries for every stored frame, ordered by frame index
+    """
+    return [
+        build_frame_pose_data(pose_track, frame_index)
+        for frame_index in np.flatnonzero(pose_track.frame_present[:len(pose_track)]).tolist()
+    ]
+
+
+def summarize_pose_track(pose_track: PoseTrack) -> Dict[str, Any]:
+    """
+    Calculate processing statistics for a pose track.
+    
+    Args:
+        pose_track: Pose track to summarize
         
-        pose_data["quality_flags"]["hands_occluded"] = any(lm["confidence"] == "low" for lm in hand_landmarks)
-        pose_data["quality_flags"]["feet_hidden"] = any(lm["confidence"] == "low" for lm in foot_landmarks)
+    Returns:
+        Dictionary with frame counts, average confidence and confidence level counts
+    """
+    present = pose_track.frame_present[:len(pose_track)]
+    confidence = pose_track.overall_confidence[:len(pose_track)][present]
+    is_high = confidence >= CONFIDENCE_LEVELS["high"]
+    is_medium = ~is_high & (confidence >= CONFIDENCE_LEVELS["medium"])
     
-    return pose_data, results
+    return {
+        "total_frames": int(present.sum()),
+        "poses_detected": pose_track.poses_detected,
+        "frames_interpolated": int(pose_track.interpolated[:len(pose_track)][present].sum()),
+        "avg_confidence": float(confidence.mean()) if len(confidence) else 0,
+        "confidence_levels": {
+            "high": int(is_high.sum()),
+            "medium": int(is_medium.sum()),
+            "low": int((~is_high & ~is_medium).sum())
+        }
+    }
 
 
-def process_frames_with_pose(frames: List[cv2.Mat]) -> Tuple[List[Dict[str, Any]], List[Any]]:
+def save_pose_data(pose_track: PoseTrack, video_info: dict, analysis_id: str) -> str:
     """
-    Process all sampled frames with MediaPipe pose detection.
+    Save pose detection results to a binary pose store file.
+    
+    The JSON representation is only written when WRITE_POSE_JSON is set; otherwise
+    it is produced on demand by export_pose_data_json().
     
     Args:
-        frames: List of OpenCV Mat objects
+        pose_track: Pose detection results
+        video_info: Video metadata
+        analysis_id: Unique analysis identifier
         
     Returns:
-        Tuple of (pose_results_json, mediapipe_results) for each frame
+        Path to the saved pose store file
     """
-    logger.info(f"Processing {len(frames)} frames with MediaPipe pose detection")
-    
-    pose_results = []
-    mediapipe_results = []
+    metadata = {
+        "analysis_id": analysis_id,
+        "video_info": video_info,
+        "processing_info": summarize_pose_track(pose_track)
+    }
+    pose_file = write_pose_store(pose_track, get_pose_store_path(analysis_id), metadata, quantized=POSE_STORE_QUANTIZED)
     
-    for i, frame in enumerate(frames):
-        try:
-            # Get both JSON format and original MediaPipe format
-            pose_data, mediapipe_data = detect_pose_in_frame(frame)
-            pose_data["frame_index"] = i
-            pose_results.append(pose_data)
-            mediapipe_results.append(mediapipe_data)
-            
-            if i % 50 == 0:  # Log progress every 50 frames
-                logger.info(f"Processed frame {i}/{len(frames)}")
-                
-        except Exception as e:
-            logger.warning(f"Error processing frame {i}: {str(e)}")
-            # Add error frame data
-            pose_results.append({
-                "frame_index": i,
-                "pose_detected": False,
-                "overall_confidence": 0.0,
-                "confidence_level": "low",
-                "landmarks": [],
-                "quality_flags": {},
-                "error": str(e)
-            })
-            mediapipe_results.append(None)
+    if WRITE_POSE_JSON:
+        export_pose_data_json(analysis_id)
     
-    logger.info(f"Completed pose detection on {len(frames)} frames")
-    return pose_results, mediapipe_results
+    return pose_file
 
 
-def save_pose_data(pose_results: List[Dict[str, Any]], video_info: dict, analysis_id: str) -> str:
+def export_pose_data_json(analysis_id: str) -> str:
     """
-    Save pose detection results to JSON file.
+    Convert a saved pose store to the pose_data JSON format.
     
     Args:
-        pose_results: List of pose detection results
-        video_info: Video metadata
         analysis_id: Unique analysis identifier
         
     Returns:
         Path to the saved JSON file
+        
+    Raises:
+        FileNotFoundError: If no pose store exists for the analysis
     """
+    pose_track, metadata = load_pose_store(get_pose_store_path(analysis_id))
     pose_file = OUTPUT_DIR / f"pose_data_{analysis_id}.json"
     
     # Prepare data for JSON serialization
     output_data = {
         "analysis_id": analysis_id,
-        "video_info": video_info,
-        "processing_info": {
-            "total_frames": len(pose_results),
-            "poses_detected": sum(1 for result in pose_results if result.get("pose_detected", False)),
-            "avg_confidence": sum(result.get("overall_confidence", 0) for result in pose_results) / len(pose_results) if pose_results else 0,
-            "confidence_levels": {
-                "high": sum(1 for result in pose_results if result.get("confidence_level") == "high"),
-                "medium": sum(1 for result in pose_results if result.get("confidence_level") == "medium"),
-                "low": sum(1 for result in pose_results if result.get("confidence_level") == "low")
-            }
-        },
-        "frames": pose_results
+        "video_info": metadata.get("video_info", {}),
+        "processing_info": metadata.get("processing_info") or summarize_pose_track(pose_track),
+        "frames": pose_track_to_frame_dicts(pose_track)
     }
     
     with open(pose_file, 'w') as f:
         json.dump(output_data, f, indent=2)
     
-    logger.info(f"Pose data saved to: {pose_file}")
+    logger.info(f"Pose data exported to: {pose_file}")
     return str(pose_file)
 
 
-def save_frame_info(frames: List[cv2.Mat], video_info: dict, analysis_id: str) -> str:
+def save_frame_info(frame_shapes: List[Tuple[Tuple[int, ...], str]], video_info: dict, analysis_id: str) -> str:
     """
     Save basic frame information to a text file for debugging.
     
     Args:
-        frames: List of sampled frames
+        frame_shapes: List of (shape, dtype) tuples recorded while frames were streamed
         video_info: Video metadata
         analysis_id: Unique analysis identifier
         
@@ -312,57 +801,182 @@ def save_frame_info(frames: List[cv2.Mat], video_info: dict, analysis_id: str) -
     with open(info_file, 'w') as f:
         f.write(f"Analysis ID: {analysis_id}\n")
         f.write(f"Video Info: {video_info}\n")
-        f.write(f"Frames extracted: {len(frames)}\n")
+        f.write(f"Frames extracted: {len(frame_shapes)}\n")
         f.write(f"Sample rate: {SAMPLE_RATE}\n")
         
-        for i, frame in enumerate(frames):
-            f.write(f"Frame {i}: Shape {frame.shape}, Type {frame.dtype}\n")
+        for i, (shape, dtype) in enumerate(frame_shapes):
+            f.write(f"Frame {i}: Shape {shape}, Type {dtype}\n")
     
     logger.info(f"Frame info saved to: {info_file}")
     return str(info_file)
 
 
-def process_video_background_task(video_path: str, analysis_id: str) -> None:
+def run_detection_pass(video_path: str, analysis_id: str, video_info: dict, render_overlay: bool = False, metrics_accumulator: Optional[OnlineMetricsAccumulator] = None) -> Tuple[PoseTrack, List[Tuple[Tuple[int, ...], str]], Optional[str]]:
+    """
+    Decode the video once, detect poses and optionally render the overlay from the same frames.
+    
+    When render_overlay is set, each decoded frame goes through detection and then
+    straight into the overlay renderer and writer, so the video is decoded a single
+    time per analysis. Overlay failures are logged and never abort pose detection.
+    
+    With PIPELINED_DETECTION the decode, infer, render and encode stages run in their
+    own threads connected by bounded queues, and per-stage throughput is logged.
+    
+    Args:
+        video_path: Path to the uploaded video file
+        analysis_id: Unique identifier for this analysis
+        video_info: Video metadata from read_video_info()
+        render_overlay: Whether to render the overlay video in the same pass
+        metrics_accumulator: Updated with every frame; its running metrics are published
+            to the analysis record every PARTIAL_METRICS_INTERVAL frames
+        
+    Returns:
+        Tuple of (pose_track, frame_shapes, overlay_file)
+        - overlay_file is None when not rendered or rendering failed
+    """
+    overlay_writer = None
+    overlay_renderer = None
+    overlay_file = None
+    
+    if render_overlay:
+        try:
+            from backend.src.pipeline.overlay import setup_video_writer, OverlayFrameRenderer
+            overlay_writer, video_properties = setup_video_writer(analysis_id, video_path)
+            overlay_renderer = OverlayFrameRenderer(video_info["fps"], video_properties["frame_rotation"])
+            overlay_file = video_properties["output_path"]
+        except Exception as overlay_error:
+            logger.warning(f"Fused overlay setup failed, continuing without overlay: {str(overlay_error)}")
+    
+    def render_stage(results: Iterator[Tuple[cv2.Mat, FramePose]]) -> Iterator[Tuple[Tuple[Tuple[int, ...], str], FramePose, Optional[cv2.Mat]]]:
+        # Rendered frame is None once overlay rendering has been disabled
+        nonlocal overlay_renderer
+        for frame, frame_pose in results:
+            frame_shape = (frame.shape, str(frame.dtype))
+            rendered_frame = None
+            if overlay_renderer is not None:
+                try:
+                    rendered_frame = overlay_renderer.render(frame, frame_pose.frame_index, frame_pose.landmarks)
+                except Exception as overlay_error:
+                    logger.warning(f"Fused overlay rendering failed, continuing without overlay: {str(overlay_error)}")
+                    overlay_renderer = None
+            yield frame_shape, frame_pose, rendered_frame
+    
+    def encode_stage(rendered: Iterator[Tuple[Tuple[Tuple[int, ...], str], FramePose, Optional[cv2.Mat]]]) -> Iterator[Tuple[Tuple[Tuple[int, ...], str], FramePose]]:
+        nonlocal overlay_writer, overlay_file
+        for frame_shape, frame_pose, rendered_frame in rendered:
+            if overlay_writer is not None:
+                try:
+                    if rendered_frame is None:
+                        raise RuntimeError("overlay rendering was disabled")
+                    overlay_writer.write(rendered_frame)
+                except Exception as overlay_error:
+                    logger.warning(f"Fused overlay encoding stopped, continuing without overlay: {str(overlay_error)}")
+                    try:
+                        overlay_writer.release()
+                    except Exception:
+                        pass  # The encoder already failed; its output is discarded
+                    overlay_writer = None
+                    overlay_file = None
+            yield frame_shape, frame_pose
+    
+    stages = [("infer", process_frames_with_pose)]
+    if overlay_writer is not None:
+        stages += [("render", render_stage), ("encode", encode_stage)]
+    else:
+        stages.append(("shapes", lambda results: (((frame.shape, str(frame.dtype)), frame_pose) for frame, frame_pose in results)))
+    
+    pipeline = StagedPipeline(iter_video_frames(video_path), stages, queue_size=PIPELINE_QUEUE_SIZE, threaded=PIPELINED_DETECTION)
+    
+    pose_track = PoseTrack(capacity=min(video_info["total_frames"], MAX_FRAMES_TO_PROCESS * SAMPLE_RATE))
+    frame_shapes = []
+    
+    # Import here to avoid circular imports
+    from backend.src.utils.analysis_storage import update_analysis_metrics
+    
+    try:
+        for frame_shape, frame_pose in pipeline:
+            frame_shapes.append(frame_shape)
+            pose_track.add_frame(frame_pose)
+            
+            if metrics_accumulator is not None:
+                metrics_accumulator.update(frame_pose)
+                if metrics_accumulator.frames_seen % PARTIAL_METRICS_INTERVAL == 0:
+                    update_analysis_metrics(analysis_id, metrics_accumulator.snapshot())
+    finally:
+        if overlay_writer is not None:
+            try:
+                overlay_writer.release()
+            except Exception as overlay_error:
+                logger.warning(f"Fused overlay encoding failed, continuing without overlay: {str(overlay_error)}")
+                overlay_file = None
+    
+    if overlay_file:
+        logger.info(f"Overlay video generated in fused pass: {overlay_file}")
+        if overlay_renderer is not None:
+            overlay_renderer.stats.log_summary()
+    
+    return pose_track.trim(), frame_shapes, overlay_file
+
+
+def process_video_background_task(video_path: str, analysis_id: str, content_hash: Optional[str] = None) -> None:
     """
     Background task function for M3c - processes video with pose detection.
     
     This function is designed to be run as a FastAPI background task.
-    It processes the video and updates the analysis status.
+    It processes the video and updates the analysis status. When the upload's
+    content hash matches a cached analysis with the same settings, the cached
+    pose data and overlay are reused instead.
     
     Args:
         video_path: Path to the uploaded video file
         analysis_id: Unique identifier for this analysis
+        content_hash: SHA-256 hex digest of the upload, enables the result cache
     """
     logger.info(f"Starting background pose processing for analysis {analysis_id}")
     
     try:
         # Import here to avoid circular imports
-        from backend.src.utils.analysis_storage import update_analysis_status, update_analysis_results
+        from backend.src.utils.analysis_storage import update_analysis_status, update_analysis_results, set_analysis_cache_key
         
         # Update status to processing
         update_analysis_status(analysis_id, "processing")
         
-        # Process video with pose detection
-        results = process_video_with_pose(video_path, analysis_id)
+        cache_key = None
+        if content_hash and RESULT_CACHE_ENABLED:
+            cache_key = get_cache_key(content_hash, get_processing_settings())
+            # Lets an overlay rendered later on request join the cache entry
+            set_analysis_cache_key(analysis_id, cache_key)
         
-        # Extract pose data and processing info for storage
-        pose_data = None
-        processing_info = None
+        # Reuse results from an identical upload, otherwise process the video
+        results = restore_cached_results(cache_key, video_path, analysis_id) if cache_key else None
+        from_cache = results is not None
+        if not from_cache:
+            results = process_video_with_pose(video_path, analysis_id)
         
-        # Load pose data from JSON file if it exists
-        pose_file = results.get("pose_file")
-        if pose_file and Path(pose_file).exists():
-            import json
-            with open(pose_file, 'r') as f:
-                pose_data = json.load(f)
-                processing_info = pose_data.get("processing_info", {})
+        # Keep the in-memory pose track; no need to re-read the pose data just written
+        pose_track = results["pose_track"]
+        processing_info = dict(results["processing_info"])
+        
+        # Metrics accumulated during detection or cached with the results; parallel
+        # results and older cache entries are computed in one pass
+        metrics = results.get("metrics")
+        if metrics is None:
+            video_info = results["video_info"]
+            metrics = compute_climb_metrics(pose_track, video_info["fps"], video_info["width"], video_info["height"], LANDMARK_THRESHOLDS)
+        
+        if cache_key and not from_cache:
+            store_cached_result(cache_key, results["pose_file"], results.get("overlay_file"), {
+                "video_info": results["video_info"],
+                "processing_info": results["processing_info"],
+                "metrics": metrics
+            })
         
         # Add overlay file info to processing_info
         if results.get("overlay_file"):
             processing_info["overlay_file"] = results["overlay_file"]
         
         # Update analysis with results
-        update_analysis_results(analysis_id, pose_data, processing_info)
+        update_analysis_results(analysis_id, pose_track, processing_info, metrics)
         
         logger.info(f"Background pose processing completed for analysis {analysis_id}")
         
@@ -376,6 +990,62 @@ def process_video_background_task(video_path: str, analysis_id: str) -> None:
             logger.error(f"Failed to update error status for {analysis_id}: {str(update_error)}")
 
 
+def restore_cached_results(cache_key: str, video_path: str, analysis_id: str) -> Optional[dict]:
+    """
+    Restore cached pose data and overlay video for a new analysis.
+    
+    Artifacts are copied to this analysis's own output paths so later re-renders
+    and exports work exactly as for a freshly processed video.
+    
+    Args:
+        cache_key: Result cache key for the upload and current settings
+        video_path: Path to the uploaded video file
+        analysis_id: Unique identifier for this analysis
+        
+    Returns:
+        Results dictionary shaped like process_video_with_pose() output, or None on a
+        cache miss or if restoring failed
+    """
+    entry = lookup_cached_result(cache_key)
+    if entry is None:
+        return None
+    
+    try:
+        from backend.src.pipeline.overlay import get_overlay_output_path
+        
+        pose_file = get_pose_store_path(analysis_id)
+        copy_artifact(entry["pose_file"], pose_file)
+        pose_track, _ = load_pose_store(pose_file)
+        
+        overlay_file = None
+        if entry["overlay_file"] is not None:
+            overlay_file = get_overlay_output_path(analysis_id, video_path)
+            copy_artifact(entry["overlay_file"], Path(overlay_file))
+        
+    except Exception as e:
+        logger.warning(f"Failed to restore cached results for analysis {analysis_id}, reprocessing: {str(e)}")
+        return None
+    
+    processing_info = dict(entry["metadata"]["processing_info"])
+    processing_info["from_cache"] = True
+    logger.info(f"Reused cached results for analysis {analysis_id} ({cache_key})")
+    
+    return {
+        "analysis_id": analysis_id,
+        "status": "success",
+        "video_info": entry["metadata"]["video_info"],
+        "frames_extracted": processing_info["total_frames"],
+        "poses_detected": processing_info["poses_detected"],
+        "avg_confidence": processing_info["avg_confidence"],
+        "processing_info": processing_info,
+        "pose_track": pose_track,
+        "pose_file": str(pose_file),
+        "overlay_file": overlay_file,
+        "metrics": entry["metadata"].get("metrics"),
+        "message": f"Reused cached results for {processing_info['total_frames']} frames"
+    }
+
+
 def process_video_with_pose(video_path: str, analysis_id: str) -> dict:
     """
     Enhanced video processing function for M3b/M4.
@@ -388,7 +1058,7 @@ def process_video_with_pose(video_path: str, analysis_id: str) -> dict:
         analysis_id: Unique identifier for this analysis
         
     Returns:
-        Dictionary with processing results including pose data
+        Dictionary with processing results including the pose track
         
     Raises:
         ValueError: If video file is invalid
@@ -397,48 +1067,81 @@ def process_video_with_pose(video_path: str, analysis_id: str) -> dict:
     logger.info(f"Starting video processing with pose detection for analysis {analysis_id}")
     
     try:
-        # Read video and extract frames
-        frames, video_info = read_video_frames(video_path)
+        video_info = read_video_info(video_path, analysis_id)
         
-        # Process frames with MediaPipe pose detection
-        pose_results, mediapipe_results = process_frames_with_pose(frames)
+        # Import here to avoid circular imports
+        from backend.src.pipeline.chunked_detection import should_use_chunked_processing, run_chunked_detection
         
-        # Save pose data to JSON
-        pose_file = save_pose_data(pose_results, video_info, analysis_id)
+        chunked_detection = should_use_chunked_processing(video_info)
+        parallel_detection = PARALLEL_DETECTION_WORKERS > 1 and not chunked_detection
+        render_overlay_eagerly = not CLIENT_OVERLAY_MODE and not LAZY_OVERLAY_RENDERING
+        render_overlay_inline = FUSED_OVERLAY_RENDERING and render_overlay_eagerly and not parallel_detection and not chunked_detection
         
-        # Note: MediaPipe data will be converted from JSON when needed for overlay generation
+        if chunked_detection:
+            # Long session: results go to disk chunk by chunk and the assembled store is
+            # memory-mapped; metrics are streamed (and checkpointed with the chunks) so
+            # they never need the whole track in memory
+            metrics_accumulator = OnlineMetricsAccumulator(video_info["fps"], video_info["width"], video_info["height"], LANDMARK_THRESHOLDS)
+            pose_track, pose_file, info_file = run_chunked_detection(video_path, analysis_id, video_info, metrics_accumulator)
+            overlay_file = None
+            metrics = metrics_accumulator.snapshot()
+        elif parallel_detection:
+            pose_track, frame_shapes = detect_poses_parallel(video_path, video_info, PARALLEL_DETECTION_WORKERS)
+            overlay_file = None
+            metrics = None
+        else:
+            # Stream decode -> detect (-> render when fused) so only the current frame is held in memory
+            metrics_accumulator = OnlineMetricsAccumulator(video_info["fps"], video_info["width"], video_info["height"], LANDMARK_THRESHOLDS)
+            pose_track, frame_shapes, overlay_file = run_detection_pass(
+                video_path, analysis_id, video_info, render_overlay=render_overlay_inline, metrics_accumulator=metrics_accumulator
+            )
+            metrics = metrics_accumulator.snapshot()
         
-        # Save frame information for debugging
-        info_file = save_frame_info(frames, video_info, analysis_id)
+        if not chunked_detection:
+            # Save pose data to JSON
+            pose_file = save_pose_data(pose_track, video_info, analysis_id)
+            
+            # Save frame information for debugging
+            info_file = save_frame_info(frame_shapes, video_info, analysis_id)
         
-        # Generate overlay video (M4b)
-        try:
-            from backend.src.pipeline.overlay import generate_overlay_video
-            overlay_file = generate_overlay_video(analysis_id)
-            logger.info(f"Overlay video generated: {overlay_file}")
-        except Exception as overlay_error:
-            logger.warning(f"Overlay video generation failed: {str(overlay_error)}")
-            overlay_file = None
+        # Generate overlay video (M4b) in a second decode pass when not fused
+        if CLIENT_OVERLAY_MODE:
+            logger.info("Client overlay mode: skipping overlay video, the browser draws the pose track")
+        elif LAZY_OVERLAY_RENDERING:
+            logger.info("Lazy overlay rendering: overlay video is rendered when first requested")
+        elif not render_overlay_inline:
+            try:
+                from backend.src.pipeline.overlay import generate_overlay_video
+                overlay_file = generate_overlay_video(analysis_id)
+                logger.info(f"Overlay video generated: {overlay_file}")
+            except Exception as overlay_error:
+                logger.warning(f"Overlay video generation failed: {str(overlay_error)}")
+                overlay_file = None
         
         # Calculate processing statistics
-        poses_detected = sum(1 for result in pose_results if result.get("pose_detected", False))
-        avg_confidence = sum(result.get("overall_confidence", 0) for result in pose_results) / len(pose_results) if pose_results else 0
+        processing_info = summarize_pose_track(pose_track)
+        processing_info["overlay_mode"] = "client" if CLIENT_OVERLAY_MODE else "video"
+        frames_extracted = processing_info["total_frames"]
+        poses_detected = processing_info["poses_detected"]
         
         # Prepare results
         results = {
             "analysis_id": analysis_id,
             "status": "success",
             "video_info": video_info,
-            "frames_extracted": len(frames),
+            "frames_extracted": frames_extracted,
             "poses_detected": poses_detected,
-            "avg_confidence": avg_confidence,
+            "avg_confidence": processing_info["avg_confidence"],
+            "processing_info": processing_info,
+            "metrics": metrics,
+            "pose_track": pose_track,
             "pose_file": pose_file,
             "info_file": info_file,
             "overlay_file": overlay_file,
-            "message": f"Successfully processed {len(frames)} frames, detected poses in {poses_detected} frames"
+            "message": f"Successfully processed {frames_extracted} frames, detected poses in {poses_detected} frames"
         }
         
-        logger.info(f"Video processing with pose detection completed: {len(frames)} frames, {poses_detected} poses detected")
+        logger.info(f"Video processing with pose detection completed: {frames_extracted} frames, {poses_detected} poses detected")
         return results
         
     except Exception as e:
@@ -467,23 +1170,25 @@ def process_video_basic(video_path: str, analysis_id: str) -> dict:
     logger.info(f"Starting basic video processing for analysis {analysis_id}")
     
     try:
-        # Read video and extract frames
-        frames, video_info = read_video_frames(video_path)
+        video_info = read_video_info(video_path, analysis_id)
+        
+        # Stream frames so only their shapes are kept, never the pixel data
+        frame_shapes = [(frame.shape, str(frame.dtype)) for _, frame in iter_video_frames(video_path)]
         
         # Save frame information for debugging
-        info_file = save_frame_info(frames, video_info, analysis_id)
+        info_file = save_frame_info(frame_shapes, video_info, analysis_id)
         
         # Prepare results
         results = {
             "analysis_id": analysis_id,
             "status": "success",
             "video_info": video_info,
-            "frames_extracted": len(frames),
+            "frames_extracted": len(frame_shapes),
             "info_file": info_file,
-            "message": f"Successfully processed {len(frames)} frames from video"
+            "message": f"Successfully processed {len(frame_shapes)} frames from video"
         }
         
-        logger.info(f"Basic video processing completed: {len(frames)} frames")
+        logger.info(f"Basic video processing completed: {len(frame_shapes)} frames")
         return results
         
     except Exception as e:
@@ -0,0 +1,84 @@
+"""
+Pose estimator pool for CruxVision.
+
+This module keeps a bounded set of pre-warmed MediaPipe Pose instances that
+analysis jobs check out for the duration of a video and check back in when done.
+Each job gets its own tracking graph, so concurrent background tasks never race
+on a shared estimator and tracking state never leaks from one video to the next.
+"""
+
+import logging
+import queue
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional
+
+import numpy as np
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+WARMUP_FRAME_SIZE = 256  # Side length of the blank frame used to initialize each graph
+
+
+class PoseEstimatorPool:
+    """
+    Bounded pool of reusable Pose estimators.
+    
+    Estimators are created and warmed up front, handed out one per job via
+    checkout(), and reset before they are returned so the next job starts
+    with clean tracking state.
+    """
+    
+    def __init__(self, size: int, estimator_factory: Callable[[], Any]):
+        """
+        Initialize and pre-warm the pool.
+        
+        Args:
+            size: Number of estimators (maximum concurrent jobs)
+            estimator_factory: Callable returning a new MediaPipe Pose instance
+        """
+        if size < 1:
+            raise ValueError(f"Pose estimator pool size must be at least 1, got {size}")
+        
+        self.size = size
+        self.available_estimators: "queue.Queue[Any]" = queue.Queue(maxsize=size)
+        
+        warmup_frame = np.zeros((WARMUP_FRAME_SIZE, WARMUP_FRAME_SIZE, 3), dtype=np.uint8)
+        for _ in range(size):
+            estimator = estimator_factory()
+            estimator.process(warmup_frame)
+            estimator.reset()
+            self.available_estimators.put(estimator)
+        
+        logger.info(f"PoseEstimatorPool initialized with {size} pre-warmed estimators")
+    
+    @contextmanager
+    def checkout(self, timeout: Optional[float] = None) -> Iterator[Any]:
+        """
+        Borrow an estimator for the duration of a job.
+        
+        Blocks while all estimators are in use. The estimator's tracking state is
+        reset when it is checked back in.
+        
+        Args:
+            timeout: Seconds to wait for a free estimator, or None to wait forever
+        
+        Yields:
+            MediaPipe Pose instance reserved for the caller
+        
+        Raises:
+            TimeoutError: If no estimator became available within timeout
+        """
+        if self.available_estimators.empty():
+            logger.info(f"All {self.size} pose estimators in use, waiting for one to be checked in")
+        
+        try:
+            estimator = self.available_estimators.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError(f"No pose estimator available after {timeout}s")
+        
+        try:
+            yield estimator
+        finally:
+            estimator.reset()
+            self.available_estimators.put(estimator)
@@ -0,0 +1,230 @@
+"""
+Compact pose track representation for CruxVision.
+
+This module stores pose results for a whole video in a few NumPy arrays instead of
+one dictionary per landmark per frame. Landmarks live in a (frames x 33 x 4) float32
+array holding x, y, z and visibility; detection, confidence and interpolation flags
+are per-frame arrays. Dictionary/JSON output is only produced at the API boundary.
+"""
+
+import logging
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+LANDMARK_COUNT = 33
+LANDMARK_FIELDS = ("x", "y", "z", "visibility")
+
+# Column indices into the last landmark axis
+X, Y, Z, VISIBILITY = range(len(LANDMARK_FIELDS))
+
+# Landmark names for reference (33 landmarks total, MediaPipe order)
+LANDMARK_NAMES = [
+    "nose", "left_eye_inner", "left_eye", "left_eye_outer", "right_eye_inner",
+    "right_eye", "right_eye_outer", "left_ear", "right_ear", "mouth_left",
+    "mouth_right", "left_shoulder", "right_shoulder", "left_elbow", "right_elbow",
+    "left_wrist", "right_wrist", "left_pinky", "right_pinky", "left_index",
+    "right_index", "left_thumb", "right_thumb", "left_hip", "right_hip",
+    "left_knee", "right_knee", "left_ankle", "right_ankle", "left_heel",
+    "right_heel", "left_foot_index", "right_foot_index"
+]
+
+
+class FramePose:
+    """
+    Pose result for a single frame as it flows through the detection pipeline.
+    """
+
+    __slots__ = ("frame_index", "landmarks", "overall_confidence", "interpolated", "error")
+
+    def __init__(self, frame_index: int, landmarks: Optional[np.ndarray] = None, overall_confidence: float = 0.0, interpolated: bool = False, error: Optional[str] = None):
+        """
+        Initialize frame pose.
+
+        Args:
+            frame_index: Index of the frame in the video
+            landmarks: (33, 4) float32 array of x, y, z, visibility, or None if no pose was found
+            overall_confidence: Mean visibility of the visible landmarks
+            interpolated: True if the landmarks were interpolated rather than detected
+            error: Error message if detection failed for this frame
+        """
+        self.frame_index = frame_index
+        self.landmarks = landmarks
+        self.overall_confidence = overall_confidence
+        self.interpolated = interpolated
+        self.error = error
+
+    @property
+    def pose_detected(self) -> bool:
+        """Whether this frame has landmarks."""
+        return self.landmarks is not None
+
+
+class PoseTrack:
+    """
+    Array-backed pose results for a video, indexed directly by frame index.
+
+    Frames can be added in any order; arrays grow as needed and frames that were
+    never added stay marked as missing.
+    """
+
+    def __init__(self, capacity: int = 0):
+        """
+        Initialize an empty pose track.
+
+        Args:
+            capacity: Number of frames to preallocate (the track grows past it if needed)
+        """
+        self.landmarks = np.zeros((capacity, LANDMARK_COUNT, len(LANDMARK_FIELDS)), dtype=np.float32)
+        self.pose_detected = np.zeros(capacity, dtype=bool)
+        self.overall_confidence = np.zeros(capacity, dtype=np.float32)
+        self.interpolated = np.zeros(capacity, dtype=bool)
+        self.frame_present = np.zeros(capacity, dtype=bool)
+        self.errors: Dict[int, str] = {}
+        self.frame_count = 0
+
+    def __len__(self) -> int:
+        return self.frame_count
+
+    def ensure_capacity(self, frame_count: int) -> None:
+        """
+        Grow the backing arrays so they can hold at least frame_count frames.
+
+        Args:
+            frame_count: Required number of frames
+        """
+        capacity = len(self.pose_detected)
+        if frame_count <= capacity:
+            return
+
+        new_capacity = max(frame_count, capacity * 2, 64)
+        extra = new_capacity - capacity
+        self.landmarks = np.concatenate([self.landmarks, np.zeros((extra,) + self.landmarks.shape[1:], dtype=np.float32)])
+        self.pose_detected = np.concatenate([self.pose_detected, np.zeros(extra, dtype=bool)])
+        self.overall_confidence = np.concatenate([self.overall_confidence, np.zeros(extra, dtype=np.float32)])
+        self.interpolated = np.concatenate([self.interpolated, np.zeros(extra, dtype=bool)])
+        self.frame_present = np.concatenate([self.frame_present, np.zeros(extra, dtype=bool)])
+
+    def add_frame(self, frame_pose: FramePose) -> None:
+        """
+        Store the pose result for one frame.
+
+        Args:
+            frame_pose: Pose result to store at frame_pose.frame_index
+        """
+        frame_index = frame_pose.frame_index
+        self.ensure_capacity(frame_index + 1)
+
+        if frame_pose.landmarks is not None:
+            self.landmarks[frame_index] = frame_pose.landmarks
+        self.pose_detected[frame_index] = frame_pose.landmarks is not None
+        self.overall_confidence[frame_index] = frame_pose.overall_confidence
+        self.interpolated[frame_index] = frame_pose.interpolated
+        self.frame_present[frame_index] = True
+        if frame_pose.error:
+            self.errors[frame_index] = frame_pose.error
+
+        self.frame_count = max(self.frame_count, frame_index + 1)
+
+    def trim(self) -> "PoseTrack":
+        """
+        Release preallocated capacity beyond the last stored frame.
+
+        Returns:
+            This pose track, for chaining
+        """
+        self.landmarks = self.landmarks[:self.frame_count].copy()
+        self.pose_detected = self.pose_detected[:self.frame_count].copy()
+        self.overall_confidence = self.overall_confidence[:self.frame_count].copy()
+        self.interpolated = self.interpolated[:self.frame_count].copy()
+        self.frame_present = self.frame_present[:self.frame_count].copy()
+        return self
+
+    def has_pose(self, frame_index: int) -> bool:
+        """
+        Check whether a frame has landmarks.
+
+        Args:
+            frame_index: Frame index to check
+
+        Returns:
+            True if the frame exists in the track and a pose was detected or interpolated
+        """
+        return 0 <= frame_index < self.frame_count and bool(self.pose_detected[frame_index])
+
+    def get_landmarks(self, frame_index: int) -> Optional[np.ndarray]:
+        """
+        Get the landmark array for a frame without copying.
+
+        Args:
+            frame_index: Frame index to look up
+
+        Returns:
+            (33, 4) view of x, y, z, visibility, or None if the frame has no pose
+        """
+        if not self.has_pose(frame_index):
+            return None
+        return self.landmarks[frame_index]
+
+    def get_frame_pose(self, frame_index: int) -> Optional[FramePose]:
+        """
+        Get a FramePose for a stored frame.
+
+        Args:
+            frame_index: Frame index to look up
+
+        Returns:
+            FramePose for the frame, or None if the frame is missing from the track
+        """
+        if not (0 <= frame_index < self.frame_count and self.frame_present[frame_index]):
+            return None
+        return FramePose(
+            frame_index,
+            self.get_landmarks(frame_index),
+            float(self.overall_confidence[frame_index]),
+            bool(self.interpolated[frame_index]),
+            self.errors.get(frame_index)
+        )
+
+    @property
+    def frames_stored(self) -> int:
+        """Number of frames that have a stored result."""
+        return int(self.frame_present[:self.frame_count].sum())
+
+    @property
+    def poses_detected(self) -> int:
+        """Number of frames with landmarks."""
+        return int(self.pose_detected[:self.frame_count].sum())
+
+    @classmethod
+    def from_frame_dicts(cls, frames: List[Dict[str, Any]]) -> "PoseTrack":
+        """
+        Build a pose track from the per-frame dictionaries stored in pose_data JSON.
+
+        Args:
+            frames: List of frame dictionaries, each with a frame_index
+
+        Returns:
+            PoseTrack holding the same frames
+        """
+        track = cls(capacity=max((frame.get("frame_index", 0) for frame in frames), default=-1) + 1)
+
+        for frame in frames:
+            landmarks = None
+            if frame.get("pose_detected", False) and frame.get("landmarks"):
+                landmarks = np.array(
+                    [[landmark[field] for field in LANDMARK_FIELDS] for landmark in frame["landmarks"]],
+                    dtype=np.float32
+                )
+            track.add_frame(FramePose(
+                frame["frame_index"],
+                landmarks,
+                frame.get("overall_confidence", 0.0),
+                frame.get("interpolated", False),
+                frame.get("error")
+            ))
+
+        return track
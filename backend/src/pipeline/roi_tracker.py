@@ -0,0 +1,151 @@
+"""
+Region-of-interest tracking for CruxVision pose detection.
+
+Climbing footage is mostly wall, with the climber in a small part of the frame.
+This module keeps a crop region around the climber's last landmark bounding box
+(plus a margin) so inference only has to look at that region. The region only moves
+when the climber leaves its inner area, which keeps MediaPipe's own tracking stable,
+and it is dropped in favour of the full frame whenever the pose is lost.
+"""
+
+import logging
+from typing import Optional, Tuple
+
+import numpy as np
+
+from backend.src.pipeline.pose_track import X, Y, Z, VISIBILITY
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+MIN_VISIBLE_LANDMARKS = 8  # Fewer visible landmarks than this counts as tracking lost
+MIN_REGION_SIZE = 64  # Smallest crop side in pixels
+
+# Crop region in pixels: (x0, y0, x1, y1), end-exclusive
+Region = Tuple[int, int, int, int]
+
+
+class RoiTracker:
+    """
+    Tracks the crop region used for the next frame's pose detection.
+    
+    A region of None means "search the full frame", which is the state at the
+    start of a video and after tracking is lost.
+    """
+    
+    def __init__(self, margin: float, min_visibility: float, max_area_fraction: float):
+        """
+        Initialize ROI tracker.
+        
+        Args:
+            margin: Padding added on each side, as a fraction of the landmark box's longer side
+            min_visibility: Visibility a landmark needs to count towards the bounding box
+            max_area_fraction: Use the full frame when the crop would cover more than this
+                fraction of it (cropping would save little)
+        """
+        self.margin = margin
+        self.min_visibility = min_visibility
+        self.max_area_fraction = max_area_fraction
+        
+        self.region: Optional[Region] = None
+        self.cropped_frames = 0
+        self.full_frames = 0
+        self.tracking_lost = 0
+    
+    def record_frame(self, region: Optional[Region]) -> None:
+        """
+        Count a frame that was detected with the given region.
+        
+        Args:
+            region: Crop region used, or None for the full frame
+        """
+        if region is None:
+            self.full_frames += 1
+        else:
+            self.cropped_frames += 1
+    
+    def update(self, landmarks: Optional[np.ndarray], frame_shape: Tuple[int, ...]) -> bool:
+        """
+        Update the crop region from the latest full-frame landmarks.
+        
+        Args:
+            landmarks: (33, 4) full-frame normalized landmarks, or None if no pose was found
+            frame_shape: Shape of the full frame (height, width, channels)
+        
+        Returns:
+            True if the region changed
+        """
+        height, width = frame_shape[:2]
+        new_region = None
+        
+        if landmarks is not None:
+            visible = landmarks[:, VISIBILITY] >= self.min_visibility
+            if visible.sum() >= MIN_VISIBLE_LANDMARKS:
+                tight_box = self.landmark_box(landmarks[visible], width, height)
+                
+                # Hysteresis: keep the current region while the climber stays within
+                # it (with half the margin to spare) and it has not become much too large
+                if self.region is not None and self.contains(self.region, self.pad_box(tight_box, self.margin / 2, width, height)) \
+                        and self.area(self.region) <= 2 * self.area(self.pad_box(tight_box, self.margin, width, height)):
+                    return False
+                
+                new_region = self.pad_box(tight_box, self.margin, width, height)
+                if self.area(new_region) > self.max_area_fraction * width * height:
+                    new_region = None
+        
+        changed = new_region != self.region
+        self.region = new_region
+        return changed
+    
+    def landmark_box(self, landmarks: np.ndarray, width: int, height: int) -> Tuple[float, float, float, float]:
+        """Pixel bounding box (x0, y0, x1, y1) of the given landmarks."""
+        xs = landmarks[:, X] * width
+        ys = landmarks[:, Y] * height
+        return float(xs.min()), float(ys.min()), float(xs.max()), float(ys.max())
+    
+    def pad_box(self, box: Tuple[float, float, float, float], margin: float, width: int, height: int) -> Region:
+        """Pad a box by margin * its longer side on each side and clip it to the frame."""
+        x0, y0, x1, y1 = box
+        padding = margin * max(x1 - x0, y1 - y0, MIN_REGION_SIZE)
+        return (
+            max(int(x0 - padding), 0),
+            max(int(y0 - padding), 0),
+            min(int(np.ceil(x1 + padding)), width),
+            min(int(np.ceil(y1 + padding)), height)
+        )
+    
+    @staticmethod
+    def contains(outer: Region, inner: Region) -> bool:
+        """Whether the inner region lies completely inside the outer region."""
+        return outer[0] <= inner[0] and outer[1] <= inner[1] and outer[2] >= inner[2] and outer[3] >= inner[3]
+    
+    @staticmethod
+    def area(region: Region) -> int:
+        """Area of a region in pixels."""
+        return max(region[2] - region[0], 0) * max(region[3] - region[1], 0)
+
+
+def map_region_landmarks_to_frame(landmarks: np.ndarray, region: Region, frame_shape: Tuple[int, ...]) -> np.ndarray:
+    """
+    Convert landmarks normalized to a crop into full-frame normalized coordinates.
+    
+    x_full = (x_crop * crop_width + x0) / frame_width, likewise for y. MediaPipe's z
+    uses the same scale as x, so it is scaled by crop_width / frame_width.
+    
+    Args:
+        landmarks: (33, 4) landmarks normalized to the crop
+        region: Crop region (x0, y0, x1, y1) in full-frame pixels
+        frame_shape: Shape of the full frame (height, width, channels)
+    
+    Returns:
+        (33, 4) landmarks normalized to the full frame
+    """
+    height, width = frame_shape[:2]
+    x0, y0, x1, y1 = region
+    crop_width, crop_height = x1 - x0, y1 - y0
+    
+    mapped = landmarks.copy()
+    mapped[:, X] = (landmarks[:, X] * crop_width + x0) / width
+    mapped[:, Y] = (landmarks[:, Y] * crop_height + y0) / height
+    mapped[:, Z] = landmarks[:, Z] * crop_width / width
+    return mapped
@@ -0,0 +1,274 @@
+"""
+Staged pipeline executor for CruxVision.
+
+This module runs a chain of iterator stages (decode -> infer -> render -> encode)
+with each stage in its own thread, connected by bounded queues. A full queue blocks
+the stage feeding it, so a slow encoder throttles decoding instead of letting frames
+pile up in memory. Every stage records how long it spent working, waiting for input
+and waiting for room downstream, which shows where the bottleneck is on a machine.
+
+OpenCV and MediaPipe release the GIL while they work, so threads are enough to
+overlap decoding, inference and encoding.
+"""
+
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+QUEUE_POLL_SECONDS = 0.1  # How often blocked stages check whether the pipeline was cancelled
+
+# A stage turns an iterator of inputs into an iterator of outputs; it may keep state,
+# buffer, drop or emit extra items
+StageTransform = Callable[[Iterator[Any]], Iterator[Any]]
+
+END_OF_STREAM = object()
+
+
+class StageFailure:
+    """
+    Wraps an exception raised inside a stage so it can travel downstream.
+    """
+    
+    def __init__(self, stage_name: str, error: BaseException):
+        self.stage_name = stage_name
+        self.error = error
+
+
+class UpstreamFailure(Exception):
+    """Raised inside a stage when an earlier stage failed, to stop it and forward the failure."""
+    
+    def __init__(self, failure: StageFailure):
+        super().__init__(f"Upstream stage '{failure.stage_name}' failed")
+        self.failure = failure
+
+
+class StageStats:
+    """
+    Throughput counters for one pipeline stage.
+    """
+    
+    def __init__(self, name: str):
+        """
+        Initialize stage counters.
+        
+        Args:
+            name: Stage name used in logs
+        """
+        self.name = name
+        self.items = 0
+        self.total_seconds = 0.0
+        self.input_wait_seconds = 0.0  # Starved: waiting for the previous stage
+        self.output_wait_seconds = 0.0  # Backpressured: waiting for the next stage
+    
+    @property
+    def busy_seconds(self) -> float:
+        """Time spent doing the stage's own work."""
+        return max(self.total_seconds - self.input_wait_seconds - self.output_wait_seconds, 0.0)
+    
+    @property
+    def items_per_second(self) -> float:
+        """Throughput the stage could sustain if it never waited."""
+        return self.items / self.busy_seconds if self.busy_seconds > 0 else 0.0
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert counters to a JSON-serializable dictionary.
+        
+        Returns:
+            Dictionary of counters rounded for display
+        """
+        return {
+            "items": self.items,
+            "busy_seconds": round(self.busy_seconds, 3),
+            "input_wait_seconds": round(self.input_wait_seconds, 3),
+            "output_wait_seconds": round(self.output_wait_seconds, 3),
+            "items_per_second": round(self.items_per_second, 1)
+        }
+
+
+class StagedPipeline:
+    """
+    Runs a source iterator through a chain of stages, one thread per stage.
+    
+    Iterating the pipeline starts the threads and yields the last stage's outputs
+    in order. An exception in any stage stops the pipeline and is re-raised to the
+    consumer. Closing the iterator early cancels all stages.
+    """
+    
+    def __init__(self, source: Iterable[Any], stages: List[Tuple[str, StageTransform]], source_name: str = "decode", queue_size: int = 8, threaded: bool = True):
+        """
+        Initialize staged pipeline.
+        
+        Args:
+            source: Iterable producing the pipeline's input items
+            stages: (name, transform) pairs applied in order
+            source_name: Stage name used for the source in stats
+            queue_size: Capacity of each queue between stages
+            threaded: Run stages in threads; when False the transforms are simply
+                chained in the caller's thread (no overlap, no stage stats)
+        """
+        if queue_size < 1:
+            raise ValueError(f"Pipeline queue size must be at least 1, got {queue_size}")
+        
+        self.source = source
+        self.source_name = source_name
+        self.stages = stages
+        self.queue_size = queue_size
+        self.threaded = threaded
+        self.stats: List[StageStats] = [StageStats(source_name)] + [StageStats(name) for name, _ in stages]
+        self.cancelled = threading.Event()
+    
+    def __iter__(self) -> Iterator[Any]:
+        if not self.threaded:
+            items = iter(self.source)
+            for _, transform in self.stages:
+                items = transform(items)
+            yield from items
+            return
+        
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in range(len(self.stages) + 1)]
+        threads = [threading.Thread(target=self.run_stage, args=(self.source_name, lambda items: items, iter(self.source), queues[0], self.stats[0]), name=f"pipeline-{self.source_name}", daemon=True)]
+        for stage_index, (name, transform) in enumerate(self.stages):
+            threads.append(threading.Thread(
+                target=self.run_stage,
+                args=(name, transform, self.iter_queue(queues[stage_index], self.stats[stage_index + 1]), queues[stage_index + 1], self.stats[stage_index + 1]),
+                name=f"pipeline-{name}",
+                daemon=True
+            ))
+        
+        for thread in threads:
+            thread.start()
+        
+        try:
+            while True:
+                item = self.get_item(queues[-1])
+                if item is END_OF_STREAM:
+                    break
+                if isinstance(item, StageFailure):
+                    logger.error(f"Pipeline stage '{item.stage_name}' failed: {str(item.error)}")
+                    raise item.error
+                yield item
+        finally:
+            self.cancelled.set()
+            for thread in threads:
+                thread.join()
+            self.log_stats()
+    
+    def run_stage(self, name: str, transform: StageTransform, inputs: Iterator[Any], output_queue: "queue.Queue[Any]", stats: StageStats) -> None:
+        """
+        Thread body: apply a transform to its inputs and push results downstream.
+        
+        Args:
+            name: Stage name
+            transform: Stage transform
+            inputs: Iterator over the stage's input items
+            output_queue: Queue feeding the next stage
+            stats: Counters for this stage
+        """
+        started = time.perf_counter()
+        outputs = transform(inputs)
+        try:
+            for item in outputs:
+                stats.items += 1
+                if not self.put_item(output_queue, item, stats):
+                    return
+            self.put_item(output_queue, END_OF_STREAM, stats)
+        except UpstreamFailure as failure:
+            self.put_item(output_queue, failure.failure, stats)
+        except Exception as e:
+            self.put_item(output_queue, StageFailure(name, e), stats)
+        finally:
+            # Close generator stages so they release resources (captures, pooled estimators)
+            # even when the pipeline was cancelled mid-stream
+            if hasattr(outputs, "close"):
+                outputs.close()
+            stats.total_seconds = time.perf_counter() - started
+    
+    def iter_queue(self, input_queue: "queue.Queue[Any]", stats: StageStats) -> Iterator[Any]:
+        """
+        Iterate items from the previous stage until it signals the end.
+        
+        Args:
+            input_queue: Queue fed by the previous stage
+            stats: Counters of the consuming stage (input wait time)
+        
+        Yields:
+            Items produced by the previous stage
+        """
+        while True:
+            wait_started = time.perf_counter()
+            item = self.get_item(input_queue)
+            stats.input_wait_seconds += time.perf_counter() - wait_started
+            
+            if item is END_OF_STREAM:
+                return
+            if isinstance(item, StageFailure):
+                raise UpstreamFailure(item)
+            yield item
+    
+    def get_item(self, source_queue: "queue.Queue[Any]") -> Any:
+        """
+        Block until an item is available or the pipeline is cancelled.
+        
+        Args:
+            source_queue: Queue to read from
+        
+        Returns:
+            Next item, or END_OF_STREAM if the pipeline was cancelled
+        """
+        while not self.cancelled.is_set():
+            try:
+                return source_queue.get(timeout=QUEUE_POLL_SECONDS)
+            except queue.Empty:
+                continue
+        return END_OF_STREAM
+    
+    def put_item(self, output_queue: "queue.Queue[Any]", item: Any, stats: StageStats) -> bool:
+        """
+        Block until the next stage has room for an item or the pipeline is cancelled.
+        
+        Args:
+            output_queue: Queue to write to
+            item: Item to send downstream
+            stats: Counters of the producing stage (output wait time)
+        
+        Returns:
+            True if the item was queued, False if the pipeline was cancelled
+        """
+        wait_started = time.perf_counter()
+        try:
+            while not self.cancelled.is_set():
+                try:
+                    output_queue.put(item, timeout=QUEUE_POLL_SECONDS)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        finally:
+            stats.output_wait_seconds += time.perf_counter() - wait_started
+    
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get per-stage throughput counters.
+        
+        Returns:
+            Dictionary mapping stage name to its counters
+        """
+        return {stats.name: stats.to_dict() for stats in self.stats}
+    
+    def log_stats(self) -> None:
+        """Log per-stage counters and the stage that limited throughput."""
+        for stats in self.stats:
+            logger.info(
+                f"Stage {stats.name}: {stats.items} items, {stats.busy_seconds:.2f}s busy "
+                f"({stats.items_per_second:.1f}/s), {stats.input_wait_seconds:.2f}s starved, "
+                f"{stats.output_wait_seconds:.2f}s blocked"
+            )
+        
+        bottleneck = max(self.stats, key=lambda stats: stats.busy_seconds)
+        logger.info(f"Pipeline bottleneck: {bottleneck.name} ({bottleneck.busy_seconds:.2f}s busy)")
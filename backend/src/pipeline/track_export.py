@@ -0,0 +1,146 @@
+"""
+Compact pose track export for client-side overlay drawing.
+
+Instead of encoding an overlay video, the backend can serve the pose track and
+let the browser draw the skeleton over the original upload. The track is a small
+little-endian binary file:
+
+    header      TRACK_HEADER (magic, version, frame counts, exact frame rate,
+                frame size, rotation, trail length, coordinate range)
+    frames      uint32[N] indices of the frames that have a pose
+    landmarks   uint16[N, 33, 3] quantized x, y, visibility
+    anchors     for "hip" then "shoulder": uint32 count M, uint32[M] frame
+                indices, uint16[M, 2] pixel positions
+
+Anchors are the same precomputed trails the server-side renderer draws, so the
+client shows identical tracers without recomputing them.
+"""
+
+import logging
+import os
+import struct
+from pathlib import Path
+
+import numpy as np
+
+from backend.src.utils.file_utils import OUTPUT_DIR
+from backend.src.utils.pose_store import get_pose_store_path, load_pose_store
+from backend.src.utils.video_metadata import VideoMetadata, get_video_metadata
+from backend.src.pipeline.pose_track import PoseTrack, LANDMARK_COUNT, X, Y, VISIBILITY
+from backend.src.pipeline.motion_tracer import compute_track_anchor_trails
+from backend.src.pipeline.overlay import find_original_video, TRACER_PERSISTENCE_SECONDS
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Format configuration
+TRACK_MAGIC = b"CXTK"
+TRACK_VERSION = 1
+TRACK_COORD_RANGE = (-0.5, 1.5)  # Normalized x/y range kept by quantization; values outside are clipped
+TRACK_HEADER = struct.Struct("<4sHHIIIIHHHHff")
+ANCHOR_NAMES = ("hip", "shoulder")
+
+
+def quantize(values: np.ndarray, low: float, high: float) -> np.ndarray:
+    """
+    Map values in [low, high] onto the full uint16 range.
+    
+    Args:
+        values: Array of values
+        low: Value stored as 0
+        high: Value stored as 65535
+    
+    Returns:
+        uint16 array of the same shape
+    """
+    scaled = (np.clip(values, low, high) - low) / (high - low) * 65535
+    return np.round(scaled).astype(np.uint16)
+
+
+def encode_compact_track(pose_track: PoseTrack, metadata: VideoMetadata, persistence_frames: int) -> bytes:
+    """
+    Encode a pose track and its anchor trails in the compact binary format.
+    
+    Args:
+        pose_track: Pose track for the video
+        metadata: Metadata of the original video
+        persistence_frames: Tracer trail length in frames
+    
+    Returns:
+        Encoded track
+    """
+    frame_count = len(pose_track)
+    pose_frames = np.flatnonzero(pose_track.pose_detected[:frame_count])
+    landmarks = np.asarray(pose_track.landmarks[pose_frames], dtype=np.float32)
+    
+    coord_low, coord_high = TRACK_COORD_RANGE
+    quantized = np.empty((len(pose_frames), LANDMARK_COUNT, 3), dtype=np.uint16)
+    quantized[:, :, 0] = quantize(landmarks[:, :, X], coord_low, coord_high)
+    quantized[:, :, 1] = quantize(landmarks[:, :, Y], coord_low, coord_high)
+    quantized[:, :, 2] = quantize(landmarks[:, :, VISIBILITY], 0.0, 1.0)
+    
+    header = TRACK_HEADER.pack(
+        TRACK_MAGIC, TRACK_VERSION, LANDMARK_COUNT,
+        frame_count, len(pose_frames),
+        metadata.frame_rate.numerator, metadata.frame_rate.denominator,
+        metadata.width, metadata.height, metadata.decoded_rotation, persistence_frames,
+        coord_low, coord_high
+    )
+    parts = [header, pose_frames.astype("<u4").tobytes(), quantized.astype("<u2").tobytes()]
+    
+    # Anchors are in pixels of the decoded frame, like the server-side renderer's
+    anchor_trails = compute_track_anchor_trails(pose_track, (metadata.height, metadata.width), persistence_frames)
+    for name in ANCHOR_NAMES:
+        trails = anchor_trails[name]
+        parts.append(struct.pack("<I", len(trails.frame_indices)))
+        parts.append(trails.frame_indices.astype("<u4").tobytes())
+        parts.append(trails.positions.astype("<u2").tobytes())
+    
+    return b"".join(parts)
+
+
+def get_track_path(analysis_id: str) -> Path:
+    """
+    Get the path of the compact track file for an analysis.
+    
+    Args:
+        analysis_id: Unique identifier for the analysis
+    
+    Returns:
+        Path of the track file
+    """
+    return OUTPUT_DIR / f"track_{analysis_id}.bin"
+
+
+def export_compact_track(analysis_id: str) -> Path:
+    """
+    Write the compact track file for an analysis from its saved pose data.
+    
+    Args:
+        analysis_id: Unique identifier for the analysis
+    
+    Returns:
+        Path of the written track file
+    
+    Raises:
+        FileNotFoundError: If the pose data or the original video is missing
+    """
+    pose_store_file = get_pose_store_path(analysis_id)
+    if not pose_store_file.exists():
+        raise FileNotFoundError(f"Pose data not found for analysis {analysis_id}")
+    
+    pose_track, _ = load_pose_store(pose_store_file)
+    video_path = find_original_video(analysis_id)
+    metadata = get_video_metadata(video_path, analysis_id)
+    persistence_frames = int(metadata.fps * TRACER_PERSISTENCE_SECONDS)
+    
+    data = encode_compact_track(pose_track, metadata, persistence_frames)
+    
+    # Write to a temporary file first so readers never see a partial track
+    track_file = get_track_path(analysis_id)
+    temp_file = track_file.with_suffix(".tmp")
+    temp_file.write_bytes(data)
+    os.replace(temp_file, track_file)
+    
+    logger.info(f"Compact track exported: {pose_track.poses_detected} poses, {len(data)} bytes -> {track_file}")
+    return track_file
@@ -1,13 +1,18 @@
+import hashlib
 from pathlib import Path
+from typing import Tuple
 from fastapi import UploadFile, HTTPException
 from backend.src.utils.file_utils import (
     validate_file_extension, 
     validate_file_size, 
     get_safe_filename,
     ensure_directories_exist,
+    cleanup_file,
     UPLOAD_DIR
 )
 
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # Bytes read, hashed and written per step
+
 # File signatures for video files (first few bytes)
 VIDEO_SIGNATURES = {
     b'\x00\x00\x00\x20ftypmp42',  # MP4
@@ -15,16 +20,19 @@ VIDEO_SIGNATURES = {
     b'RIFF',                       # AVI (starts with RIFF)
 }
 
-async def validate_and_save_video(file: UploadFile, analysis_id: str) -> str:
+async def validate_and_save_video(file: UploadFile, analysis_id: str) -> Tuple[str, str]:
     """
     Validate uploaded video file and save it to storage.
     
+    The upload is streamed to disk in chunks and hashed on the way, so the content
+    hash costs no extra pass and the whole file is never held in memory.
+    
     Args:
         file: FastAPI UploadFile object
         analysis_id: Unique identifier for this analysis
         
     Returns:
-        str: Path to saved file
+        Tuple of (path to saved file, SHA-256 hex digest of its content)
         
     Raises:
         HTTPException: If validation fails
@@ -46,16 +54,8 @@ async def validate_and_save_video(file: UploadFile, analysis_id: str) -> str:
             detail=f"Invalid file format. Allowed formats: MP4, MOV, AVI"
         )
     
-    # Read file content for validation
-    content = await file.read()
-    file_size = len(content)
-    
-    # Validate file size
-    if not validate_file_size(file_size):
-        raise HTTPException(
-            status_code=400,
-            detail=f"File too large. Maximum size: 50MB"
-        )
+    # Read the first chunk for signature validation
+    content = await file.read(UPLOAD_CHUNK_SIZE)
     
     # Validate file signature (magic bytes)
     try:
@@ -88,14 +88,33 @@ async def validate_and_save_video(file: UploadFile, analysis_id: str) -> str:
     safe_filename = get_safe_filename(file.filename, analysis_id)
     file_path = UPLOAD_DIR / safe_filename
     
+    content_hash = hashlib.sha256()
+    file_size = 0
+    
     try:
-        # Write file to disk
+        # Stream chunks to disk, hashing and checking the size as they arrive
         with open(file_path, "wb") as f:
-            f.write(content)
+            while content:
+                file_size += len(content)
+                
+                # Validate file size
+                if not validate_file_size(file_size):
+                    raise HTTPException(
+                        status_code=400,
+                        detail=f"File too large. Maximum size: 50MB"
+                    )
+                
+                content_hash.update(content)
+                f.write(content)
+                content = await file.read(UPLOAD_CHUNK_SIZE)
         
-        return str(file_path)
+        return str(file_path), content_hash.hexdigest()
         
+    except HTTPException:
+        cleanup_file(file_path)
+        raise
     except Exception as e:
+        cleanup_file(file_path)
         raise HTTPException(
             status_code=500,
             detail="Failed to save uploaded file"
@@ -0,0 +1,260 @@
+"""
+Overlay video encoding for CruxVision.
+
+Rendered BGR frames are piped as raw video into a single ffmpeg process that
+encodes them with libx264. Orientation is written as container display-matrix
+metadata instead of rotating pixels, the frame rate is the source's exact
+rational rate, and the original audio stream is copied without re-encoding.
+When ffmpeg is not installed (or cannot be run), an OpenCV VideoWriter is used
+instead. ffmpeg releases before 6.0 have no -display_rotation option; they get
+the legacy rotate tag instead.
+
+With PROGRESSIVE_OUTPUT the same encode is also written as an HLS stream
+(fragmented MP4 segments and a growing playlist) through ffmpeg's tee muxer,
+so players can start on the first segments while the rest is still rendering.
+"""
+
+import logging
+import shutil
+import subprocess
+import tempfile
+from fractions import Fraction
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Configuration
+FFMPEG_BINARY = "ffmpeg"
+ENCODE_PRESET = "veryfast"  # libx264 preset: slower presets give smaller files at the same quality
+ENCODE_CRF = 23  # libx264 constant rate factor: lower is higher quality and larger
+COPY_AUDIO = True  # Copy the original audio stream into the overlay video
+PROGRESSIVE_OUTPUT = True  # Also write an HLS stream that is playable while rendering
+STREAM_SEGMENT_SECONDS = 2  # Target HLS segment length; keyframes are forced at this interval
+STREAM_BITS_PER_PIXEL = 0.1  # Bandwidth estimate for the master playlist; the CRF still decides the real rate
+
+# HLS stream file names inside a stream directory
+STREAM_MASTER_PLAYLIST = "master.m3u8"  # Lists the codecs, so MSE players can set up a source buffer
+STREAM_MEDIA_PLAYLIST = "playlist.m3u8"
+
+# Audio codecs the MP4 muxer accepts as a stream copy
+MP4_AUDIO_CODECS = {"aac", "mp3", "ac3", "eac3", "alac", "opus", "flac"}
+
+
+@lru_cache(maxsize=1)
+def get_ffmpeg_options() -> Optional[str]:
+    """
+    Probe the ffmpeg binary once for the options it supports.
+    
+    Returns:
+        Full help text of the ffmpeg binary, or None if it is missing or cannot be run
+    """
+    if shutil.which(FFMPEG_BINARY) is None:
+        return None
+    
+    try:
+        result = subprocess.run([FFMPEG_BINARY, '-hide_banner', '-h', 'full'], capture_output=True, text=True, errors="replace", timeout=30)
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.warning(f"Cannot run {FFMPEG_BINARY}, using the OpenCV encoder: {str(e)}")
+        return None
+    
+    if result.returncode != 0:
+        logger.warning(f"{FFMPEG_BINARY} exited with code {result.returncode}, using the OpenCV encoder")
+        return None
+    return result.stdout
+
+
+def ffmpeg_available() -> bool:
+    """Check whether a working ffmpeg binary is on the PATH."""
+    return get_ffmpeg_options() is not None
+
+
+def get_rotation_args(rotation: int) -> Tuple[List[str], List[str]]:
+    """
+    Build the ffmpeg arguments that write a display rotation as metadata.
+    
+    ffmpeg 6.0 and later take -display_rotation as an input option. Older releases
+    only know the legacy rotate tag, an output option measured clockwise.
+    
+    Args:
+        rotation: Counter-clockwise display rotation in degrees
+    
+    Returns:
+        Tuple of (arguments before the video input, arguments before the output)
+    """
+    if '-display_rotation' in (get_ffmpeg_options() or ''):
+        # -noautorotate keeps ffmpeg from rotating the pixels itself
+        return ['-noautorotate', '-display_rotation', str(rotation)], []
+    return [], ['-metadata:s:v:0', f"rotate={(360 - rotation) % 360}"]
+
+
+class FFmpegPipeEncoder:
+    """
+    Encodes frames by piping raw BGR data into an ffmpeg process.
+    
+    Has the same write()/release()/isOpened() interface as cv2.VideoWriter so the
+    rendering pipeline can use either.
+    """
+    
+    def __init__(self, output_path: str, width: int, height: int, frame_rate: Fraction, rotation: int = 0, audio_source: Optional[str] = None, preset: str = ENCODE_PRESET, crf: int = ENCODE_CRF, stream_dir: Optional[str] = None):
+        """
+        Start the ffmpeg encoder process.
+        
+        Args:
+            output_path: Path of the MP4 file to write
+            width: Frame width in pixels
+            height: Frame height in pixels
+            frame_rate: Exact output frame rate
+            rotation: Display rotation in degrees, written as metadata
+            audio_source: Video whose first audio stream is copied into the output, or None
+            preset: libx264 preset
+            crf: libx264 constant rate factor
+            stream_dir: Existing directory to also write a progressive HLS stream to, or None
+        """
+        self.output_path = output_path
+        self.stream_dir = stream_dir
+        self.frame_shape = (height, width, 3)
+        self.frames_written = 0
+        
+        # Rotation becomes display-matrix metadata instead of rotated pixels
+        rotation_input_args, rotation_output_args = get_rotation_args(rotation)
+        
+        cmd = [
+            FFMPEG_BINARY, '-v', 'error', '-y',
+            '-f', 'rawvideo', '-pix_fmt', 'bgr24', '-s', f"{width}x{height}",
+            '-framerate', f"{frame_rate.numerator}/{frame_rate.denominator}",
+            *rotation_input_args,
+            '-i', 'pipe:0'
+        ]
+        if audio_source:
+            cmd += ['-i', audio_source, '-map', '0:v:0', '-map', '1:a:0', '-c:a', 'copy', '-shortest']
+        if width % 2 or height % 2:
+            # yuv420p needs even dimensions
+            cmd += ['-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2']
+        cmd += ['-c:v', 'libx264', '-preset', preset, '-crf', str(crf), '-pix_fmt', 'yuv420p', *rotation_output_args]
+        if stream_dir:
+            cmd += get_stream_output_args(output_path, stream_dir, audio_source is not None, width * height * frame_rate)
+        else:
+            cmd += ['-movflags', '+faststart', output_path]
+        
+        # stderr goes to a file so a chatty ffmpeg can never block on a full pipe
+        self.stderr_file = tempfile.TemporaryFile()
+        self.process = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=self.stderr_file)
+        
+        logger.info(f"FFmpeg encoder started: {width}x{height} @ {frame_rate} fps, preset {preset}, crf {crf}, rotation {rotation}, audio {'copied' if audio_source else 'none'}, stream {stream_dir or 'none'}")
+    
+    def isOpened(self) -> bool:
+        """Whether the encoder process is still running."""
+        return self.process.poll() is None
+    
+    def write(self, frame: np.ndarray) -> None:
+        """
+        Send one BGR frame to the encoder.
+        
+        Args:
+            frame: Frame of the size given at construction
+        
+        Raises:
+            ValueError: If the frame has the wrong shape
+            RuntimeError: If the encoder process has exited
+        """
+        if frame.shape != self.frame_shape:
+            raise ValueError(f"Frame shape {frame.shape} does not match encoder shape {self.frame_shape}")
+        
+        try:
+            self.process.stdin.write(memoryview(np.ascontiguousarray(frame)))
+        except (BrokenPipeError, OSError):
+            raise RuntimeError(f"FFmpeg encoder exited: {self.read_errors()}")
+        self.frames_written += 1
+    
+    def release(self) -> None:
+        """
+        Finish the encode and wait for ffmpeg to write the file.
+        
+        Raises:
+            RuntimeError: If ffmpeg failed
+        """
+        if self.process.stdin.closed:
+            return
+        
+        try:
+            self.process.stdin.close()
+        except BrokenPipeError:
+            pass
+        return_code = self.process.wait()
+        errors = self.read_errors()
+        self.stderr_file.close()
+        
+        if return_code != 0:
+            raise RuntimeError(f"FFmpeg encoder failed with exit code {return_code}: {errors}")
+        logger.info(f"FFmpeg encoder finished: {self.frames_written} frames -> {self.output_path}")
+    
+    def read_errors(self) -> str:
+        """Read what ffmpeg has written to stderr so far."""
+        self.stderr_file.seek(0)
+        return self.stderr_file.read().decode("utf-8", errors="replace").strip()
+
+
+def get_stream_output_args(output_path: str, stream_dir: str, has_audio: bool, pixel_rate: Fraction) -> List[str]:
+    """
+    Build the ffmpeg output arguments that write the MP4 file and an HLS stream from one encode.
+    
+    Keyframes are forced every STREAM_SEGMENT_SECONDS so segments can be cut at that
+    length. The EVENT playlist only ever grows and gets #EXT-X-ENDLIST when the
+    encode finishes, which tells players the stream is complete.
+    
+    ffmpeg only lists the variant (and its codecs) in the master playlist when the
+    stream has a bitrate, so an estimate is passed as -b:v; libx264 keeps using the
+    CRF for rate control and the encoded video is unchanged.
+    
+    Args:
+        output_path: Path of the MP4 file to write
+        stream_dir: Directory for the playlists, init segment and media segments
+        has_audio: Whether an audio stream is mapped into the output
+        pixel_rate: Pixels per second of the video, for the bandwidth estimate
+    
+    Returns:
+        ffmpeg arguments following the codec options
+    """
+    stream_path = Path(stream_dir)
+    hls_options = ":".join([
+        "f=hls",
+        f"hls_time={STREAM_SEGMENT_SECONDS}",
+        "hls_playlist_type=event",
+        "hls_segment_type=fmp4",
+        f"master_pl_name={STREAM_MASTER_PLAYLIST}",
+        f"hls_segment_filename={stream_path / 'segment_%05d.m4s'}"
+    ])
+    outputs = f"[{hls_options}]{stream_path / STREAM_MEDIA_PLAYLIST}|[f=mp4:movflags=+faststart]{output_path}"
+    
+    # The tee muxer needs explicit stream maps and codec headers usable by both outputs
+    args = [] if has_audio else ['-map', '0:v:0']
+    return args + [
+        '-b:v', str(int(pixel_rate * STREAM_BITS_PER_PIXEL)),
+        '-force_key_frames', f"expr:gte(t,n_forced*{STREAM_SEGMENT_SECONDS})",
+        '-flags', '+global_header',
+        '-f', 'tee', outputs
+    ]
+
+
+def get_copyable_audio_source(video_path: str, audio_codec: Optional[str]) -> Optional[str]:
+    """
+    Decide whether the original audio can be stream-copied into the MP4 output.
+    
+    Args:
+        video_path: Path to the original video file
+        audio_codec: Audio codec name from the video metadata
+    
+    Returns:
+        video_path when its audio can be copied, otherwise None
+    """
+    if not COPY_AUDIO or audio_codec is None:
+        return None
+    if audio_codec not in MP4_AUDIO_CODECS:
+        logger.warning(f"Audio codec {audio_codec} cannot be copied into MP4, overlay will have no audio")
+        return None
+    return video_path
@@ -32,8 +32,13 @@ def create_analysis_record(analysis_id: str) -> None:
         "feedback": None,
         "video_url": None,
         "error_message": None,
-        "pose_data": None,
-        "processing_info": None
+        "pose_track": None,
+        "processing_info": None,
+        "video_metadata": None,
+        "cache_key": None,
+        "overlay_status": "not_requested",
+        "overlay_file": None,
+        "overlay_error": None
     }
     logger.info(f"Created analysis record for {analysis_id}")
 
@@ -56,24 +61,94 @@ def update_analysis_status(analysis_id: str, status: str, error_message: Optiona
         logger.warning(f"Analysis {analysis_id} not found in storage")
 
 
-def update_analysis_results(analysis_id: str, pose_data: Dict[str, Any], processing_info: Dict[str, Any]) -> None:
+def update_analysis_results(analysis_id: str, pose_track: Any, processing_info: Dict[str, Any], metrics: Optional[Dict[str, Any]] = None) -> None:
     """
     Update analysis with pose detection results.
     
     Args:
         analysis_id: Unique identifier for the analysis
-        pose_data: Pose detection results
+        pose_track: Array-backed PoseTrack with the detection results
         processing_info: Processing statistics
+        metrics: Climbing metrics computed from the pose track
     """
     if analysis_id in analysis_storage:
-        analysis_storage[analysis_id]["pose_data"] = pose_data
+        analysis_storage[analysis_id]["pose_track"] = pose_track
         analysis_storage[analysis_id]["processing_info"] = processing_info
+        analysis_storage[analysis_id]["metrics"] = metrics
         analysis_storage[analysis_id]["status"] = "complete"
+        if processing_info.get("overlay_file"):
+            # Overlay was rendered during processing (fused pass or result cache)
+            analysis_storage[analysis_id]["overlay_status"] = "complete"
+            analysis_storage[analysis_id]["overlay_file"] = processing_info["overlay_file"]
         logger.info(f"Updated analysis {analysis_id} with pose data")
     else:
         logger.warning(f"Analysis {analysis_id} not found in storage")
 
 
+def update_analysis_metrics(analysis_id: str, metrics: Dict[str, Any]) -> None:
+    """
+    Store running metrics for an analysis that is still processing.
+    
+    Args:
+        analysis_id: Unique identifier for the analysis
+        metrics: Metrics for the frames detected so far
+    """
+    record = analysis_storage.get(analysis_id)
+    if record is not None and record["status"] == "processing":
+        record["metrics"] = metrics
+
+
+def set_analysis_video_metadata(analysis_id: str, video_metadata: Dict[str, Any]) -> None:
+    """
+    Cache the probed video metadata with an analysis.
+    
+    Args:
+        analysis_id: Unique identifier for the analysis
+        video_metadata: Metadata from VideoMetadata.to_dict()
+    """
+    record = analysis_storage.get(analysis_id)
+    if record is not None:
+        record["video_metadata"] = video_metadata
+    else:
+        logger.warning(f"Analysis {analysis_id} not found in storage")
+
+
+def set_analysis_cache_key(analysis_id: str, cache_key: str) -> None:
+    """
+    Remember the result cache entry an analysis was stored under or restored from.
+    
+    Args:
+        analysis_id: Unique identifier for the analysis
+        cache_key: Key from result_cache.get_cache_key()
+    """
+    record = analysis_storage.get(analysis_id)
+    if record is not None:
+        record["cache_key"] = cache_key
+    else:
+        logger.warning(f"Analysis {analysis_id} not found in storage")
+
+
+def update_overlay_status(analysis_id: str, status: str, overlay_file: Optional[str] = None, error_message: Optional[str] = None) -> None:
+    """
+    Update the overlay rendering state of an analysis, tracked separately from its status.
+    
+    Args:
+        analysis_id: Unique identifier for the analysis
+        status: New overlay status ("not_requested", "rendering", "complete", "error")
+        overlay_file: Path of the rendered overlay when status is "complete"
+        error_message: Error message if status is "error"
+    """
+    record = analysis_storage.get(analysis_id)
+    if record is None:
+        logger.warning(f"Analysis {analysis_id} not found in storage")
+        return
+    
+    record["overlay_status"] = status
+    record["overlay_file"] = overlay_file
+    record["overlay_error"] = error_message
+    logger.info(f"Updated analysis {analysis_id} overlay status to {status}")
+
+
 def get_analysis_record(analysis_id: str) -> Optional[Dict[str, Any]]:
     """
     Get analysis record by ID.
@@ -9,12 +9,14 @@ ALLOWED_EXTENSIONS = {'.mp4', '.mov', '.avi'}
 UPLOAD_DIR = Path("backend/static/uploads")
 OUTPUT_DIR = Path("backend/static/outputs")
 OVERLAY_DIR = Path("backend/static/overlays")
+CACHE_DIR = Path("backend/cache")  # Outside static/, which is served publicly; hits are copied into per-analysis files
 
 def ensure_directories_exist():
-    """Ensure upload, output, and overlay directories exist"""
+    """Ensure upload, output, overlay, and cache directories exist"""
     UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
     OVERLAY_DIR.mkdir(parents=True, exist_ok=True)
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
 def generate_analysis_id() -> str:
     """Generate a unique analysis ID"""
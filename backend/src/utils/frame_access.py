@@ -0,0 +1,409 @@
+"""
+Random frame access for CruxVision.
+
+Opening a cv2.VideoCapture and seeking for every requested frame parses the
+container and decodes from the nearest keyframe each time. Instead, each video
+gets a frame index (presentation timestamps and keyframe positions) built once
+by demuxing packets without decoding them, and a small pool keeps decoders open
+between requests. A frame then costs one seek to the keyframe before it plus
+the decode up to it, and a request just after the previous one keeps decoding
+from where that one stopped, without seeking.
+
+Frames are returned like the processing decoder (OpenCV) returns them: BGR and,
+when OpenCV applies the display matrix, already upright. The same index makes
+sequential decoding from the middle of a video (render and detection segments)
+frame-accurate, which cv2.CAP_PROP_POS_FRAMES seeks are not.
+"""
+
+import logging
+import os
+import threading
+from collections import OrderedDict
+from fractions import Fraction
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterator, Optional, Tuple
+
+import av
+import cv2
+import numpy as np
+
+from backend.src.utils.video_metadata import VideoMetadata, get_video_metadata
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Configuration
+FRAME_DECODER_POOL_SIZE = 4  # Open decoders kept between requests; the least recently used is closed
+SKIP_NONREF_MARGIN_FRAMES = 16  # Frames before the target are decoded in full; earlier non-reference frames are skipped
+
+
+class FrameIndex:
+    """
+    Presentation timestamps and keyframe positions of a video stream, in display order.
+    
+    Frame i is the i-th frame in presentation order, which is the i-th frame
+    OpenCV decodes.
+    """
+    
+    def __init__(self, pts: np.ndarray, keyframes: np.ndarray, time_base: Fraction):
+        """
+        Initialize the frame index.
+        
+        Args:
+            pts: Sorted presentation timestamp of every frame, in stream time base
+            keyframes: Sorted frame indices of the keyframes
+            time_base: Stream time base
+        """
+        self.pts = pts
+        self.keyframes = keyframes
+        self.time_base = time_base
+    
+    def __len__(self) -> int:
+        return len(self.pts)
+    
+    def keyframe_before(self, frame_index: int) -> int:
+        """
+        Get the keyframe decoding has to start from to reach a frame.
+        
+        Args:
+            frame_index: Index of the frame
+        
+        Returns:
+            Index of the last keyframe at or before the frame, or 0 if there is none
+        """
+        position = np.searchsorted(self.keyframes, frame_index, side="right") - 1
+        return int(self.keyframes[position]) if position >= 0 else 0
+
+
+def build_frame_index(video_path: str) -> FrameIndex:
+    """
+    Build the frame index of a video by demuxing its packets, without decoding.
+    
+    Args:
+        video_path: Path to the video file
+    
+    Returns:
+        FrameIndex for the first video stream
+    
+    Raises:
+        ValueError: If the file cannot be opened or its packets have no timestamps
+    """
+    pts = []
+    keyframe_flags = []
+    try:
+        with av.open(video_path) as container:
+            if not container.streams.video:
+                raise ValueError(f"No video stream in {video_path}")
+            stream = container.streams.video[0]
+            time_base = Fraction(stream.time_base)
+            
+            for packet in container.demux(stream):
+                # The final flush packet carries no data
+                if packet.pts is None:
+                    continue
+                pts.append(packet.pts)
+                keyframe_flags.append(packet.is_keyframe)
+    except av.FFmpegError as e:
+        raise ValueError(f"Cannot open video file {video_path}: {str(e)}")
+    
+    if not pts:
+        raise ValueError(f"No timestamped video packets in {video_path}")
+    
+    # Packets are in decode order; B-frames make that differ from display order
+    order = np.argsort(pts, kind="stable")
+    sorted_pts = np.asarray(pts, dtype=np.int64)[order]
+    keyframes = np.flatnonzero(np.asarray(keyframe_flags, dtype=bool)[order])
+    
+    logger.info(f"Frame index built: {len(sorted_pts)} frames, {len(keyframes)} keyframes -> {video_path}")
+    return FrameIndex(sorted_pts, keyframes, time_base)
+
+
+@lru_cache(maxsize=64)
+def build_frame_index_cached(video_path: str, mtime_ns: int, size: int) -> FrameIndex:
+    """Index a file once per process; mtime and size invalidate the entry if it changes."""
+    return build_frame_index(video_path)
+
+
+def get_frame_index(video_path: str) -> FrameIndex:
+    """
+    Get the frame index of a video, building it on first use.
+    
+    Args:
+        video_path: Path to the video file
+    
+    Returns:
+        FrameIndex for the file
+    
+    Raises:
+        ValueError: If the file does not exist or cannot be indexed
+    """
+    if not Path(video_path).exists():
+        raise ValueError(f"Video file not found: {video_path}")
+    stat = os.stat(video_path)
+    return build_frame_index_cached(str(video_path), stat.st_mtime_ns, stat.st_size)
+
+
+class PooledDecoder:
+    """
+    An open decoder for one video that remembers where it stopped.
+    
+    Only one thread uses a decoder at a time (see lock).
+    """
+    
+    def __init__(self, video_path: str):
+        """
+        Open the video for decoding.
+        
+        Args:
+            video_path: Path to the video file
+        
+        Raises:
+            av.FFmpegError: If the file cannot be opened
+        """
+        self.video_path = video_path
+        self.container = av.open(video_path)
+        self.stream = self.container.streams.video[0]
+        # Frame threading delays the first frame after every seek; slice threading does not
+        self.stream.thread_type = "SLICE"
+        self.frames = None  # Decode iterator, continued by the next read when possible
+        self.last_pts = None  # Timestamp of the last frame taken from the iterator
+        self.closed = False  # Set when the pool evicts the decoder
+        self.lock = threading.Lock()
+    
+    def read(self, frame_index: FrameIndex, index: int, skip_nonref: bool = True) -> Optional[av.VideoFrame]:
+        """
+        Decode the frame at an index.
+        
+        On the way from the keyframe to the target, frames no other frame refers to
+        are skipped until SKIP_NONREF_MARGIN_FRAMES before the target.
+        
+        Args:
+            frame_index: Frame index of the video
+            index: Index of the frame to decode
+            skip_nonref: Whether non-reference frames may be skipped while catching up
+        
+        Returns:
+            Decoded frame, or None if decoding ended before reaching it
+        """
+        target_pts = int(frame_index.pts[index])
+        keyframe_pts = int(frame_index.pts[frame_index.keyframe_before(index)])
+        full_decode_pts = int(frame_index.pts[max(index - SKIP_NONREF_MARGIN_FRAMES, 0)])
+        
+        # Continuing is never slower than seeking when no keyframe lies between the
+        # last decoded frame and the target
+        if self.frames is None or self.last_pts is None or not keyframe_pts <= self.last_pts < target_pts:
+            self.container.seek(keyframe_pts, stream=self.stream)
+            self.frames = self.container.decode(self.stream)
+            self.last_pts = None
+        
+        codec_context = self.stream.codec_context
+        skipping = skip_nonref and (self.last_pts is None or self.last_pts < full_decode_pts) and keyframe_pts < full_decode_pts
+        codec_context.skip_frame = "NONREF" if skipping else "DEFAULT"
+        
+        try:
+            for frame in self.frames:
+                if frame.pts is None:
+                    continue
+                self.last_pts = frame.pts
+                if frame.pts >= full_decode_pts:
+                    codec_context.skip_frame = "DEFAULT"
+                if frame.pts >= target_pts:
+                    if frame.pts > target_pts and skipping:
+                        # The target may itself have been skipped; decode the stretch again in full
+                        self.frames = None
+                        return self.read(frame_index, index, skip_nonref=False)
+                    return frame
+        finally:
+            codec_context.skip_frame = "DEFAULT"
+        
+        self.frames = None
+        return None
+    
+    def close(self) -> None:
+        """Close the container."""
+        self.frames = None
+        self.closed = True
+        self.container.close()
+
+
+# Open decoders by (path, mtime, size), most recently used last
+decoder_pool: "OrderedDict[Tuple[str, int, int], PooledDecoder]" = OrderedDict()
+decoder_pool_lock = threading.Lock()
+
+
+def get_pooled_decoder(video_path: str) -> PooledDecoder:
+    """
+    Get an open decoder for a video from the pool, opening one if needed.
+    
+    Args:
+        video_path: Path to the video file
+    
+    Returns:
+        PooledDecoder for the file
+    
+    Raises:
+        ValueError: If the file cannot be opened
+    """
+    stat = os.stat(video_path)
+    key = (str(video_path), stat.st_mtime_ns, stat.st_size)
+    evicted = []
+    
+    with decoder_pool_lock:
+        decoder = decoder_pool.get(key)
+        if decoder is not None:
+            decoder_pool.move_to_end(key)
+        else:
+            try:
+                decoder = PooledDecoder(str(video_path))
+            except av.FFmpegError as e:
+                raise ValueError(f"Cannot open video file {video_path}: {str(e)}")
+            decoder_pool[key] = decoder
+            while len(decoder_pool) > FRAME_DECODER_POOL_SIZE:
+                evicted.append(decoder_pool.popitem(last=False)[1])
+    
+    # Wait for in-flight reads outside the pool lock before closing
+    for old_decoder in evicted:
+        with old_decoder.lock:
+            old_decoder.close()
+    return decoder
+
+
+def close_frame_decoders() -> None:
+    """Close every pooled decoder."""
+    with decoder_pool_lock:
+        decoders = list(decoder_pool.values())
+        decoder_pool.clear()
+    for decoder in decoders:
+        with decoder.lock:
+            decoder.close()
+
+
+def orient_frame(image: np.ndarray, rotation: int) -> np.ndarray:
+    """
+    Apply a display-matrix rotation to decoded pixels, the way OpenCV does.
+    
+    Args:
+        image: Decoded BGR image
+        rotation: Display-matrix rotation in degrees (0, 90, 180, 270)
+    
+    Returns:
+        Upright image
+    """
+    if rotation == 90:
+        return cv2.rotate(image, cv2.ROTATE_90_COUNTERCLOCKWISE)
+    if rotation == 180:
+        return cv2.rotate(image, cv2.ROTATE_180)
+    if rotation == 270:
+        return cv2.rotate(image, cv2.ROTATE_90_CLOCKWISE)
+    return image
+
+
+def read_frame(video_path: str, frame_index: int, analysis_id: Optional[str] = None) -> Optional[np.ndarray]:
+    """
+    Read one frame of a video through the shared index and decoder pool.
+    
+    Args:
+        video_path: Path to the video file
+        frame_index: Index of the frame to read
+        analysis_id: Analysis the video belongs to; its record caches the metadata
+    
+    Returns:
+        BGR frame oriented like the frames used for processing, or None if the
+        index is out of range or the frame cannot be decoded
+    
+    Raises:
+        ValueError: If the file does not exist or cannot be opened
+    """
+    index = get_frame_index(video_path)
+    if not 0 <= frame_index < len(index):
+        return None
+    
+    metadata = get_video_metadata(video_path, analysis_id)
+    # Rotation OpenCV applies while decoding, which PyAV leaves to the caller
+    applied_rotation = (metadata.rotation - metadata.decoded_rotation) % 360
+    
+    while True:
+        decoder = get_pooled_decoder(video_path)
+        with decoder.lock:
+            # Another request may have evicted the decoder before the lock was taken
+            if decoder.closed:
+                continue
+            try:
+                frame = decoder.read(index, frame_index)
+            except av.FFmpegError as e:
+                logger.warning(f"Decoding frame {frame_index} of {video_path} failed: {str(e)}")
+                decoder.frames = None
+                return None
+            if frame is None:
+                return None
+            image = frame.to_ndarray(format="bgr24")
+            break
+    
+    return orient_frame(image, applied_rotation)
+
+
+def iter_frames(video_path: str, start_frame: int = 0, end_frame: Optional[int] = None, metadata: Optional[VideoMetadata] = None) -> Iterator[Tuple[int, np.ndarray]]:
+    """
+    Decode consecutive frames of a video, starting at an exact frame index.
+    
+    From the start of the video this is a plain OpenCV read loop, the decoder that
+    pose frame indices come from. Later starts cannot seek with
+    cv2.CAP_PROP_POS_FRAMES: it converts the frame number to a timestamp through the
+    average frame rate and lands a few frames off in variable frame rate (phone)
+    video. Instead decoding starts at the keyframe before start_frame, and each
+    frame is numbered by looking up its presentation timestamp in the frame index.
+    
+    Args:
+        video_path: Path to the video file
+        start_frame: Index of the first frame to yield
+        end_frame: Index to stop before, or None to read until the end of the video
+        metadata: Metadata of the video, probed when None
+    
+    Yields:
+        Tuple of (frame_index, frame), frames oriented like read_frame() returns them
+    
+    Raises:
+        ValueError: If the file cannot be opened or indexed
+    """
+    if start_frame <= 0:
+        cap = cv2.VideoCapture(video_path)
+        if not cap.isOpened():
+            raise ValueError(f"Cannot open video file: {video_path}")
+        try:
+            frame_index = 0
+            while end_frame is None or frame_index < end_frame:
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                yield frame_index, frame
+                frame_index += 1
+        finally:
+            cap.release()
+        return
+    
+    index = get_frame_index(video_path)
+    if start_frame >= len(index):
+        return
+    
+    if metadata is None:
+        metadata = get_video_metadata(video_path)
+    applied_rotation = (metadata.rotation - metadata.decoded_rotation) % 360
+    
+    try:
+        with av.open(video_path) as container:
+            stream = container.streams.video[0]
+            stream.thread_type = "AUTO"
+            container.seek(int(index.pts[index.keyframe_before(start_frame)]), stream=stream)
+            
+            for frame in container.decode(stream):
+                if frame.pts is None:
+                    continue
+                frame_index = int(np.searchsorted(index.pts, frame.pts))
+                if frame_index < start_frame:
+                    continue  # Between the keyframe and the start
+                if end_frame is not None and frame_index >= end_frame:
+                    break
+                yield frame_index, orient_frame(frame.to_ndarray(format="bgr24"), applied_rotation)
+    except av.FFmpegError as e:
+        raise ValueError(f"Cannot decode video file {video_path}: {str(e)}")
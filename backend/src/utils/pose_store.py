@@ -0,0 +1,320 @@
+"""
+Binary pose data storage for CruxVision.
+
+This module writes pose tracks to a fixed-layout binary file that can be
+memory-mapped: an 8-byte magic, a small JSON header describing each array, then
+the raw arrays at 64-byte aligned offsets. Reading any frame is O(1) and does not
+parse the rest of the file. An optional quantized mode stores coordinates and
+visibility as int16 for files roughly half the size.
+"""
+
+import json
+import logging
+import struct
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+from backend.src.utils.file_utils import OUTPUT_DIR
+from backend.src.pipeline.pose_track import PoseTrack, LANDMARK_COUNT, LANDMARK_FIELDS, VISIBILITY
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+POSE_STORE_MAGIC = b"CRUXPOSE"
+POSE_STORE_VERSION = 1
+POSE_STORE_ALIGNMENT = 64
+
+# Quantization scales: coordinates cover roughly +/-4.0 in normalized units
+# (about 0.13 px resolution at 1080p); visibility covers 0-1
+QUANTIZED_COORDINATE_SCALE = 8192.0
+QUANTIZED_VISIBILITY_SCALE = 32767.0
+
+# Fixed prefix: magic, version, header length
+PREFIX_FORMAT = "<8sII"
+PREFIX_SIZE = struct.calcsize(PREFIX_FORMAT)
+
+
+def get_pose_store_path(analysis_id: str) -> Path:
+    """Get the binary pose data path for an analysis"""
+    return OUTPUT_DIR / f"pose_data_{analysis_id}.pose"
+
+
+def align_offset(offset: int) -> int:
+    """Round an offset up to the next POSE_STORE_ALIGNMENT boundary"""
+    return -(-offset // POSE_STORE_ALIGNMENT) * POSE_STORE_ALIGNMENT
+
+
+def quantize_landmarks(landmarks: np.ndarray) -> np.ndarray:
+    """
+    Convert float landmarks to int16.
+    
+    Args:
+        landmarks: (frames, 33, 4) float array of x, y, z, visibility
+    
+    Returns:
+        (frames, 33, 4) int16 array
+    """
+    scales = np.full(len(LANDMARK_FIELDS), QUANTIZED_COORDINATE_SCALE, dtype=np.float32)
+    scales[VISIBILITY] = QUANTIZED_VISIBILITY_SCALE
+    int16_info = np.iinfo(np.int16)
+    return np.clip(np.rint(landmarks * scales), int16_info.min, int16_info.max).astype(np.int16)
+
+
+def dequantize_landmarks(quantized: np.ndarray) -> np.ndarray:
+    """
+    Convert int16 landmarks back to float32.
+    
+    Args:
+        quantized: (..., 4) int16 array from quantize_landmarks()
+    
+    Returns:
+        Float32 array of the same shape
+    """
+    scales = np.full(len(LANDMARK_FIELDS), 1.0 / QUANTIZED_COORDINATE_SCALE, dtype=np.float32)
+    scales[VISIBILITY] = 1.0 / QUANTIZED_VISIBILITY_SCALE
+    return quantized.astype(np.float32) * scales
+
+
+def get_track_arrays(pose_track: PoseTrack, quantized: bool) -> Dict[str, np.ndarray]:
+    """
+    Convert a pose track's arrays to their stored dtypes.
+    
+    Args:
+        pose_track: Pose track to convert
+        quantized: Store landmarks as int16 instead of float32
+    
+    Returns:
+        Array name -> array, in file order
+    """
+    frame_count = len(pose_track)
+    landmarks = pose_track.landmarks[:frame_count]
+    
+    return {
+        "landmarks": quantize_landmarks(landmarks) if quantized else landmarks.astype(np.float32, copy=False),
+        "pose_detected": pose_track.pose_detected[:frame_count].astype(np.uint8),
+        "overall_confidence": pose_track.overall_confidence[:frame_count].astype(np.float32, copy=False),
+        "interpolated": pose_track.interpolated[:frame_count].astype(np.uint8),
+        "frame_present": pose_track.frame_present[:frame_count].astype(np.uint8)
+    }
+
+
+def build_pose_store_header(frame_count: int, quantized: bool, errors: Dict[int, str], metadata: Optional[Dict[str, Any]]) -> Tuple[Dict[str, Any], bytes]:
+    """
+    Lay out a pose store file and encode its header.
+    
+    Args:
+        frame_count: Number of frames in the file
+        quantized: Whether landmarks are stored as int16
+        errors: Frame index -> detection error message
+        metadata: JSON-serializable extras kept in the header
+    
+    Returns:
+        Tuple of (header, encoded header bytes); header["arrays"] holds each array's
+        offset, dtype and shape, and header["file_size"] (not stored in the file) the
+        total file size
+    """
+    array_layouts = get_track_arrays(PoseTrack(), quantized)
+    
+    header = {
+        "frame_count": frame_count,
+        "landmark_count": LANDMARK_COUNT,
+        "fields": list(LANDMARK_FIELDS),
+        "quantized": quantized,
+        "errors": {str(frame_index): message for frame_index, message in errors.items()},
+        "metadata": metadata or {},
+        "arrays": {}
+    }
+    
+    # Offsets depend on the header length, which depends on the offsets; lay out
+    # the arrays after a header size estimate and grow it until it fits
+    header_capacity = 1024
+    while True:
+        offset = align_offset(PREFIX_SIZE + header_capacity)
+        for name, empty_array in array_layouts.items():
+            shape = (frame_count,) + empty_array.shape[1:]
+            header["arrays"][name] = {"offset": offset, "dtype": empty_array.dtype.str, "shape": list(shape)}
+            offset = align_offset(offset + int(np.prod(shape)) * empty_array.dtype.itemsize)
+        header_bytes = json.dumps(header).encode("utf-8")
+        if len(header_bytes) <= header_capacity:
+            break
+        header_capacity = align_offset(len(header_bytes))
+    
+    header["file_size"] = offset
+    return header, header_bytes
+
+
+def write_pose_store(pose_track: PoseTrack, path: Path, metadata: Optional[Dict[str, Any]] = None, quantized: bool = False) -> str:
+    """
+    Write a pose track to a binary pose store file.
+    
+    Args:
+        pose_track: Pose track to save
+        path: Output file path
+        metadata: JSON-serializable extras kept in the header (video info, statistics, ...)
+        quantized: Store landmarks as int16 instead of float32
+    
+    Returns:
+        Path to the saved file
+    """
+    frame_count = len(pose_track)
+    arrays = get_track_arrays(pose_track, quantized)
+    header, header_bytes = build_pose_store_header(frame_count, quantized, pose_track.errors, metadata)
+    
+    path = Path(path)
+    with open(path, "wb") as f:
+        f.write(struct.pack(PREFIX_FORMAT, POSE_STORE_MAGIC, POSE_STORE_VERSION, len(header_bytes)))
+        f.write(header_bytes)
+        for name, array in arrays.items():
+            f.seek(header["arrays"][name]["offset"])
+            f.write(np.ascontiguousarray(array).tobytes())
+    
+    logger.info(f"Pose store saved to: {path} ({frame_count} frames, quantized={quantized})")
+    return str(path)
+
+
+def concatenate_pose_stores(chunk_files: List[Tuple[int, Path]], path: Path, metadata: Optional[Dict[str, Any]] = None, quantized: bool = False) -> str:
+    """
+    Combine pose store chunks into one pose store file.
+    
+    Chunks are copied one at a time, so memory use is bounded by the largest chunk
+    rather than the whole video. Frames not covered by any chunk are stored as missing.
+    
+    Args:
+        chunk_files: (start_frame, path) pairs; each chunk's frame 0 is start_frame in the output
+        path: Output file path
+        metadata: JSON-serializable extras kept in the header
+        quantized: Store landmarks as int16 instead of float32
+    
+    Returns:
+        Path to the saved file
+    """
+    readers = [(start_frame, PoseStoreReader(chunk_file)) for start_frame, chunk_file in chunk_files]
+    frame_count = max((start_frame + len(reader) for start_frame, reader in readers), default=0)
+    
+    errors = {}
+    for start_frame, reader in readers:
+        errors.update({start_frame + int(frame_index): message for frame_index, message in reader.header.get("errors", {}).items()})
+    
+    header, header_bytes = build_pose_store_header(frame_count, quantized, errors, metadata)
+    
+    path = Path(path)
+    with open(path, "wb") as f:
+        f.write(struct.pack(PREFIX_FORMAT, POSE_STORE_MAGIC, POSE_STORE_VERSION, len(header_bytes)))
+        f.write(header_bytes)
+        # Preallocate: gaps between chunks read back as zeros, i.e. missing frames
+        f.truncate(header["file_size"])
+        
+        for start_frame, reader in readers:
+            for name, array in get_track_arrays(reader.to_pose_track(), quantized).items():
+                frame_bytes = array.nbytes // len(array) if len(array) else 0
+                f.seek(header["arrays"][name]["offset"] + start_frame * frame_bytes)
+                f.write(np.ascontiguousarray(array).tobytes())
+    
+    logger.info(f"Pose store assembled from {len(readers)} chunks: {path} ({frame_count} frames)")
+    return str(path)
+
+
+def read_pose_store_header(path: Path) -> Dict[str, Any]:
+    """
+    Read only the header of a binary pose store file.
+    
+    Args:
+        path: Pose store file path
+    
+    Returns:
+        Header dictionary
+    
+    Raises:
+        FileNotFoundError: If the file does not exist
+        ValueError: If the file is not a pose store or has an unsupported version
+    """
+    with open(path, "rb") as f:
+        magic, version, header_length = struct.unpack(PREFIX_FORMAT, f.read(PREFIX_SIZE))
+        if magic != POSE_STORE_MAGIC:
+            raise ValueError(f"Not a pose store file: {path}")
+        if version != POSE_STORE_VERSION:
+            raise ValueError(f"Unsupported pose store version {version}: {path}")
+        return json.loads(f.read(header_length).decode("utf-8"))
+
+
+class PoseStoreReader:
+    """
+    Memory-mapped reader for binary pose store files.
+    
+    Arrays are mapped read-only, so opening a store costs only the header parse
+    and looking up a frame touches just that frame's bytes.
+    """
+    
+    def __init__(self, path: Path):
+        """
+        Open a pose store file.
+        
+        Args:
+            path: Pose store file path
+        """
+        self.path = Path(path)
+        self.header = read_pose_store_header(self.path)
+        self.frame_count = self.header["frame_count"]
+        self.quantized = self.header["quantized"]
+        self.metadata = self.header.get("metadata", {})
+        self.arrays = {
+            name: np.memmap(self.path, dtype=np.dtype(layout["dtype"]), mode="r", offset=layout["offset"], shape=tuple(layout["shape"]))
+            if np.prod(layout["shape"]) > 0 else np.zeros(tuple(layout["shape"]), dtype=np.dtype(layout["dtype"]))
+            for name, layout in self.header["arrays"].items()
+        }
+    
+    def __len__(self) -> int:
+        return self.frame_count
+    
+    def get_landmarks(self, frame_index: int) -> Optional[np.ndarray]:
+        """
+        Read one frame's landmarks.
+        
+        Args:
+            frame_index: Frame index to read
+        
+        Returns:
+            (33, 4) float32 array, or None if the frame has no pose
+        """
+        if not (0 <= frame_index < self.frame_count) or not self.arrays["pose_detected"][frame_index]:
+            return None
+        
+        landmarks = self.arrays["landmarks"][frame_index]
+        return dequantize_landmarks(landmarks) if self.quantized else np.asarray(landmarks)
+    
+    def to_pose_track(self) -> PoseTrack:
+        """
+        Build a PoseTrack from the store.
+        
+        Float32 stores keep the landmark array memory-mapped; quantized stores are
+        dequantized into memory.
+        
+        Returns:
+            PoseTrack with all stored frames
+        """
+        pose_track = PoseTrack()
+        landmarks = self.arrays["landmarks"]
+        pose_track.landmarks = dequantize_landmarks(landmarks) if self.quantized else landmarks
+        pose_track.pose_detected = self.arrays["pose_detected"].astype(bool)
+        pose_track.overall_confidence = np.asarray(self.arrays["overall_confidence"])
+        pose_track.interpolated = self.arrays["interpolated"].astype(bool)
+        pose_track.frame_present = self.arrays["frame_present"].astype(bool)
+        pose_track.errors = {int(frame_index): message for frame_index, message in self.header.get("errors", {}).items()}
+        pose_track.frame_count = self.frame_count
+        return pose_track
+
+
+def load_pose_store(path: Path) -> Tuple[PoseTrack, Dict[str, Any]]:
+    """
+    Load a pose track and its metadata from a binary pose store file.
+    
+    Args:
+        path: Pose store file path
+    
+    Returns:
+        Tuple of (pose_track, metadata)
+    """
+    reader = PoseStoreReader(path)
+    return reader.to_pose_track(), reader.metadata
@@ -0,0 +1,224 @@
+"""
+Content-addressed result cache for CruxVision.
+
+Coaches often upload the same clip more than once. Results are cached on disk under
+a key built from the upload's content hash and a fingerprint of the processing
+settings, so an identical upload processed with identical settings reuses the stored
+pose data and overlay video instead of running MediaPipe again. The cache has a
+size bound and evicts the least recently used entries.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+from backend.src.utils.file_utils import CACHE_DIR
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Configuration
+RESULT_CACHE_ENABLED = True
+MAX_CACHE_SIZE_BYTES = 2 * 1024 * 1024 * 1024  # 2GB across all cached entries
+CACHE_FORMAT_VERSION = 1  # Bump when the cached artifact layout changes
+
+ENTRY_FILE = "entry.json"
+POSE_FILE = "pose_data.pose"
+OVERLAY_FILE = "overlay.mp4"
+
+
+def get_settings_fingerprint(settings: Dict[str, Any]) -> str:
+    """
+    Hash processing settings into a short, stable fingerprint.
+    
+    Args:
+        settings: JSON-serializable processing settings
+    
+    Returns:
+        16-character hex fingerprint
+    """
+    encoded = json.dumps({"cache_format": CACHE_FORMAT_VERSION, **settings}, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+def get_cache_key(content_hash: str, settings: Dict[str, Any]) -> str:
+    """
+    Build the cache key for an upload processed with the given settings.
+    
+    Args:
+        content_hash: SHA-256 hex digest of the uploaded file
+        settings: Processing settings that affect the results
+    
+    Returns:
+        Cache key (safe to use as a directory name)
+    """
+    return f"{content_hash}_{get_settings_fingerprint(settings)}"
+
+
+def copy_artifact(source: Path, destination: Path) -> None:
+    """
+    Copy an artifact into or out of the cache.
+    
+    Files are copied rather than hard-linked because the pipeline rewrites its
+    output paths in place; a shared inode would let a re-render change a cache entry.
+    """
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    shutil.copyfile(source, destination)
+
+
+def lookup_cached_result(cache_key: str) -> Optional[Dict[str, Any]]:
+    """
+    Look up a cache entry and mark it as recently used.
+    
+    Args:
+        cache_key: Key from get_cache_key()
+    
+    Returns:
+        Entry dictionary with "pose_file", "overlay_file" (or None) and "metadata",
+        or None on a cache miss
+    """
+    entry_dir = CACHE_DIR / cache_key
+    entry_file = entry_dir / ENTRY_FILE
+    
+    if not entry_file.exists() or not (entry_dir / POSE_FILE).exists():
+        return None
+    
+    try:
+        with open(entry_file, 'r') as f:
+            metadata = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        logger.warning(f"Discarding unreadable cache entry {cache_key}: {str(e)}")
+        shutil.rmtree(entry_dir, ignore_errors=True)
+        return None
+    
+    # Entry file mtime is the LRU timestamp
+    os.utime(entry_file)
+    
+    overlay_file = entry_dir / OVERLAY_FILE
+    return {
+        "pose_file": entry_dir / POSE_FILE,
+        "overlay_file": overlay_file if overlay_file.exists() else None,
+        "metadata": metadata
+    }
+
+
+def store_cached_result(cache_key: str, pose_file: str, overlay_file: Optional[str], metadata: Dict[str, Any]) -> None:
+    """
+    Add an analysis's artifacts to the cache, then enforce the size bound.
+    
+    Cache failures are logged and never fail the analysis.
+    
+    Args:
+        cache_key: Key from get_cache_key()
+        pose_file: Path to the binary pose store
+        overlay_file: Path to the overlay video, or None if none was rendered
+        metadata: JSON-serializable data to restore with the entry (video info, statistics)
+    """
+    entry_dir = CACHE_DIR / cache_key
+    staging_dir = CACHE_DIR / f".{cache_key}.{os.getpid()}.tmp"
+    
+    try:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        staging_dir.mkdir(parents=True)
+        
+        copy_artifact(Path(pose_file), staging_dir / POSE_FILE)
+        if overlay_file and Path(overlay_file).exists():
+            copy_artifact(Path(overlay_file), staging_dir / OVERLAY_FILE)
+        
+        # Entry file is written last: an entry without it is incomplete
+        with open(staging_dir / ENTRY_FILE, 'w') as f:
+            json.dump(metadata, f)
+        
+        shutil.rmtree(entry_dir, ignore_errors=True)
+        staging_dir.rename(entry_dir)
+        logger.info(f"Cached results under {cache_key}")
+    
+    except Exception as e:
+        logger.warning(f"Failed to cache results under {cache_key}: {str(e)}")
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        return
+    
+    evict_cache_entries()
+
+
+def attach_cached_overlay(cache_key: str, overlay_file: str) -> bool:
+    """
+    Add an overlay rendered after its analysis was cached to the cache entry.
+    
+    With lazy overlay rendering the entry is stored before any overlay exists;
+    attaching it later lets re-uploads of the clip reuse the overlay as well.
+    Cache failures are logged and never fail the render.
+    
+    Args:
+        cache_key: Key from get_cache_key()
+        overlay_file: Path to the rendered overlay video
+    
+    Returns:
+        True if the overlay was added to the entry
+    """
+    entry_dir = CACHE_DIR / cache_key
+    if not (entry_dir / ENTRY_FILE).exists() or (entry_dir / OVERLAY_FILE).exists():
+        return False
+    
+    staging_file = entry_dir / f".{OVERLAY_FILE}.{os.getpid()}.tmp"
+    try:
+        copy_artifact(Path(overlay_file), staging_file)
+        # Renamed into place so a lookup never sees a partial overlay
+        os.replace(staging_file, entry_dir / OVERLAY_FILE)
+        logger.info(f"Cached overlay under {cache_key}")
+    
+    except Exception as e:
+        logger.warning(f"Failed to cache overlay under {cache_key}: {str(e)}")
+        staging_file.unlink(missing_ok=True)
+        return False
+    
+    evict_cache_entries()
+    return True
+
+
+def get_entry_size(entry_dir: Path) -> int:
+    """Total size in bytes of the files in a cache entry."""
+    return sum(path.stat().st_size for path in entry_dir.iterdir() if path.is_file())
+
+
+def evict_cache_entries(max_size_bytes: Optional[int] = None) -> int:
+    """
+    Delete least recently used cache entries until the cache fits its size bound.
+    
+    Args:
+        max_size_bytes: Size bound; defaults to MAX_CACHE_SIZE_BYTES
+    
+    Returns:
+        Number of entries evicted
+    """
+    if max_size_bytes is None:
+        max_size_bytes = MAX_CACHE_SIZE_BYTES
+    
+    if not CACHE_DIR.exists():
+        return 0
+    
+    entries = []
+    for entry_dir in CACHE_DIR.iterdir():
+        if not entry_dir.is_dir() or entry_dir.name.startswith("."):
+            continue
+        entry_file = entry_dir / ENTRY_FILE
+        last_used = entry_file.stat().st_mtime if entry_file.exists() else 0.0
+        entries.append((last_used, get_entry_size(entry_dir), entry_dir))
+    
+    total_size = sum(size for _, size, _ in entries)
+    evicted = 0
+    
+    for last_used, size, entry_dir in sorted(entries, key=lambda entry: entry[0]):
+        if total_size <= max_size_bytes:
+            break
+        shutil.rmtree(entry_dir, ignore_errors=True)
+        total_size -= size
+        evicted += 1
+        logger.info(f"Evicted cache entry {entry_dir.name} (last used {time.ctime(last_used)})")
+    
+    return evicted
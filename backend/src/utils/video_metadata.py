@@ -0,0 +1,214 @@
+"""
+Video metadata probe for CruxVision.
+
+Every stage needs the same facts about an upload: frame size, exact frame rate,
+frame count, orientation and audio codec. They are read once, in-process with
+PyAV, when the video is uploaded and cached with the analysis record, so later
+stages neither start ffprobe subprocesses nor reopen the container just to read
+properties.
+"""
+
+import logging
+import os
+from fractions import Fraction
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+import av
+import cv2
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class VideoMetadata:
+    """
+    Properties of a video file, as seen by the OpenCV decoder used for processing.
+    
+    width and height are the size of the frames OpenCV decodes: recent OpenCV
+    builds apply the display matrix themselves (CAP_PROP_ORIENTATION_AUTO), so for
+    rotated phone videos these are the upright dimensions. decoded_rotation is the
+    rotation those frames still need for display (0 when OpenCV already applied it).
+    """
+    
+    def __init__(self, width: int, height: int, frame_rate: Fraction, total_frames: int, duration: float, rotation: int, decoded_rotation: int, video_codec: str, audio_codec: Optional[str]):
+        """
+        Initialize video metadata.
+        
+        Args:
+            width: Decoded frame width in pixels
+            height: Decoded frame height in pixels
+            frame_rate: Exact average frame rate
+            total_frames: Number of frames in the video stream
+            duration: Duration in seconds
+            rotation: Display-matrix rotation of the source (0, 90, 180, 270)
+            decoded_rotation: Rotation decoded frames still need for display
+            video_codec: Video codec name
+            audio_codec: Audio codec name, or None if the video has no audio
+        """
+        self.width = width
+        self.height = height
+        self.frame_rate = frame_rate
+        self.total_frames = total_frames
+        self.duration = duration
+        self.rotation = rotation
+        self.decoded_rotation = decoded_rotation
+        self.video_codec = video_codec
+        self.audio_codec = audio_codec
+    
+    @property
+    def fps(self) -> float:
+        """Frame rate as a float."""
+        return float(self.frame_rate)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert to a JSON-serializable dictionary for the analysis record.
+        
+        Returns:
+            Dictionary of metadata; the frame rate is stored as "num/den"
+        """
+        return {
+            "width": self.width,
+            "height": self.height,
+            "frame_rate": f"{self.frame_rate.numerator}/{self.frame_rate.denominator}",
+            "total_frames": self.total_frames,
+            "duration": self.duration,
+            "rotation": self.rotation,
+            "decoded_rotation": self.decoded_rotation,
+            "video_codec": self.video_codec,
+            "audio_codec": self.audio_codec
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "VideoMetadata":
+        """
+        Rebuild metadata stored with to_dict().
+        
+        Args:
+            data: Dictionary from to_dict()
+        
+        Returns:
+            VideoMetadata instance
+        """
+        return cls(
+            data["width"],
+            data["height"],
+            Fraction(data["frame_rate"]),
+            data["total_frames"],
+            data["duration"],
+            data["rotation"],
+            data["decoded_rotation"],
+            data["video_codec"],
+            data["audio_codec"]
+        )
+
+
+def normalize_rotation(rotation: float) -> int:
+    """
+    Normalize a display-matrix rotation to 0, 90, 180 or 270 degrees.
+    
+    Args:
+        rotation: Rotation in degrees, possibly negative
+    
+    Returns:
+        Normalized rotation; unexpected angles are treated as 0
+    """
+    rotation = int(round(rotation)) % 360
+    if rotation not in [0, 90, 180, 270]:
+        logger.warning(f"Unexpected rotation angle {rotation}, defaulting to 0")
+        return 0
+    return rotation
+
+
+def probe_video_metadata(video_path: str) -> VideoMetadata:
+    """
+    Read video metadata in-process with PyAV.
+    
+    Only the first frame is decoded, to read its display matrix.
+    
+    Args:
+        video_path: Path to the video file
+    
+    Returns:
+        VideoMetadata for the file
+    
+    Raises:
+        ValueError: If the file does not exist or has no readable video stream
+    """
+    if not Path(video_path).exists():
+        raise ValueError(f"Video file not found: {video_path}")
+    
+    try:
+        with av.open(video_path) as container:
+            if not container.streams.video:
+                raise ValueError(f"No video stream in {video_path}")
+            stream = container.streams.video[0]
+            
+            frame_rate = Fraction(stream.average_rate or stream.guessed_rate or 30)
+            if stream.duration is not None and stream.time_base is not None:
+                duration = float(stream.duration * stream.time_base)
+            else:
+                duration = container.duration / av.time_base if container.duration else 0.0
+            total_frames = stream.frames or int(round(duration * frame_rate))
+            
+            first_frame = next(container.decode(stream), None)
+            rotation = normalize_rotation(first_frame.rotation) if first_frame is not None else 0
+            
+            width, height = stream.codec_context.width, stream.codec_context.height
+            video_codec = stream.codec_context.name
+            audio_codec = container.streams.audio[0].codec_context.name if container.streams.audio else None
+    except av.FFmpegError as e:
+        raise ValueError(f"Cannot open video file {video_path}: {str(e)}")
+    
+    decoded_rotation = rotation
+    if rotation:
+        # Only rotated videos depend on whether OpenCV applies the display matrix
+        cap = cv2.VideoCapture(video_path)
+        if cap.get(cv2.CAP_PROP_ORIENTATION_AUTO) > 0:
+            decoded_rotation = 0
+            if rotation in [90, 270]:
+                width, height = height, width
+        cap.release()
+    
+    metadata = VideoMetadata(width, height, frame_rate, total_frames, duration, rotation, decoded_rotation, video_codec, audio_codec)
+    logger.info(f"Video metadata: {width}x{height}, {total_frames} frames @ {frame_rate} fps, {duration:.2f}s, rotation {rotation}, audio {audio_codec}")
+    return metadata
+
+
+@lru_cache(maxsize=64)
+def probe_video_metadata_cached(video_path: str, mtime_ns: int, size: int) -> VideoMetadata:
+    """Probe a file once per process; mtime and size invalidate the entry if it changes."""
+    return probe_video_metadata(video_path)
+
+
+def get_video_metadata(video_path: str, analysis_id: Optional[str] = None) -> VideoMetadata:
+    """
+    Get metadata for a video, reusing the copy cached with the analysis record.
+    
+    Args:
+        video_path: Path to the video file
+        analysis_id: Analysis the video belongs to; its record caches the metadata
+    
+    Returns:
+        VideoMetadata for the file
+    
+    Raises:
+        ValueError: If the file cannot be probed
+    """
+    # Import here to avoid circular imports
+    from backend.src.utils.analysis_storage import get_analysis_record, set_analysis_video_metadata
+    
+    record = get_analysis_record(analysis_id) if analysis_id else None
+    if record is not None and record.get("video_metadata"):
+        return VideoMetadata.from_dict(record["video_metadata"])
+    
+    if not Path(video_path).exists():
+        raise ValueError(f"Video file not found: {video_path}")
+    stat = os.stat(video_path)
+    metadata = probe_video_metadata_cached(str(video_path), stat.st_mtime_ns, stat.st_size)
+    
+    if record is not None:
+        set_analysis_video_metadata(analysis_id, metadata.to_dict())
+    return metadata
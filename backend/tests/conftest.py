@@ -0,0 +1,115 @@
+"""
+Shared fixtures for the CruxVision backend tests.
+
+Tests build synthetic pose tracks instead of running MediaPipe on video files,
+so they exercise the storage, planning and metrics code in isolation. Decoding
+tests use a small variable frame rate H.264 video encoded with PyAV.
+"""
+
+import sys
+from fractions import Fraction
+from pathlib import Path
+from typing import Callable
+
+import av
+import cv2
+import numpy as np
+import pytest
+
+# Add the project root to Python path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from backend.src.pipeline.pose_track import FramePose, PoseTrack, LANDMARK_COUNT, LANDMARK_FIELDS, VISIBILITY
+
+# Torso landmark offsets from the climber's center (normalized units)
+TORSO_OFFSETS = {
+    11: (-0.05, -0.15),  # left_shoulder
+    12: (0.05, -0.15),  # right_shoulder
+    23: (-0.04, 0.05),  # left_hip
+    24: (0.04, 0.05)  # right_hip
+}
+
+
+def make_landmarks(frame_index: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Build a plausible (33, 4) landmark array for a climber moving across the frame.
+    
+    Args:
+        frame_index: Frame index, drives the slow movement of the body center
+        rng: Random generator for jitter and visibility
+    
+    Returns:
+        (33, 4) float32 array of x, y, z, visibility
+    """
+    center = np.array([0.5 + 0.15 * np.sin(frame_index / 15), 0.5 + 0.1 * np.cos(frame_index / 10)])
+    landmarks = np.empty((LANDMARK_COUNT, len(LANDMARK_FIELDS)), dtype=np.float32)
+    landmarks[:, :2] = center + rng.normal(0, 0.08, (LANDMARK_COUNT, 2))
+    for landmark_index, offset in TORSO_OFFSETS.items():
+        landmarks[landmark_index, :2] = center + offset + rng.normal(0, 0.003, 2)
+    landmarks[:, 2] = rng.normal(0, 0.1, LANDMARK_COUNT)
+    landmarks[:, VISIBILITY] = rng.uniform(0.5, 1.0, LANDMARK_COUNT)
+    return landmarks
+
+
+@pytest.fixture
+def make_pose_track() -> Callable[..., PoseTrack]:
+    """
+    Factory for synthetic pose tracks.
+    
+    Frames with index % missing_every == 5 have no pose (every other one with an
+    error message), frames with index % occluded_every == 3 have occluded hips,
+    and frames with index % 7 == 2 are marked as interpolated.
+    """
+    def factory(frame_count: int = 120, seed: int = 0, missing_every: int = 17, occluded_every: int = 11) -> PoseTrack:
+        rng = np.random.default_rng(seed)
+        pose_track = PoseTrack()
+        
+        for frame_index in range(frame_count):
+            if missing_every and frame_index % missing_every == 5:
+                error = f"Detection failed on frame {frame_index}" if frame_index % 2 else None
+                pose_track.add_frame(FramePose(frame_index, error=error))
+                continue
+            
+            landmarks = make_landmarks(frame_index, rng)
+            if occluded_every and frame_index % occluded_every == 3:
+                landmarks[[23, 24], VISIBILITY] = 0.1
+            pose_track.add_frame(FramePose(frame_index, landmarks, float(landmarks[:, VISIBILITY].mean()), interpolated=frame_index % 7 == 2))
+        
+        return pose_track.trim()
+    
+    return factory
+
+
+@pytest.fixture
+def vfr_video(tmp_path) -> str:
+    """
+    Variable frame rate H.264 video with B-frames, like a phone recording.
+    
+    Every frame shows its own index, and frame durations vary (with a long gap
+    after frame 60), so a seek that lands on the wrong frame shows up in the pixels.
+    """
+    if "libx264" not in av.codecs_available:
+        pytest.skip("PyAV was built without libx264")
+    
+    path = tmp_path / "vfr.mp4"
+    time_base = Fraction(1, 90000)
+    with av.open(str(path), "w") as container:
+        stream = container.add_stream("libx264", rate=30)
+        stream.width, stream.height, stream.pix_fmt = 160, 96, "yuv420p"
+        stream.codec_context.time_base = time_base
+        stream.options = {"g": "24", "bf": "3"}
+        
+        pts = 0
+        for frame_index in range(150):
+            image = np.zeros((96, 160, 3), dtype=np.uint8)
+            image[:, :, 1] = frame_index * 37 % 256
+            cv2.putText(image, str(frame_index), (10, 70), cv2.FONT_HERSHEY_SIMPLEX, 2, (255, 255, 255), 3)
+            frame = av.VideoFrame.from_ndarray(image, format="bgr24")
+            frame.pts, frame.time_base = pts, time_base
+            pts += 3000 + (1400 if frame_index % 5 == 0 else 0) + (9000 if frame_index == 60 else 0)
+            for packet in stream.encode(frame):
+                container.mux(packet)
+        for packet in stream.encode():
+            container.mux(packet)
+    
+    return str(path)
@@ -0,0 +1,122 @@
+"""
+Tests for resumable chunked pose detection.
+
+Decoding and inference are replaced with a synthetic video whose poses depend
+only on the frame index, so an interrupted and resumed run can be compared with
+an uninterrupted one.
+"""
+
+import numpy as np
+import pytest
+
+from backend.src.pipeline import chunked_detection, pose_detection
+from backend.src.pipeline.chunked_detection import run_chunked_detection, load_chunk_manifest, get_chunk_dir
+from backend.src.pipeline.metrics import OnlineMetricsAccumulator
+from backend.src.pipeline.pose_track import FramePose
+from backend.src.utils import pose_store
+from backend.tests.conftest import make_landmarks
+
+VIDEO_INFO = {"fps": 10.0, "total_frames": 55, "width": 64, "height": 48}
+CHUNK_FRAMES = 10  # fps * CHUNK_DURATION_SECONDS
+WARMUP_FRAMES = 5
+
+
+class SyntheticVideo:
+    """Stands in for decoding and pose detection, optionally failing partway through."""
+    
+    def __init__(self):
+        self.fail_at_frame = None
+        self.decode_starts = []
+    
+    def iter_video_frames(self, video_path, start_frame=0, end_frame=None, limit_frames=True):
+        self.decode_starts.append(start_frame)
+        for frame_index in range(start_frame, VIDEO_INFO["total_frames"]):
+            if frame_index == self.fail_at_frame:
+                raise RuntimeError(f"Decoder crashed at frame {frame_index}")
+            yield frame_index, np.zeros((VIDEO_INFO["height"], VIDEO_INFO["width"], 3), dtype=np.uint8)
+    
+    def process_frames_with_pose(self, indexed_frames, pose_estimator=None):
+        for frame_index, frame in indexed_frames:
+            if frame_index % 9 == 4:
+                yield frame, FramePose(frame_index, error="No pose detected")
+                continue
+            landmarks = make_landmarks(frame_index, np.random.default_rng(frame_index))
+            yield frame, FramePose(frame_index, landmarks, float(landmarks[:, 3].mean()))
+
+
+@pytest.fixture
+def video(tmp_path, monkeypatch):
+    """Run chunked detection on a synthetic video, writing into a temporary directory."""
+    monkeypatch.setattr(chunked_detection, "OUTPUT_DIR", tmp_path)
+    monkeypatch.setattr(pose_store, "OUTPUT_DIR", tmp_path)
+    monkeypatch.setattr(chunked_detection, "CHUNK_DURATION_SECONDS", CHUNK_FRAMES / VIDEO_INFO["fps"])
+    monkeypatch.setattr(chunked_detection, "CHUNK_WARMUP_FRAMES", WARMUP_FRAMES)
+    monkeypatch.setattr(pose_detection, "PIPELINED_DETECTION", False)
+    
+    synthetic_video = SyntheticVideo()
+    monkeypatch.setattr(pose_detection, "iter_video_frames", synthetic_video.iter_video_frames)
+    monkeypatch.setattr(pose_detection, "process_frames_with_pose", synthetic_video.process_frames_with_pose)
+    return synthetic_video
+
+
+def new_accumulator() -> OnlineMetricsAccumulator:
+    """Metrics accumulator for the synthetic video."""
+    return OnlineMetricsAccumulator(VIDEO_INFO["fps"], VIDEO_INFO["width"], VIDEO_INFO["height"], pose_detection.LANDMARK_THRESHOLDS)
+
+
+def assert_same_tracks(restored, expected) -> None:
+    """Check two pose tracks hold the same frames."""
+    assert len(restored) == len(expected)
+    np.testing.assert_array_equal(restored.pose_detected, expected.pose_detected)
+    np.testing.assert_array_equal(restored.frame_present, expected.frame_present)
+    np.testing.assert_array_equal(restored.landmarks[expected.pose_detected], expected.landmarks[expected.pose_detected])
+    assert restored.errors == expected.errors
+
+
+def test_uninterrupted_run_assembles_every_frame(video):
+    pose_track, _, info_file = run_chunked_detection("climb.mp4", "whole", VIDEO_INFO)
+    
+    assert len(pose_track) == VIDEO_INFO["total_frames"]
+    assert pose_track.frame_present.all()
+    assert not pose_track.has_pose(4) and pose_track.has_pose(5)
+    assert video.decode_starts == [0]
+    assert not get_chunk_dir("whole").exists()
+    with open(info_file) as f:
+        assert f.read().count("Chunk ") == 6
+
+
+def test_interrupted_run_resumes_after_the_last_completed_chunk(video):
+    video.fail_at_frame = 36
+    with pytest.raises(RuntimeError):
+        run_chunked_detection("climb.mp4", "resumed", VIDEO_INFO)
+    
+    manifest = load_chunk_manifest("resumed")
+    assert manifest["status"] == "error"
+    assert [chunk["start_frame"] for chunk in manifest["completed_chunks"]] == [0, 10, 20]
+    
+    video.fail_at_frame = None
+    resumed_metrics = new_accumulator()
+    pose_track, _, _ = run_chunked_detection("climb.mp4", "resumed", VIDEO_INFO, resumed_metrics)
+    expected_metrics = new_accumulator()
+    expected, _, _ = run_chunked_detection("climb.mp4", "whole", VIDEO_INFO, expected_metrics)
+    
+    # Decoding restarts CHUNK_WARMUP_FRAMES before the first missing chunk
+    assert video.decode_starts == [0, 30 - WARMUP_FRAMES, 0]
+    assert_same_tracks(pose_track, expected)
+    # Metrics continue from the state saved with the last completed chunk
+    assert resumed_metrics.snapshot() == expected_metrics.snapshot()
+    assert resumed_metrics.frames_seen == VIDEO_INFO["total_frames"]
+    assert not get_chunk_dir("resumed").exists()
+
+
+def test_chunks_written_with_a_different_chunk_size_are_discarded(video, monkeypatch):
+    video.fail_at_frame = 36
+    with pytest.raises(RuntimeError):
+        run_chunked_detection("climb.mp4", "resized", VIDEO_INFO)
+    
+    video.fail_at_frame = None
+    monkeypatch.setattr(chunked_detection, "CHUNK_DURATION_SECONDS", 2 * CHUNK_FRAMES / VIDEO_INFO["fps"])
+    pose_track, _, _ = run_chunked_detection("climb.mp4", "resized", VIDEO_INFO)
+    
+    assert video.decode_starts == [0, 0]
+    assert len(pose_track) == VIDEO_INFO["total_frames"]
@@ -0,0 +1,67 @@
+"""
+Tests for segment planning and segment decoding in segment-parallel pose detection.
+"""
+
+import numpy as np
+import pytest
+
+from backend.src.pipeline.pose_detection import plan_detection_segments, iter_video_frames
+
+
+def covered_frames(segments, total_frames):
+    """Frames each segment is responsible for, with the open last segment ending at total_frames."""
+    return [list(range(start, total_frames if end is None else end)) for _, start, end in segments]
+
+
+@pytest.mark.parametrize("total_frames, segment_count", [(1, 1), (10, 3), (100, 4), (101, 4), (3600, 8), (5, 8)])
+def test_segments_cover_every_frame_once(total_frames, segment_count):
+    segments = plan_detection_segments(total_frames, segment_count, overlap_frames=30)
+    
+    frames = [frame for segment_frames in covered_frames(segments, total_frames) for frame in segment_frames]
+    assert frames == list(range(total_frames))
+    assert len(segments) <= min(segment_count, total_frames)
+
+
+@pytest.mark.parametrize("total_frames, segment_count", [(100, 4), (3600, 8), (7, 3)])
+def test_segments_are_contiguous_and_only_the_last_is_open(total_frames, segment_count):
+    segments = plan_detection_segments(total_frames, segment_count)
+    
+    assert segments[0][1] == 0
+    assert segments[-1][2] is None
+    for (_, _, end), (_, next_start, _) in zip(segments, segments[1:]):
+        assert end == next_start
+
+
+def test_warmup_starts_overlap_frames_before_each_segment():
+    segments = plan_detection_segments(1000, 4, overlap_frames=30)
+    
+    assert [segment[:2] for segment in segments] == [(0, 0), (220, 250), (470, 500), (720, 750)]
+
+
+def test_warmup_never_starts_before_the_first_frame():
+    segments = plan_detection_segments(40, 4, overlap_frames=30)
+    
+    assert all(warmup_start >= 0 for warmup_start, _, _ in segments)
+    assert segments[1][0] == 0
+
+
+def test_more_segments_than_frames_gives_one_frame_segments():
+    segments = plan_detection_segments(3, 10, overlap_frames=0)
+    
+    assert segments == [(0, 0, 1), (1, 1, 2), (2, 2, None)]
+
+
+def test_unknown_frame_count_reads_the_whole_video_in_one_segment():
+    assert plan_detection_segments(0, 4) == [(0, 0, None)]
+
+
+def test_segments_decode_the_same_frames_as_the_whole_video(vfr_video):
+    whole_video = list(iter_video_frames(vfr_video))
+    
+    for warmup_start, _, end in plan_detection_segments(len(whole_video), 4, overlap_frames=7):
+        segment = list(iter_video_frames(vfr_video, warmup_start, end))
+        
+        expected = whole_video[warmup_start:end]
+        assert [frame_index for frame_index, _ in segment] == [frame_index for frame_index, _ in expected]
+        for (_, frame), (_, expected_frame) in zip(segment, expected):
+            np.testing.assert_array_equal(frame, expected_frame)
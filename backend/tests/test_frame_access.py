@@ -0,0 +1,34 @@
+"""
+Tests for frame-accurate sequential decoding in the frame access service.
+"""
+
+import numpy as np
+import pytest
+
+from backend.src.utils.frame_access import iter_frames, read_frame
+
+
+@pytest.mark.parametrize("start_frame", [1, 23, 24, 50, 61, 137])
+def test_decoding_from_a_frame_matches_decoding_from_the_start(vfr_video, start_frame):
+    sequential = list(iter_frames(vfr_video))
+    
+    decoded = list(iter_frames(vfr_video, start_frame, start_frame + 12))
+    
+    assert [frame_index for frame_index, _ in decoded] == list(range(start_frame, min(start_frame + 12, len(sequential))))
+    for (_, frame), (_, expected) in zip(decoded, sequential[start_frame:]):
+        np.testing.assert_array_equal(frame, expected)
+
+
+def test_decoding_runs_to_the_end_without_an_end_frame(vfr_video):
+    assert [frame_index for frame_index, _ in iter_frames(vfr_video, 140)] == list(range(140, 150))
+
+
+def test_start_past_the_end_yields_nothing(vfr_video):
+    assert list(iter_frames(vfr_video, 1000)) == []
+
+
+def test_single_frames_match_sequential_decoding(vfr_video):
+    sequential = list(iter_frames(vfr_video))
+    
+    for frame_index in (0, 59, 61, 149):
+        np.testing.assert_array_equal(read_frame(vfr_video, frame_index), sequential[frame_index][1])
@@ -0,0 +1,117 @@
+"""
+Tests for the streaming metrics accumulator against the batch computation.
+"""
+
+import json
+
+import numpy as np
+import pytest
+
+from backend.src.pipeline.metrics import OnlineMetricsAccumulator, compute_climb_metrics, TORSO_HISTOGRAM_BIN_PIXELS
+from backend.src.pipeline.pose_detection import LANDMARK_THRESHOLDS
+from backend.src.pipeline.pose_track import FramePose, PoseTrack
+
+FPS = 30.0
+WIDTH = 1280
+HEIGHT = 720
+
+# The streaming torso median is off by at most half a histogram bin; the torso
+# of the synthetic climber is about 144 px long
+MEDIAN_RELATIVE_TOLERANCE = TORSO_HISTOGRAM_BIN_PIXELS / 2 / 140
+
+
+def accumulate(pose_track: PoseTrack, frame_count: int = None) -> OnlineMetricsAccumulator:
+    """Feed the first frame_count frames of a track to a new accumulator, in frame order."""
+    accumulator = OnlineMetricsAccumulator(FPS, WIDTH, HEIGHT, LANDMARK_THRESHOLDS)
+    for frame_index in range(len(pose_track) if frame_count is None else frame_count):
+        accumulator.update(pose_track.get_frame_pose(frame_index))
+    return accumulator
+
+
+def prefix(pose_track: PoseTrack, frame_count: int) -> PoseTrack:
+    """First frame_count frames of a track."""
+    result = PoseTrack()
+    for frame_index in range(frame_count):
+        result.add_frame(pose_track.get_frame_pose(frame_index))
+    return result.trim()
+
+
+def assert_matches_batch(online: dict, batch: dict) -> None:
+    """Check streaming metrics against compute_climb_metrics() output."""
+    assert online["frames_analyzed"] == batch["frames_analyzed"]
+    for name in ("avg_hip_angle", "avg_knee_angle"):
+        assert online[name] == pytest.approx(batch[name], rel=1e-9)
+    # Velocity and jerk are divided by the median torso length
+    for name in ("avg_com_velocity", "avg_com_jerk", "stability_score"):
+        assert batch[name] is not None
+        assert online[name] == pytest.approx(batch[name], rel=MEDIAN_RELATIVE_TOLERANCE)
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_finalized_metrics_match_batch_metrics(make_pose_track, seed):
+    pose_track = make_pose_track(frame_count=240, seed=seed)
+    
+    online = accumulate(pose_track).snapshot()
+    batch = compute_climb_metrics(pose_track, FPS, WIDTH, HEIGHT, LANDMARK_THRESHOLDS)
+    
+    assert_matches_batch(online, batch)
+    assert online["frames_seen"] == len(pose_track)
+
+
+def test_partial_snapshot_matches_batch_metrics_of_the_frames_so_far(make_pose_track):
+    pose_track = make_pose_track(frame_count=240)
+    
+    online = accumulate(pose_track, frame_count=100).snapshot()
+    batch = compute_climb_metrics(prefix(pose_track, 100), FPS, WIDTH, HEIGHT, LANDMARK_THRESHOLDS)
+    
+    assert_matches_batch(online, batch)
+
+
+def test_track_without_poses_has_no_motion_metrics():
+    pose_track = PoseTrack()
+    for frame_index in range(30):
+        pose_track.add_frame(FramePose(frame_index))
+    
+    metrics = accumulate(pose_track).snapshot()
+    
+    assert metrics["frames_analyzed"] == 0
+    assert metrics["avg_com_velocity"] is None
+    assert metrics["stability_score"] is None
+
+
+def test_torso_median_is_within_half_a_bin():
+    accumulator = OnlineMetricsAccumulator(FPS, WIDTH, HEIGHT, LANDMARK_THRESHOLDS)
+    torso_lengths = np.random.default_rng(0).uniform(50, 600, 1001)
+    
+    for count in (1, 2, 3, 1000, 1001):
+        accumulator.torso_histogram[:] = 0
+        accumulator.torso_count = 0
+        for torso_length in torso_lengths[:count]:
+            accumulator.torso_histogram[int(torso_length / TORSO_HISTOGRAM_BIN_PIXELS)] += 1
+            accumulator.torso_count += 1
+        assert abs(accumulator.get_torso_median() - np.median(torso_lengths[:count])) <= TORSO_HISTOGRAM_BIN_PIXELS / 2 + 1e-9
+
+
+def test_memory_does_not_grow_with_video_length(make_pose_track):
+    pose_track = make_pose_track(frame_count=300)
+    accumulator = accumulate(pose_track)
+    histogram_size = accumulator.torso_histogram.nbytes
+    
+    for _ in range(5):
+        for frame_index in range(len(pose_track)):
+            accumulator.update(pose_track.get_frame_pose(frame_index))
+    
+    assert accumulator.torso_histogram.nbytes == histogram_size
+    assert accumulator.frames_seen == 6 * len(pose_track)
+
+
+def test_restored_state_continues_like_an_uninterrupted_run(make_pose_track):
+    pose_track = make_pose_track(frame_count=240)
+    first_half = accumulate(pose_track, frame_count=120)
+    
+    restored = OnlineMetricsAccumulator(FPS, WIDTH, HEIGHT, LANDMARK_THRESHOLDS)
+    restored.load_state(json.loads(json.dumps(first_half.get_state())))
+    for frame_index in range(120, len(pose_track)):
+        restored.update(pose_track.get_frame_pose(frame_index))
+    
+    assert restored.snapshot() == accumulate(pose_track).snapshot()
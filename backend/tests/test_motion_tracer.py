@@ -0,0 +1,85 @@
+"""
+Tests for precomputed anchor trails against the frame-by-frame motion tracer.
+"""
+
+import numpy as np
+import pytest
+
+from backend.src.pipeline.motion_tracer import MotionTracer, AnchorTrails, compute_track_anchor_trails
+from backend.src.pipeline.overlay import calculate_hip_midpoint, calculate_shoulder_midpoint, TRACER_PERSISTENCE_SECONDS
+from backend.src.pipeline.pose_track import PoseTrack, X
+
+FPS = 30.0
+FRAME_SHAPE = (360, 640, 3)
+PERSISTENCE_FRAMES = int(FPS * TRACER_PERSISTENCE_SECONDS)
+
+
+def trace_track(pose_track: PoseTrack, calculate_midpoint) -> list:
+    """Run a MotionTracer over the track like the streaming renderer, recording every frame's trail."""
+    tracer = MotionTracer(FPS, TRACER_PERSISTENCE_SECONDS)
+    trails = []
+    for frame_index in range(len(pose_track)):
+        landmarks = pose_track.get_landmarks(frame_index)
+        midpoint = calculate_midpoint(landmarks, FRAME_SHAPE) if landmarks is not None else None
+        if midpoint:
+            tracer.add_position(*midpoint, frame_index)
+        trails.append(tracer.get_active_arrays(frame_index))
+    return trails
+
+
+def visible_part(trail, frame_index: int):
+    """
+    Drop the oldest trail point when it is exactly persistence_frames old.
+    
+    MotionTracer keeps that point and AnchorTrails does not; its fade opacity is
+    0, so it is never drawn.
+    """
+    positions, frame_indices = trail
+    visible = frame_index - frame_indices < PERSISTENCE_FRAMES
+    return positions[visible], frame_indices[visible]
+
+
+@pytest.mark.parametrize("anchor, calculate_midpoint", [("hip", calculate_hip_midpoint), ("shoulder", calculate_shoulder_midpoint)])
+def test_precomputed_trails_match_the_motion_tracer(make_pose_track, anchor, calculate_midpoint):
+    pose_track = make_pose_track(frame_count=200)
+    # Push some anchors out of the frame; neither implementation may place them
+    pose_track.landmarks[40:45, :, X] += 1.0
+    
+    anchor_trails = compute_track_anchor_trails(pose_track, FRAME_SHAPE, PERSISTENCE_FRAMES)[anchor]
+    traced = trace_track(pose_track, calculate_midpoint)
+    
+    for frame_index, trail in enumerate(traced):
+        expected_positions, expected_frames = visible_part(trail, frame_index)
+        positions, frame_indices = anchor_trails.get_trail(frame_index)
+        np.testing.assert_array_equal(frame_indices, expected_frames)
+        np.testing.assert_array_equal(positions, expected_positions)
+
+
+def test_occluded_and_missing_frames_have_no_anchor(make_pose_track):
+    pose_track = make_pose_track(frame_count=60)
+    
+    hip_frames = set(compute_track_anchor_trails(pose_track, FRAME_SHAPE, PERSISTENCE_FRAMES)["hip"].frame_indices)
+    
+    assert 5 not in hip_frames  # No pose
+    assert 3 not in hip_frames  # Hips occluded
+    assert 2 in hip_frames  # Interpolated poses still have anchors
+
+
+def test_trail_is_empty_before_the_first_anchor():
+    trails = AnchorTrails(np.array([10, 11]), np.array([[1, 2], [3, 4]]), persistence_frames=5)
+    
+    positions, frame_indices = trails.get_trail(9)
+    
+    assert len(positions) == 0 and len(frame_indices) == 0
+    np.testing.assert_array_equal(trails.get_trail(15)[1], [11])
+    assert len(trails.get_trail(16)[1]) == 0
+
+
+def test_slice_keeps_absolute_frame_indices():
+    trails = AnchorTrails(np.arange(0, 100, 2), np.arange(100).reshape(50, 2), persistence_frames=10)
+    
+    sliced = trails.slice(20, 40)
+    
+    np.testing.assert_array_equal(sliced.frame_indices, np.arange(20, 40, 2))
+    np.testing.assert_array_equal(sliced.get_trail(30)[1], trails.get_trail(30)[1])
+    np.testing.assert_array_equal(trails.slice(90, None).frame_indices, [90, 92, 94, 96, 98])
@@ -0,0 +1,140 @@
+"""
+Tests for the binary pose store: round trips, quantization and chunk concatenation.
+"""
+
+import numpy as np
+import pytest
+
+from backend.src.pipeline.pose_track import FramePose, PoseTrack
+from backend.src.utils.pose_store import (
+    QUANTIZED_COORDINATE_SCALE, QUANTIZED_VISIBILITY_SCALE,
+    write_pose_store, load_pose_store, concatenate_pose_stores, read_pose_store_header, PoseStoreReader
+)
+
+
+def slice_pose_track(pose_track: PoseTrack, start: int, end: int) -> PoseTrack:
+    """Copy frames [start, end) into a new track indexed from 0, like a detection chunk."""
+    chunk = PoseTrack()
+    for frame_index in range(start, end):
+        frame_pose = pose_track.get_frame_pose(frame_index)
+        chunk.add_frame(FramePose(frame_index - start, frame_pose.landmarks, frame_pose.overall_confidence, frame_pose.interpolated, frame_pose.error))
+    return chunk.trim()
+
+
+def assert_same_frames(restored: PoseTrack, pose_track: PoseTrack, landmark_tolerance: np.ndarray = None) -> None:
+    """Check flags, errors and (within a per-field tolerance) landmarks of every frame."""
+    assert len(restored) == len(pose_track)
+    np.testing.assert_array_equal(restored.pose_detected, pose_track.pose_detected)
+    np.testing.assert_array_equal(restored.interpolated, pose_track.interpolated)
+    np.testing.assert_array_equal(restored.frame_present, pose_track.frame_present)
+    np.testing.assert_array_equal(restored.overall_confidence, pose_track.overall_confidence)
+    assert restored.errors == pose_track.errors
+    
+    detected = pose_track.pose_detected
+    if landmark_tolerance is None:
+        np.testing.assert_array_equal(restored.landmarks[detected], pose_track.landmarks[detected])
+    else:
+        assert np.all(np.abs(restored.landmarks[detected] - pose_track.landmarks[detected]) <= landmark_tolerance)
+
+
+def test_float_store_round_trip_is_exact(tmp_path, make_pose_track):
+    pose_track = make_pose_track()
+    path = tmp_path / "track.pose"
+    
+    write_pose_store(pose_track, path, {"video_info": {"fps": 30.0}})
+    restored, metadata = load_pose_store(path)
+    
+    assert_same_frames(restored, pose_track)
+    assert metadata == {"video_info": {"fps": 30.0}}
+
+
+def test_quantized_store_round_trip_is_within_quantization_error(tmp_path, make_pose_track):
+    pose_track = make_pose_track()
+    path = tmp_path / "track.pose"
+    
+    write_pose_store(pose_track, path, quantized=True)
+    restored, _ = load_pose_store(path)
+    
+    # Rounding to the nearest step, plus float32 error in the scaling
+    tolerance = np.array([0.5 / QUANTIZED_COORDINATE_SCALE] * 3 + [0.5 / QUANTIZED_VISIBILITY_SCALE]) + 1e-6
+    assert_same_frames(restored, pose_track, landmark_tolerance=tolerance)
+    assert read_pose_store_header(path)["quantized"] is True
+
+
+def test_quantized_store_is_smaller(tmp_path, make_pose_track):
+    pose_track = make_pose_track(frame_count=300)
+    
+    write_pose_store(pose_track, tmp_path / "float.pose")
+    write_pose_store(pose_track, tmp_path / "quantized.pose", quantized=True)
+    
+    assert (tmp_path / "quantized.pose").stat().st_size < 0.6 * (tmp_path / "float.pose").stat().st_size
+
+
+def test_reader_looks_up_single_frames(tmp_path, make_pose_track):
+    pose_track = make_pose_track()
+    path = tmp_path / "track.pose"
+    write_pose_store(pose_track, path)
+    
+    reader = PoseStoreReader(path)
+    
+    assert len(reader) == len(pose_track)
+    np.testing.assert_array_equal(reader.get_landmarks(10), pose_track.get_landmarks(10))
+    assert reader.get_landmarks(5) is None  # No pose on this frame
+    assert reader.get_landmarks(len(pose_track)) is None
+
+
+def test_empty_track_round_trip(tmp_path):
+    path = tmp_path / "empty.pose"
+    
+    write_pose_store(PoseTrack(), path)
+    restored, _ = load_pose_store(path)
+    
+    assert len(restored) == 0
+    assert restored.poses_detected == 0
+
+
+def test_non_store_file_is_rejected(tmp_path):
+    path = tmp_path / "not_a_store.pose"
+    path.write_bytes(b"\x00" * 64)
+    
+    with pytest.raises(ValueError):
+        read_pose_store_header(path)
+
+
+@pytest.mark.parametrize("quantized", [False, True])
+def test_concatenated_chunks_equal_the_whole_track(tmp_path, make_pose_track, quantized):
+    pose_track = make_pose_track(frame_count=95)
+    chunk_files = []
+    for start in range(0, len(pose_track), 30):
+        chunk_file = tmp_path / f"chunk_{start}.pose"
+        write_pose_store(slice_pose_track(pose_track, start, min(start + 30, len(pose_track))), chunk_file, quantized=quantized)
+        chunk_files.append((start, chunk_file))
+    
+    whole_file = tmp_path / "whole.pose"
+    concatenate_pose_stores(chunk_files, whole_file, {"analysis_id": "test"}, quantized=quantized)
+    restored, metadata = load_pose_store(whole_file)
+    
+    if quantized:
+        # Re-quantizing the dequantized chunks is lossless: the result matches
+        # quantizing the whole track once
+        write_pose_store(pose_track, tmp_path / "expected.pose", quantized=True)
+        expected, _ = load_pose_store(tmp_path / "expected.pose")
+        assert_same_frames(restored, expected)
+    else:
+        assert_same_frames(restored, pose_track)
+    assert metadata == {"analysis_id": "test"}
+
+
+def test_gaps_between_chunks_are_missing_frames(tmp_path, make_pose_track):
+    pose_track = make_pose_track(frame_count=40, missing_every=0)
+    write_pose_store(slice_pose_track(pose_track, 0, 10), tmp_path / "first.pose")
+    write_pose_store(slice_pose_track(pose_track, 30, 40), tmp_path / "last.pose")
+    
+    concatenate_pose_stores([(0, tmp_path / "first.pose"), (30, tmp_path / "last.pose")], tmp_path / "whole.pose")
+    restored, _ = load_pose_store(tmp_path / "whole.pose")
+    
+    assert len(restored) == 40
+    assert restored.frame_present[:10].all() and restored.frame_present[30:].all()
+    assert not restored.frame_present[10:30].any()
+    assert restored.get_frame_pose(20) is None
+    np.testing.assert_array_equal(restored.get_landmarks(35), pose_track.get_landmarks(35))
@@ -0,0 +1,58 @@
+"""
+Tests for the array-backed PoseTrack.
+"""
+
+import numpy as np
+
+from backend.src.pipeline.pose_track import FramePose, PoseTrack, LANDMARK_COUNT, LANDMARK_FIELDS
+from backend.src.pipeline.pose_detection import pose_track_to_frame_dicts
+
+
+def test_frames_added_out_of_order_grow_the_track():
+    pose_track = PoseTrack(capacity=2)
+    landmarks = np.full((LANDMARK_COUNT, len(LANDMARK_FIELDS)), 0.5, dtype=np.float32)
+    
+    pose_track.add_frame(FramePose(9, landmarks, 0.5))
+    pose_track.add_frame(FramePose(3))
+    
+    assert len(pose_track) == 10
+    assert pose_track.frames_stored == 2
+    assert pose_track.poses_detected == 1
+    assert pose_track.has_pose(9) and not pose_track.has_pose(3)
+    # Frames never added are missing, not empty results
+    assert pose_track.get_frame_pose(5) is None
+    assert pose_track.get_frame_pose(3).landmarks is None
+
+
+def test_out_of_range_lookups_return_none():
+    pose_track = PoseTrack()
+    pose_track.add_frame(FramePose(0, np.zeros((LANDMARK_COUNT, len(LANDMARK_FIELDS)), dtype=np.float32)))
+    
+    assert pose_track.get_landmarks(-1) is None
+    assert pose_track.get_landmarks(1) is None
+    assert pose_track.get_frame_pose(1) is None
+
+
+def test_trim_drops_spare_capacity():
+    pose_track = PoseTrack(capacity=500)
+    for frame_index in range(20):
+        pose_track.add_frame(FramePose(frame_index))
+    
+    pose_track.trim()
+    
+    assert len(pose_track.pose_detected) == 20
+    assert pose_track.landmarks.shape == (20, LANDMARK_COUNT, len(LANDMARK_FIELDS))
+
+
+def test_frame_dicts_round_trip(make_pose_track):
+    pose_track = make_pose_track(frame_count=60)
+    
+    restored = PoseTrack.from_frame_dicts(pose_track_to_frame_dicts(pose_track))
+    
+    assert len(restored) == len(pose_track)
+    np.testing.assert_array_equal(restored.pose_detected, pose_track.pose_detected)
+    np.testing.assert_array_equal(restored.interpolated, pose_track.interpolated)
+    np.testing.assert_allclose(restored.overall_confidence, pose_track.overall_confidence, atol=1e-6)
+    detected = pose_track.pose_detected
+    np.testing.assert_allclose(restored.landmarks[detected], pose_track.landmarks[detected], atol=1e-6)
+    assert restored.errors == pose_track.errors
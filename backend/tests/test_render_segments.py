@@ -0,0 +1,79 @@
+"""
+Tests for segment planning and segment rendering in parallel overlay rendering.
+"""
+
+import numpy as np
+import pytest
+
+from backend.src.pipeline.motion_tracer import compute_track_anchor_trails
+from backend.src.pipeline.overlay import plan_render_segments, process_video_frames, MIN_RENDER_SEGMENT_FRAMES, TRACER_PERSISTENCE_SECONDS
+from backend.src.utils.video_metadata import probe_video_metadata
+
+FRAME_SHAPE = (360, 640, 3)
+PERSISTENCE_FRAMES = 60
+
+
+class FrameCollector:
+    """Stands in for a video writer, keeping the rendered frames."""
+    
+    def __init__(self):
+        self.frames = []
+    
+    def write(self, frame: np.ndarray) -> None:
+        self.frames.append(frame.copy())
+
+
+@pytest.mark.parametrize("total_frames", [0, 1, MIN_RENDER_SEGMENT_FRAMES, 2 * MIN_RENDER_SEGMENT_FRAMES - 1])
+def test_short_videos_render_in_one_segment(total_frames):
+    assert plan_render_segments(total_frames, workers=4) == [(0, None)]
+
+
+@pytest.mark.parametrize("total_frames, workers, segment_count", [(600, 4, 2), (1000, 4, 3), (3600, 4, 4), (3600, 1, 1)])
+def test_segment_count_is_bounded_by_workers_and_minimum_length(total_frames, workers, segment_count):
+    assert len(plan_render_segments(total_frames, workers)) == segment_count
+
+
+@pytest.mark.parametrize("total_frames, workers", [(600, 2), (1001, 3), (3601, 8)])
+def test_segments_are_contiguous_and_only_the_last_is_open(total_frames, workers):
+    segments = plan_render_segments(total_frames, workers)
+    
+    assert segments[0][0] == 0
+    assert segments[-1][1] is None
+    for (_, end), (next_start, _) in zip(segments, segments[1:]):
+        assert end == next_start
+    assert segments[-1][0] < total_frames
+
+
+def test_segment_slices_give_the_same_trails_as_the_whole_video(make_pose_track):
+    pose_track = make_pose_track(frame_count=4 * MIN_RENDER_SEGMENT_FRAMES)
+    anchor_trails = compute_track_anchor_trails(pose_track, FRAME_SHAPE, PERSISTENCE_FRAMES)
+    
+    for start, end in plan_render_segments(len(pose_track), workers=4):
+        for trails in anchor_trails.values():
+            # The warm-up slice each render worker receives
+            segment_trails = trails.slice(start - PERSISTENCE_FRAMES, end)
+            for frame_index in range(start, len(pose_track) if end is None else end):
+                positions, frame_indices = segment_trails.get_trail(frame_index)
+                expected_positions, expected_frames = trails.get_trail(frame_index)
+                np.testing.assert_array_equal(frame_indices, expected_frames)
+                np.testing.assert_array_equal(positions, expected_positions)
+
+
+@pytest.mark.parametrize("start, end", [(48, 96), (61, 110), (100, None)])
+def test_rendered_segment_matches_the_serial_render(vfr_video, make_pose_track, start, end):
+    metadata = probe_video_metadata(vfr_video)
+    pose_track = make_pose_track(frame_count=metadata.total_frames)
+    persistence_frames = int(metadata.fps * TRACER_PERSISTENCE_SECONDS)
+    anchor_trails = compute_track_anchor_trails(pose_track, (metadata.height, metadata.width), persistence_frames)
+    serial = FrameCollector()
+    process_video_frames(vfr_video, pose_track, serial, metadata)
+    
+    # Render the segment like a render worker, from its slice of the trails
+    segment = FrameCollector()
+    segment_trails = {anchor: trails.slice(start - persistence_frames, end) for anchor, trails in anchor_trails.items()}
+    process_video_frames(vfr_video, pose_track, segment, metadata, start_frame=start, end_frame=end, anchor_trails=segment_trails)
+    
+    expected = serial.frames[start:end]
+    assert len(segment.frames) == len(expected)
+    for frame, expected_frame in zip(segment.frames, expected):
+        np.testing.assert_array_equal(frame, expected_frame)
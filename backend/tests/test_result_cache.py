@@ -0,0 +1,113 @@
+"""
+Tests for the content-addressed result cache.
+"""
+
+import os
+
+import pytest
+
+from backend.src.utils import result_cache
+from backend.src.utils.result_cache import (
+    ENTRY_FILE, POSE_FILE, OVERLAY_FILE,
+    get_cache_key, store_cached_result, lookup_cached_result, evict_cache_entries
+)
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    """Point the result cache at an empty temporary directory."""
+    directory = tmp_path / "cache"
+    directory.mkdir()
+    monkeypatch.setattr(result_cache, "CACHE_DIR", directory)
+    return directory
+
+
+def make_entry(cache_dir, cache_key: str, size: int, last_used: float) -> None:
+    """Create a cache entry holding size bytes, last used at the given time."""
+    entry_dir = cache_dir / cache_key
+    entry_dir.mkdir()
+    (entry_dir / POSE_FILE).write_bytes(b"\x00" * (size - 2))
+    (entry_dir / ENTRY_FILE).write_text("{}")
+    os.utime(entry_dir / ENTRY_FILE, (last_used, last_used))
+
+
+def test_cache_key_depends_on_content_and_settings():
+    key = get_cache_key("abc123", {"sample_rate": 1})
+    
+    assert key.startswith("abc123_")
+    assert key == get_cache_key("abc123", {"sample_rate": 1})
+    assert key != get_cache_key("abc123", {"sample_rate": 2})
+    assert key != get_cache_key("def456", {"sample_rate": 1})
+
+
+def test_stored_result_is_found(cache_dir, tmp_path):
+    pose_file = tmp_path / "pose_data.pose"
+    pose_file.write_bytes(b"pose")
+    overlay_file = tmp_path / "overlay.mp4"
+    overlay_file.write_bytes(b"video")
+    
+    store_cached_result("key", str(pose_file), str(overlay_file), {"video_info": {"fps": 30.0}})
+    entry = lookup_cached_result("key")
+    
+    assert entry["pose_file"].read_bytes() == b"pose"
+    assert entry["overlay_file"].read_bytes() == b"video"
+    assert entry["metadata"] == {"video_info": {"fps": 30.0}}
+
+
+def test_result_without_overlay_has_no_overlay_file(cache_dir, tmp_path):
+    pose_file = tmp_path / "pose_data.pose"
+    pose_file.write_bytes(b"pose")
+    
+    store_cached_result("key", str(pose_file), None, {})
+    
+    assert lookup_cached_result("key")["overlay_file"] is None
+    assert not (cache_dir / "key" / OVERLAY_FILE).exists()
+
+
+def test_missing_and_incomplete_entries_are_misses(cache_dir):
+    (cache_dir / "incomplete").mkdir()
+    (cache_dir / "incomplete" / POSE_FILE).write_bytes(b"pose")
+    
+    assert lookup_cached_result("missing") is None
+    assert lookup_cached_result("incomplete") is None
+
+
+def test_unreadable_entry_is_discarded(cache_dir):
+    make_entry(cache_dir, "broken", 10, 1000.0)
+    (cache_dir / "broken" / ENTRY_FILE).write_text("{not json")
+    
+    assert lookup_cached_result("broken") is None
+    assert not (cache_dir / "broken").exists()
+
+
+def test_eviction_removes_least_recently_used_entries_first(cache_dir):
+    make_entry(cache_dir, "oldest", 100, 1000.0)
+    make_entry(cache_dir, "middle", 100, 2000.0)
+    make_entry(cache_dir, "newest", 100, 3000.0)
+    
+    assert evict_cache_entries(max_size_bytes=250) == 1
+    assert sorted(path.name for path in cache_dir.iterdir()) == ["middle", "newest"]
+    
+    assert evict_cache_entries(max_size_bytes=100) == 1
+    assert [path.name for path in cache_dir.iterdir()] == ["newest"]
+
+
+def test_lookup_marks_an_entry_as_recently_used(cache_dir):
+    make_entry(cache_dir, "oldest", 100, 1000.0)
+    make_entry(cache_dir, "newer", 100, 2000.0)
+    
+    lookup_cached_result("oldest")
+    
+    assert evict_cache_entries(max_size_bytes=150) == 1
+    assert [path.name for path in cache_dir.iterdir()] == ["oldest"]
+
+
+def test_eviction_keeps_entries_within_the_bound(cache_dir):
+    make_entry(cache_dir, "first", 100, 1000.0)
+    make_entry(cache_dir, "second", 100, 2000.0)
+    # Entries being staged by store_cached_result() are never evicted
+    (cache_dir / ".staging.tmp").mkdir()
+    (cache_dir / ".staging.tmp" / POSE_FILE).write_bytes(b"\x00" * 1000)
+    
+    assert evict_cache_entries(max_size_bytes=200) == 0
+    assert len(list(cache_dir.iterdir())) == 3
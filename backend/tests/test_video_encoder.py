@@ -0,0 +1,47 @@
+"""
+Tests for the ffmpeg capability probe and rotation arguments of the overlay encoder.
+"""
+
+import pytest
+
+from backend.src.pipeline import video_encoder
+from backend.src.pipeline.video_encoder import ffmpeg_available, get_ffmpeg_options, get_rotation_args
+
+FFMPEG_7_OPTIONS = "-noautorotate  automatically insert correct rotate filters\n-display_rotation[:<stream_spec>] <angle>  set pure counter-clockwise rotation\n"
+FFMPEG_5_OPTIONS = "-noautorotate  automatically insert correct rotate filters\n"
+
+
+@pytest.fixture
+def ffmpeg_binary(monkeypatch):
+    """Probe a different ffmpeg binary, without the cached result of the real one."""
+    def use_binary(binary: str) -> None:
+        monkeypatch.setattr(video_encoder, "FFMPEG_BINARY", binary)
+        get_ffmpeg_options.cache_clear()
+    
+    yield use_binary
+    get_ffmpeg_options.cache_clear()
+
+
+def test_missing_binary_is_not_available(ffmpeg_binary):
+    ffmpeg_binary("ffmpeg-that-is-not-installed")
+    
+    assert not ffmpeg_available()
+
+
+def test_binary_that_fails_to_run_is_not_available(ffmpeg_binary):
+    ffmpeg_binary("false")
+    
+    assert not ffmpeg_available()
+
+
+def test_display_rotation_is_an_input_option_on_ffmpeg_6_and_later(monkeypatch):
+    monkeypatch.setattr(video_encoder, "get_ffmpeg_options", lambda: FFMPEG_7_OPTIONS)
+    
+    assert get_rotation_args(270) == (['-noautorotate', '-display_rotation', '270'], [])
+
+
+@pytest.mark.parametrize("rotation, rotate_tag", [(0, "0"), (90, "270"), (180, "180"), (270, "90")])
+def test_older_ffmpeg_gets_the_clockwise_rotate_tag(monkeypatch, rotation, rotate_tag):
+    monkeypatch.setattr(video_encoder, "get_ffmpeg_options", lambda: FFMPEG_5_OPTIONS)
+    
+    assert get_rotation_args(rotation) == ([], ['-metadata:s:v:0', f"rotate={rotate_tag}"])
@@ -60,10 +60,22 @@ function App() {
 
 				{data.state === AnalysisState.COMPLETE && data.result && (
 					<div className="mt-8">
-						{data.result.video_url ? (
+						{data.streamUrl ||
+						data.result.video_url ||
+						data.result.source_video_url ? (
 							<div className="max-w-4xl mx-auto">
+								{/* Client overlay mode plays the upload and draws the skeleton in the browser */}
 								<VideoPlayer
-									videoUrl={data.result.video_url}
+									videoUrl={
+										data.streamUrl ??
+										data.result.video_url ??
+										data.result.source_video_url!
+									}
+									poseTrack={
+										data.streamUrl || data.result.video_url
+											? null
+											: data.poseTrack
+									}
 									title="Climbing Analysis with Skeleton Overlay"
 									onError={(error) => {
 										console.error(
@@ -171,6 +183,19 @@ function App() {
 																)}
 															</div>
 														)}
+														{data.result.metrics
+															.avg_com_velocity && (
+															<div>
+																<span className="font-medium">
+																	Avg COM
+																	Velocity:
+																</span>{" "}
+																{data.result.metrics.avg_com_velocity.toFixed(
+																	2
+																)}{" "}
+																torso lengths/s
+															</div>
+														)}
 													</>
 												) : (
 													<div className="text-gray-500 italic">
@@ -225,7 +250,11 @@ function App() {
 								</div>
 								<div className="mt-4 text-sm text-gray-600">
 									<p>Analysis ID: {data.result.id}</p>
-									<p>Video overlay is being generated...</p>
+									<p>
+										{data.result.overlay_status === "error"
+											? "Video overlay could not be generated."
+											: "Video overlay is being generated..."}
+									</p>
 								</div>
 								<div className="mt-4">
 									<button
@@ -1,5 +1,12 @@
 import axios, { AxiosResponse } from "axios";
-import { AnalyzeResponse, Result, ErrorResponse } from "../utils/types";
+import {
+	AnalyzeResponse,
+	Result,
+	ErrorResponse,
+	OverlayStatus,
+	PoseTrackData,
+} from "../utils/types";
+import { parsePoseTrack } from "../utils/poseTrack";
 
 // Create axios instance with base configuration
 const apiClient = axios.create({
@@ -99,10 +106,45 @@ export const api = {
 		) {
 			response.data.video_url = `http://localhost:8000${response.data.video_url}`;
 		}
+		if (
+			response.data.source_video_url &&
+			response.data.source_video_url.startsWith("/")
+		) {
+			response.data.source_video_url = `http://localhost:8000${response.data.source_video_url}`;
+		}
+		if (
+			response.data.stream_url &&
+			response.data.stream_url.startsWith("/")
+		) {
+			response.data.stream_url = `http://localhost:8000${response.data.stream_url}`;
+		}
 
 		return response.data;
 	},
 
+	/**
+	 * Request the overlay video for a completed analysis (rendered on demand)
+	 */
+	async requestOverlay(analysisId: string): Promise<OverlayStatus> {
+		const response: AxiosResponse<OverlayStatus> = await apiClient.post(
+			`/api/results/${analysisId}/overlay`
+		);
+
+		return response.data;
+	},
+
+	/**
+	 * Download the compact pose track for client-side overlay drawing
+	 */
+	async getPoseTrack(trackUrl: string): Promise<PoseTrackData> {
+		const response: AxiosResponse<ArrayBuffer> = await apiClient.get(
+			trackUrl,
+			{ responseType: "arraybuffer" }
+		);
+
+		return parsePoseTrack(response.data);
+	},
+
 	/**
 	 * Health check endpoint
 	 */
@@ -0,0 +1,117 @@
+import { useEffect, useRef, RefObject } from "react";
+import { PoseTrackData } from "../utils/types";
+import { drawPoseOverlay, getDisplaySize } from "../utils/poseTrack";
+
+interface PoseOverlayCanvasProps {
+	videoRef: RefObject<HTMLVideoElement>;
+	track: PoseTrackData;
+}
+
+// requestVideoFrameCallback is not in every TypeScript DOM lib version yet
+type FrameCallbackVideo = HTMLVideoElement & {
+	requestVideoFrameCallback?: (
+		callback: (now: number, metadata: { mediaTime: number }) => void
+	) => number;
+	cancelVideoFrameCallback?: (handle: number) => void;
+};
+
+/**
+ * Draws the pose track over the original video, in sync with playback.
+ */
+function PoseOverlayCanvas({ videoRef, track }: PoseOverlayCanvasProps) {
+	const canvasRef = useRef<HTMLCanvasElement>(null);
+
+	useEffect(() => {
+		const video = videoRef.current as FrameCallbackVideo | null;
+		const canvas = canvasRef.current;
+		const context = canvas?.getContext("2d");
+		if (!video || !canvas || !context) return;
+
+		let lastFrameIndex = -1;
+		let frameHandle: number | null = null;
+		let animationHandle: number | null = null;
+
+		const draw = (frameIndex: number) => {
+			lastFrameIndex = frameIndex;
+
+			// Match the canvas to the element at device resolution
+			const ratio = window.devicePixelRatio || 1;
+			const elementWidth = video.clientWidth;
+			const elementHeight = video.clientHeight;
+			if (
+				canvas.width !== Math.round(elementWidth * ratio) ||
+				canvas.height !== Math.round(elementHeight * ratio)
+			) {
+				canvas.width = Math.round(elementWidth * ratio);
+				canvas.height = Math.round(elementHeight * ratio);
+			}
+			context.setTransform(1, 0, 0, 1, 0, 0);
+			context.clearRect(0, 0, canvas.width, canvas.height);
+
+			// The video is letterboxed inside its element (object-fit: contain)
+			const [frameWidth, frameHeight] = getDisplaySize(track);
+			const scale = Math.min(
+				elementWidth / frameWidth,
+				elementHeight / frameHeight
+			);
+			const offsetX = (elementWidth - frameWidth * scale) / 2;
+			const offsetY = (elementHeight - frameHeight * scale) / 2;
+			context.setTransform(
+				scale * ratio,
+				0,
+				0,
+				scale * ratio,
+				offsetX * ratio,
+				offsetY * ratio
+			);
+			drawPoseOverlay(context, track, frameIndex);
+		};
+
+		const timeToFrame = (time: number) =>
+			Math.floor(time * track.fps + 1e-3);
+
+		if (video.requestVideoFrameCallback) {
+			// Fires once per presented frame with its exact timestamp
+			const onFrame = (_now: number, metadata: { mediaTime: number }) => {
+				draw(timeToFrame(metadata.mediaTime));
+				frameHandle = video.requestVideoFrameCallback!(onFrame);
+			};
+			frameHandle = video.requestVideoFrameCallback(onFrame);
+		} else {
+			const onAnimationFrame = () => {
+				const frameIndex = timeToFrame(video.currentTime);
+				if (frameIndex !== lastFrameIndex) draw(frameIndex);
+				animationHandle = requestAnimationFrame(onAnimationFrame);
+			};
+			animationHandle = requestAnimationFrame(onAnimationFrame);
+		}
+
+		// Redraw when seeking while paused or when the player is resized
+		const redraw = () => draw(timeToFrame(video.currentTime));
+		video.addEventListener("seeked", redraw);
+		video.addEventListener("loadeddata", redraw);
+		const resizeObserver = new ResizeObserver(redraw);
+		resizeObserver.observe(video);
+
+		return () => {
+			if (frameHandle !== null) {
+				video.cancelVideoFrameCallback?.(frameHandle);
+			}
+			if (animationHandle !== null) {
+				cancelAnimationFrame(animationHandle);
+			}
+			video.removeEventListener("seeked", redraw);
+			video.removeEventListener("loadeddata", redraw);
+			resizeObserver.disconnect();
+		};
+	}, [videoRef, track]);
+
+	return (
+		<canvas
+			ref={canvasRef}
+			className="absolute inset-0 w-full h-full pointer-events-none"
+		/>
+	);
+}
+
+export default PoseOverlayCanvas;
@@ -1,7 +1,15 @@
 import { useState, useRef, useEffect } from "react";
+import PoseOverlayCanvas from "./PoseOverlayCanvas";
+import { PoseTrackData } from "../utils/types";
+import {
+	attachStream,
+	canPlayStreamNatively,
+	isStreamUrl,
+} from "../utils/hlsStream";
 
 interface VideoPlayerProps {
-	videoUrl: string;
+	videoUrl: string; // Video file or HLS playlist of an overlay that is still rendering
+	poseTrack?: PoseTrackData | null; // Drawn over the video when the server sends no overlay video
 	title?: string;
 	onError?: (error: string) => void;
 	className?: string;
@@ -9,6 +17,7 @@ interface VideoPlayerProps {
 
 function VideoPlayer({
 	videoUrl,
+	poseTrack = null,
 	title = "Analysis Results",
 	onError,
 	className = "",
@@ -23,6 +32,30 @@ function VideoPlayer({
 	const [isLoading, setIsLoading] = useState(true);
 	const [error, setError] = useState<string | null>(null);
 	const errorTimeoutRef = useRef<number | null>(null);
+	const isStream = isStreamUrl(videoUrl);
+	const onErrorRef = useRef(onError);
+	onErrorRef.current = onError;
+
+	// HLS streams play natively where supported, otherwise through Media Source Extensions
+	useEffect(() => {
+		const video = videoRef.current;
+		if (!video || !isStream) return;
+
+		if (canPlayStreamNatively(video)) {
+			video.src = videoUrl;
+			return;
+		}
+		if (!window.MediaSource) {
+			setError("Video streaming is not supported by this browser.");
+			setIsLoading(false);
+			return;
+		}
+		return attachStream(video, videoUrl, (streamError) => {
+			setError(streamError.message);
+			setIsLoading(false);
+			onErrorRef.current?.(streamError.message);
+		});
+	}, [videoUrl, isStream]);
 
 	// Update current time
 	useEffect(() => {
@@ -313,11 +346,16 @@ function VideoPlayer({
 					className="w-full h-auto max-h-96"
 					onError={handleVideoError}
 					preload="auto"
-					src={videoUrl}
+					src={isStream ? undefined : videoUrl}
 					controls
 				>
 					Your browser does not support the video tag.
 				</video>
+
+				{/* Client-side skeleton overlay */}
+				{poseTrack && (
+					<PoseOverlayCanvas videoRef={videoRef} track={poseTrack} />
+				)}
 			</div>
 
 			{/* Controls */}
@@ -7,11 +7,14 @@ export function useAnalysis() {
 		state: AnalysisState.IDLE,
 		analysisId: null,
 		result: null,
+		poseTrack: null,
+		streamUrl: null,
 		error: null,
 		progress: 0,
 	});
 
 	const pollingIntervalRef = useRef<number | null>(null);
+	const overlayRequestedRef = useRef(false);
 
 	// Clear polling interval
 	const clearPolling = useCallback(() => {
@@ -21,10 +24,22 @@ export function useAnalysis() {
 		}
 	}, []);
 
+	// Download the pose track drawn over the original video
+	const loadPoseTrack = useCallback(async (trackUrl: string) => {
+		try {
+			const poseTrack = await api.getPoseTrack(trackUrl);
+			setData((prev) => ({ ...prev, poseTrack }));
+		} catch (error) {
+			// The video still plays, just without the skeleton overlay
+			console.error("Pose track error:", error);
+		}
+	}, []);
+
 	// Start polling for results
 	const startPolling = useCallback(
 		(analysisId: string) => {
 			clearPolling();
+			overlayRequestedRef.current = false;
 
 			pollingIntervalRef.current = setInterval(async () => {
 				try {
@@ -40,15 +55,51 @@ export function useAnalysis() {
 						result.status === "complete" ||
 						result.status === "error"
 					) {
-						clearPolling();
+						// The overlay video is rendered on request once poses are extracted
+						const overlayPending =
+							result.status === "complete" &&
+							!result.track_url &&
+							(result.overlay_status === "not_requested" ||
+								result.overlay_status === "rendering");
+						if (!overlayPending) {
+							clearPolling();
+						}
+						if (
+							result.overlay_status === "not_requested" &&
+							overlayPending &&
+							!overlayRequestedRef.current
+						) {
+							overlayRequestedRef.current = true;
+							api.requestOverlay(analysisId).catch((error) => {
+								console.error("Overlay request error:", error);
+							});
+						}
+
+						// The overlay stream is playable while the video renders
+						const renderingStreamUrl =
+							result.overlay_status === "rendering"
+								? result.stream_url ?? null
+								: null;
+
 						setData((prev) => ({
 							...prev,
 							state:
 								result.status === "complete"
 									? AnalysisState.COMPLETE
 									: AnalysisState.ERROR,
+							// Keep playing the stream once started, so playback is not
+							// restarted when the video file is done
+							streamUrl:
+								result.overlay_status === "error"
+									? null
+									: prev.streamUrl ?? renderingStreamUrl,
 							error: result.error_message,
 						}));
+
+						// Client overlay mode: the browser draws the pose track itself
+						if (result.status === "complete" && result.track_url) {
+							loadPoseTrack(result.track_url);
+						}
 					}
 				} catch (error) {
 					console.error("Polling error:", error);
@@ -64,7 +115,7 @@ export function useAnalysis() {
 				}
 			}, 2000); // Poll every 2 seconds
 		},
-		[clearPolling]
+		[clearPolling, loadPoseTrack]
 	);
 
 	// Upload video file
@@ -74,6 +125,8 @@ export function useAnalysis() {
 				state: AnalysisState.UPLOADING,
 				analysisId: null,
 				result: null,
+				poseTrack: null,
+				streamUrl: null,
 				error: null,
 				progress: 0,
 			});
@@ -113,6 +166,8 @@ export function useAnalysis() {
 			state: AnalysisState.IDLE,
 			analysisId: null,
 			result: null,
+			poseTrack: null,
+			streamUrl: null,
 			error: null,
 			progress: 0,
 		});
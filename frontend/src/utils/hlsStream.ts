@@ -0,0 +1,177 @@
+// Progressive overlay streams written by backend/src/pipeline/video_encoder.py:
+// an HLS master playlist listing the codecs, and a growing EVENT playlist of
+// fragmented MP4 segments that ends with #EXT-X-ENDLIST once rendering is done
+const PLAYLIST_POLL_INTERVAL = 1000; // ms between refetches of the playlist
+
+interface MediaPlaylist {
+	initUri: string | null;
+	segmentUris: string[];
+	ended: boolean;
+}
+
+/**
+ * Whether a URL points at an HLS playlist rather than a plain video file
+ */
+export function isStreamUrl(url: string): boolean {
+	return new URL(url, window.location.href).pathname.endsWith(".m3u8");
+}
+
+/**
+ * Whether the browser plays HLS by itself (Safari, iOS)
+ */
+export function canPlayStreamNatively(video: HTMLVideoElement): boolean {
+	return video.canPlayType("application/vnd.apple.mpegurl") !== "";
+}
+
+async function fetchText(url: string, signal: AbortSignal): Promise<string> {
+	// Playlists change while rendering, never use a cached copy
+	const response = await fetch(url, { cache: "no-store", signal });
+	if (!response.ok) {
+		throw new Error(`Failed to load ${url}: ${response.status}`);
+	}
+	return response.text();
+}
+
+async function fetchBuffer(
+	url: string,
+	signal: AbortSignal
+): Promise<ArrayBuffer> {
+	const response = await fetch(url, { signal });
+	if (!response.ok) {
+		throw new Error(`Failed to load ${url}: ${response.status}`);
+	}
+	return response.arrayBuffer();
+}
+
+// Codecs and media playlist URI of the first variant in a master playlist
+function parseMasterPlaylist(
+	text: string,
+	baseUrl: string
+): { codecs: string; playlistUrl: string } {
+	const lines = text.split("\n").map((line) => line.trim());
+	const index = lines.findIndex((line) =>
+		line.startsWith("#EXT-X-STREAM-INF:")
+	);
+	const codecs = index >= 0 ? lines[index].match(/CODECS="([^"]+)"/) : null;
+	const uri = lines
+		.slice(index + 1)
+		.find((line) => line && !line.startsWith("#"));
+	if (index < 0 || !codecs || !uri) {
+		throw new Error("Stream playlist has no usable variant");
+	}
+	return { codecs: codecs[1], playlistUrl: new URL(uri, baseUrl).href };
+}
+
+function parseMediaPlaylist(text: string, baseUrl: string): MediaPlaylist {
+	const playlist: MediaPlaylist = {
+		initUri: null,
+		segmentUris: [],
+		ended: false,
+	};
+	for (const rawLine of text.split("\n")) {
+		const line = rawLine.trim();
+		if (line.startsWith("#EXT-X-MAP:")) {
+			const uri = line.match(/URI="([^"]+)"/);
+			if (uri) playlist.initUri = new URL(uri[1], baseUrl).href;
+		} else if (line === "#EXT-X-ENDLIST") {
+			playlist.ended = true;
+		} else if (line && !line.startsWith("#")) {
+			playlist.segmentUris.push(new URL(line, baseUrl).href);
+		}
+	}
+	return playlist;
+}
+
+function appendBuffer(
+	sourceBuffer: SourceBuffer,
+	data: ArrayBuffer
+): Promise<void> {
+	return new Promise((resolve, reject) => {
+		const onUpdateEnd = () => {
+			sourceBuffer.removeEventListener("error", onError);
+			resolve();
+		};
+		const onError = () => {
+			sourceBuffer.removeEventListener("updateend", onUpdateEnd);
+			reject(new Error("Failed to append stream segment"));
+		};
+		sourceBuffer.addEventListener("updateend", onUpdateEnd, { once: true });
+		sourceBuffer.addEventListener("error", onError, { once: true });
+		sourceBuffer.appendBuffer(data);
+	});
+}
+
+const sleep = (ms: number) =>
+	new Promise((resolve) => setTimeout(resolve, ms));
+
+/**
+ * Play a growing fMP4 HLS stream through Media Source Extensions.
+ *
+ * Segments are appended as they appear in the playlist, so playback can start
+ * while the server is still rendering. Returns a function that stops loading.
+ */
+export function attachStream(
+	video: HTMLVideoElement,
+	masterUrl: string,
+	onError?: (error: Error) => void
+): () => void {
+	const controller = new AbortController();
+	const mediaSource = new MediaSource();
+	const objectUrl = URL.createObjectURL(mediaSource);
+
+	const load = async () => {
+		await new Promise((resolve) =>
+			mediaSource.addEventListener("sourceopen", resolve, { once: true })
+		);
+		const { codecs, playlistUrl } = parseMasterPlaylist(
+			await fetchText(masterUrl, controller.signal),
+			masterUrl
+		);
+		const mimeType = `video/mp4; codecs="${codecs}"`;
+		if (!MediaSource.isTypeSupported(mimeType)) {
+			throw new Error(`Stream format not supported: ${mimeType}`);
+		}
+		const sourceBuffer = mediaSource.addSourceBuffer(mimeType);
+
+		let initAppended = false;
+		let appendedSegments = 0;
+		while (!controller.signal.aborted) {
+			const playlist = parseMediaPlaylist(
+				await fetchText(playlistUrl, controller.signal),
+				playlistUrl
+			);
+			if (!initAppended && playlist.initUri) {
+				await appendBuffer(
+					sourceBuffer,
+					await fetchBuffer(playlist.initUri, controller.signal)
+				);
+				initAppended = true;
+			}
+			// The EVENT playlist only grows, new segments are at the end
+			for (const uri of playlist.segmentUris.slice(appendedSegments)) {
+				await appendBuffer(
+					sourceBuffer,
+					await fetchBuffer(uri, controller.signal)
+				);
+				appendedSegments++;
+			}
+			if (playlist.ended) {
+				mediaSource.endOfStream();
+				return;
+			}
+			await sleep(PLAYLIST_POLL_INTERVAL);
+		}
+	};
+
+	video.src = objectUrl;
+	load().catch((error) => {
+		if (controller.signal.aborted) return;
+		console.error("Stream error:", error);
+		onError?.(error instanceof Error ? error : new Error(String(error)));
+	});
+
+	return () => {
+		controller.abort();
+		URL.revokeObjectURL(objectUrl);
+	};
+}
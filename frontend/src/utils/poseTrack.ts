@@ -0,0 +1,237 @@
+import { AnchorTrail, PoseTrackData } from "./types";
+
+// Binary track format written by backend/src/pipeline/track_export.py
+const TRACK_MAGIC = "CXTK";
+const TRACK_VERSION = 1;
+const HEADER_SIZE = 40;
+const LANDMARK_FIELDS = 3; // x, y, visibility
+
+// Drawing style, mirrors backend/src/pipeline/overlay.py
+const CONFIDENCE_THRESHOLD = 0.5;
+const CONNECTION_COLOR = "rgb(255, 255, 255)";
+const CONNECTION_THICKNESS = 5;
+const LANDMARK_RADIUS = 4;
+const HIP_TRACER_COLOR = "rgb(255, 0, 0)";
+const SHOULDER_TRACER_COLOR = "rgb(255, 0, 255)";
+const TRACER_DOT_RADIUS = 10;
+const MIN_TRACER_OPACITY = 0.1;
+
+// prettier-ignore
+const POSE_CONNECTIONS: [number, number][] = [
+	[0, 11], [0, 12], // Nose to shoulders
+	[11, 12], [11, 13], [12, 14], [13, 15], [14, 16], // Arms
+	[11, 23], [12, 24], // Shoulders to hips
+	[23, 24], [23, 25], [24, 26], [25, 27], [26, 28], // Hips to legs
+	[27, 29], [28, 30], [29, 31], [30, 32], // Legs to feet
+	[15, 17], [17, 19], [19, 21], [21, 15], // Left hand
+	[16, 18], [18, 20], [20, 22], [22, 16], // Right hand
+];
+
+// Face landmarks 1-10 are skipped, only the nose is drawn
+const isDrawnLandmark = (index: number) => index === 0 || index > 10;
+
+/**
+ * Parse a compact pose track downloaded from /api/results/{id}/track
+ */
+export function parsePoseTrack(buffer: ArrayBuffer): PoseTrackData {
+	const view = new DataView(buffer);
+	const magic = String.fromCharCode(
+		...new Uint8Array(buffer, 0, TRACK_MAGIC.length)
+	);
+	const version = view.getUint16(4, true);
+	if (magic !== TRACK_MAGIC || version !== TRACK_VERSION) {
+		throw new Error(`Unsupported pose track format ${magic} v${version}`);
+	}
+
+	const landmarkCount = view.getUint16(6, true);
+	const frameCount = view.getUint32(8, true);
+	const poseCount = view.getUint32(12, true);
+	const fps = view.getUint32(16, true) / view.getUint32(20, true);
+	const width = view.getUint16(24, true);
+	const height = view.getUint16(26, true);
+	const rotation = view.getUint16(28, true);
+	const persistenceFrames = view.getUint16(30, true);
+	const coordMin = view.getFloat32(32, true);
+	const coordMax = view.getFloat32(36, true);
+
+	// Slices copy the sections so typed arrays are always aligned
+	let offset = HEADER_SIZE;
+	const poseFrames = new Uint32Array(
+		buffer.slice(offset, offset + poseCount * 4)
+	);
+	offset += poseCount * 4;
+
+	const valueCount = poseCount * landmarkCount * LANDMARK_FIELDS;
+	const quantized = new Uint16Array(
+		buffer.slice(offset, offset + valueCount * 2)
+	);
+	offset += valueCount * 2;
+
+	// Dequantize once so drawing works on plain normalized values
+	const coordScale = (coordMax - coordMin) / 65535;
+	const landmarks = new Float32Array(valueCount);
+	for (let i = 0; i < valueCount; i += LANDMARK_FIELDS) {
+		landmarks[i] = coordMin + quantized[i] * coordScale;
+		landmarks[i + 1] = coordMin + quantized[i + 1] * coordScale;
+		landmarks[i + 2] = quantized[i + 2] / 65535;
+	}
+
+	const frameRows = new Int32Array(frameCount).fill(-1);
+	poseFrames.forEach((frameIndex, row) => {
+		frameRows[frameIndex] = row;
+	});
+
+	const readAnchorTrail = (): AnchorTrail => {
+		const count = view.getUint32(offset, true);
+		offset += 4;
+		const frameIndices = new Uint32Array(
+			buffer.slice(offset, offset + count * 4)
+		);
+		offset += count * 4;
+		const positions = new Uint16Array(
+			buffer.slice(offset, offset + count * 4)
+		);
+		offset += count * 4;
+		return { frameIndices, positions };
+	};
+	const hip = readAnchorTrail();
+	const shoulder = readAnchorTrail();
+
+	return {
+		frameCount,
+		fps,
+		width,
+		height,
+		rotation,
+		persistenceFrames,
+		landmarkCount,
+		frameRows,
+		landmarks,
+		hip,
+		shoulder,
+	};
+}
+
+/**
+ * Display size of the track's frames once the stored rotation is applied
+ */
+export function getDisplaySize(track: PoseTrackData): [number, number] {
+	return track.rotation === 90 || track.rotation === 270
+		? [track.height, track.width]
+		: [track.width, track.height];
+}
+
+// Map a normalized point of the decoded frame to the displayed frame
+function rotatePoint(
+	x: number,
+	y: number,
+	rotation: number
+): [number, number] {
+	switch (rotation) {
+		case 90:
+			return [y, 1 - x];
+		case 180:
+			return [1 - x, 1 - y];
+		case 270:
+			return [1 - y, x];
+		default:
+			return [x, y];
+	}
+}
+
+// Index of the first entry in a sorted array greater than value
+function upperBound(values: Uint32Array, value: number): number {
+	let low = 0;
+	let high = values.length;
+	while (low < high) {
+		const middle = (low + high) >> 1;
+		if (values[middle] <= value) {
+			low = middle + 1;
+		} else {
+			high = middle;
+		}
+	}
+	return low;
+}
+
+/**
+ * Draw the skeleton and tracer trails for one frame, like the server-side renderer.
+ *
+ * The context is expected to be transformed so that one unit is one pixel of the
+ * displayed video frame.
+ */
+export function drawPoseOverlay(
+	context: CanvasRenderingContext2D,
+	track: PoseTrackData,
+	frameIndex: number
+): void {
+	const row = frameIndex < track.frameCount ? track.frameRows[frameIndex] : -1;
+	if (row < 0) return;
+
+	const [displayWidth, displayHeight] = getDisplaySize(track);
+	const toDisplay = (x: number, y: number): [number, number] => {
+		const [dx, dy] = rotatePoint(x, y, track.rotation);
+		return [dx * displayWidth, dy * displayHeight];
+	};
+
+	// Landmarks in frame pixels, with the same confidence and bounds filtering
+	const base = row * track.landmarkCount * LANDMARK_FIELDS;
+	const points: ([number, number] | null)[] = [];
+	const visibility: number[] = [];
+	for (let i = 0; i < track.landmarkCount; i++) {
+		const x = track.landmarks[base + i * LANDMARK_FIELDS];
+		const y = track.landmarks[base + i * LANDMARK_FIELDS + 1];
+		const inBounds = x >= 0 && x < 1 && y >= 0 && y < 1;
+		points.push(inBounds ? toDisplay(x, y) : null);
+		visibility.push(track.landmarks[base + i * LANDMARK_FIELDS + 2]);
+	}
+	const isVisible = (i: number) =>
+		points[i] !== null && visibility[i] >= CONFIDENCE_THRESHOLD;
+
+	// Connections first so landmarks appear on top
+	context.strokeStyle = CONNECTION_COLOR;
+	context.lineWidth = CONNECTION_THICKNESS;
+	context.lineCap = "round";
+	context.beginPath();
+	for (const [start, end] of POSE_CONNECTIONS) {
+		if (!isVisible(start) || !isVisible(end)) continue;
+		context.moveTo(...points[start]!);
+		context.lineTo(...points[end]!);
+	}
+	context.stroke();
+
+	for (let i = 0; i < track.landmarkCount; i++) {
+		if (!isDrawnLandmark(i) || !isVisible(i)) continue;
+		context.fillStyle =
+			visibility[i] > 0.8 ? "rgb(0, 255, 0)" : "rgb(0, 255, 255)";
+		context.beginPath();
+		context.arc(...points[i]!, LANDMARK_RADIUS, 0, 2 * Math.PI);
+		context.fill();
+	}
+
+	// Fading trails; the newest dot is the current anchor at full opacity
+	const drawTrail = (trail: AnchorTrail, color: string) => {
+		const start = upperBound(
+			trail.frameIndices,
+			frameIndex - track.persistenceFrames
+		);
+		const end = upperBound(trail.frameIndices, frameIndex);
+		context.fillStyle = color;
+		for (let i = start; i < end; i++) {
+			const age = frameIndex - trail.frameIndices[i];
+			const opacity = 1 - age / track.persistenceFrames;
+			if (opacity <= MIN_TRACER_OPACITY) continue;
+			const [x, y] = toDisplay(
+				trail.positions[i * 2] / track.width,
+				trail.positions[i * 2 + 1] / track.height
+			);
+			context.globalAlpha = opacity;
+			context.beginPath();
+			context.arc(x, y, TRACER_DOT_RADIUS, 0, 2 * Math.PI);
+			context.fill();
+		}
+		context.globalAlpha = 1;
+	};
+	drawTrail(track.hip, HIP_TRACER_COLOR);
+	drawTrail(track.shoulder, SHOULDER_TRACER_COLOR);
+}
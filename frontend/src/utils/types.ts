@@ -7,6 +7,8 @@ export interface ResultMetrics {
 	avg_hip_angle: number | null;
 	avg_knee_angle: number | null;
 	stability_score: number | null;
+	avg_com_velocity: number | null;
+	avg_com_jerk: number | null;
 }
 
 export interface Result {
@@ -17,6 +19,40 @@ export interface Result {
 	feedback: string[] | null;
 	video_url: string | null;
 	error_message: string | null;
+	overlay_mode?: "video" | "client" | null;
+	overlay_status?: OverlayState;
+	source_video_url?: string | null;
+	track_url?: string | null;
+	stream_url?: string | null; // HLS playlist, playable while the overlay renders
+}
+
+export type OverlayState = "not_requested" | "rendering" | "complete" | "error";
+
+export interface OverlayStatus {
+	id: string;
+	overlay_status: OverlayState;
+	video_url: string | null;
+	stream_url: string | null;
+	error_message: string | null;
+}
+
+export interface AnchorTrail {
+	frameIndices: Uint32Array;
+	positions: Uint16Array; // x, y pairs in decoded frame pixels
+}
+
+export interface PoseTrackData {
+	frameCount: number;
+	fps: number;
+	width: number;
+	height: number;
+	rotation: number; // Rotation the decoded frames need for display
+	persistenceFrames: number;
+	landmarkCount: number;
+	frameRows: Int32Array; // Frame index -> landmark row, -1 without a pose
+	landmarks: Float32Array; // Rows of normalized x, y, visibility per landmark
+	hip: AnchorTrail;
+	shoulder: AnchorTrail;
 }
 
 export interface ErrorResponse {
@@ -35,6 +71,8 @@ export interface AnalysisData {
 	state: AnalysisState;
 	analysisId: string | null;
 	result: Result | null;
+	poseTrack: PoseTrackData | null;
+	streamUrl: string | null; // Overlay stream kept for playback once started
 	error: string | null;
 	progress: number;
 }